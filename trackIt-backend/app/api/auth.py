@@ -1,49 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 import logging
 import uuid
 
+from app.api.deps import get_current_user, oauth2_scheme
 from app.db.session import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse, Token, UserLogin
+from app.schemas.user import UserCreate, UserResponse, Token, UserLogin, CurrentUser
+from app.config import settings
+from app.services.guest_store import guest_store
 from app.services.auth_service import (
     create_user,
     authenticate_user,
     create_access_token,
+    token_expiry,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 @router.post("/signup", response_model=UserResponse)
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Create a new user"""
-    logger.info(f"Received signup request for email: {user_data.email}")
     try:
-        user = create_user(db, user_data)
-        logger.info(f"Successfully created user with email: {user_data.email}")
+        user = await create_user(db, user_data)
         return UserResponse.from_orm(user)
     except HTTPException as e:
-        logger.error(f"Failed to create user: {str(e.detail)}")
+        logger.info("Signup rejected: %s", e.detail, extra={"email": user_data.email})
         raise e
     except Exception as e:
-        logger.error(f"Unexpected error creating user: {str(e)}")
+        logger.exception("Unexpected error creating user", extra={"email": user_data.email})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login and get access token"""
-    user = authenticate_user(db, user_data.email, user_data.password)
+    user = await authenticate_user(db, user_data.email, user_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,16 +61,23 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
         "user": UserResponse.from_orm(user)
     }
 
+@router.get("/me", response_model=CurrentUser)
+async def read_current_user(current_user: CurrentUser = Depends(get_current_user)):
+    """Return the user the bearer token belongs to"""
+    return current_user
+
 @router.post("/guest-login")
 async def guest_login():
     """Create a temporary guest access token without database storage"""
+    if not settings.GUEST_SESSIONS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Guest sessions are disabled")
     try:
         # Generate a unique guest ID
         guest_id = str(uuid.uuid4())
         guest_username = f"Guest_{guest_id[:8]}"
         
-        # Create guest token with 20 minute expiry
-        access_token_expires = timedelta(minutes=20)
+        # Create guest token; its workspace lives in memory for as long as the token
+        access_token_expires = timedelta(minutes=settings.GUEST_SESSION_MINUTES)
         access_token = create_access_token(
             data={
                 "sub": f"guest_{guest_id}@trackit.temp",
@@ -81,6 +87,7 @@ async def guest_login():
             },
             expires_delta=access_token_expires
         )
+        guest_store.open(guest_id, expires_at=token_expiry(access_token))
         
         # Create a guest user response without database
         guest_user = {
@@ -97,8 +104,7 @@ async def guest_login():
         }
         
     except Exception as e:
-        logger.error(f"Error in guest login: {str(e)}")
-        logger.exception("Full traceback:")
+        logger.exception("Error in guest login")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create guest access: {str(e)}"
@@ -0,0 +1,28 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.schemas.user import CurrentUser
+from app.services.auth_service import CREDENTIALS_EXCEPTION, get_user_for_token
+from app.services.guest_store import guest_store
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> CurrentUser:
+    """Authenticate the request's bearer token, served from cache when possible"""
+    current_user = await get_user_for_token(db, token)
+    if current_user.is_guest:
+        # Guest routes key the guest store by this claim
+        if not current_user.guest_id:
+            raise CREDENTIALS_EXCEPTION
+        # An expired or evicted workspace is not re-created with sample data
+        if not guest_store.exists(current_user.guest_id):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Guest session data is no longer available; start a new guest session",
+            )
+    return current_user
@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, Response
+
+from app.services import metrics
+from app.services.health import db_health
+
+router = APIRouter()
+
+@router.get("/livez")
+async def livez():
+    """Liveness: the process is up and serving requests. Does no I/O."""
+    return {"status": "ok"}
+
+@router.get("/readyz")
+async def readyz():
+    """
+    Readiness: served from the background database probe, so polling it
+    costs no database round trip. Returns 503 while the database is
+    unreachable or the probe result is stale.
+    """
+    report = db_health.report()
+    return JSONResponse(report, status_code=200 if db_health.ready else 503)
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
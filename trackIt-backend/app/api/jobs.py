@@ -1,31 +1,586 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Optional, List, Tuple
+import base64
+import hashlib
 import json
-from pydantic import ValidationError
-from datetime import datetime
-import os
-from sqlalchemy import update
+import logging
+import re
+from pydantic import TypeAdapter, ValidationError
+from datetime import datetime, timezone
+from sqlalchemy import delete, select, true, update, tuple_
+from sqlalchemy.engine import Row
 
+from app.api.deps import get_current_user
+from app.config import settings
 from app.db.session import get_db
-from app.schemas.job import JobCreate, JobResponse
-from app.models.job import Job, JobStatus, ResumeVersion
-from app.services.file_service import FileService
+from app.schemas.job import (
+    JobCreate, JobUpdate, JobResponse, JobBatchRequest, JobBatchResponse, JobBatchResult, JobImportResponse, JobStatsResponse, ResumeSearchResult, ResumeTextResponse
+)
+from app.models.job import Job, JobStatus, ResumeText, ResumeVersion
+from app.schemas.user import CurrentUser
+from app.services.file_service import FileService, ResumeTooLargeError
+from app.services import resume_store, resume_text, job_transfer, job_search, job_stats, file_cleanup
+from app.services.file_response import resume_file_response, resume_bytes_response
+from app.services.response_cache import CachedResponse, cached_response, response_cache
+from app.services.guest_store import GuestQuotaExceeded, GuestVersionConflict, guest_store, read_guest_upload
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Header carrying the opaque cursor for the next page of GET /api/jobs
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def _encode_cursor(job: Job) -> str:
+    payload = json.dumps([job.created_at.isoformat(), job.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(job_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+_job_adapter = TypeAdapter(JobResponse)
+_job_list_adapter = TypeAdapter(List[JobResponse])
+
+def _serialize(adapter: TypeAdapter, value) -> bytes:
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+# Job ETags lead with the row version, so If-Match can be checked against
+# the row without reading it; the digest keeps tags distinct for bodies that
+# differ otherwise (e.g. new resume versions) and for ids reused after a delete
+_ETAG_ROW_VERSION = re.compile(r'^(?:W/)?"(\d+)-[0-9a-f]+"$')
+
+# Updates that touch these fields move the job between job_stats buckets
+_STAT_FIELDS = {"status", "applied_date"}
+_UPDATE_ATTEMPTS = 3
+
+def _job_etag(row_version: int, body: bytes) -> str:
+    return f'"{row_version}-{hashlib.sha256(body).hexdigest()[:16]}"'
+
+def _job_response(request: Request, job) -> Response:
+    """A single job with its ETag, answering If-None-Match like cached reads"""
+    body = _serialize(_job_adapter, job)
+    return cached_response(request, CachedResponse(body, _job_etag(job.row_version, body), {}))
+
+def _if_match_versions(if_match: Optional[str]) -> Optional[List[int]]:
+    """Row versions an If-Match header accepts; None when any version will do"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        match = _ETAG_ROW_VERSION.match(tag.strip())
+        if match:
+            versions.append(int(match.group(1)))
+    return versions
+
+def _precondition_failed() -> HTTPException:
+    return HTTPException(status_code=412, detail="Job was modified by another request; reload it and retry")
+
+def _cache_scope(current_user: CurrentUser) -> Optional[str]:
+    """Response cache scope; guest reads are served from memory and not cached"""
+    return None if current_user.is_guest else f"user:{current_user.id}"
+
+def _naive_utc(value: datetime) -> datetime:
+    # Guest jobs carry naive UTC timestamps, like the database rows
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _filter_guest_jobs(
+    jobs: List[JobResponse],
+    status: Optional[str],
+    company: Optional[str],
+    position: Optional[str],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    cursor: Optional[str],
+) -> List[JobResponse]:
+    """Apply the list filters and cursor of GET /api/jobs to a guest's jobs"""
+    if status:
+        job_status = _parse_status(status)
+        jobs = [job for job in jobs if job.status == job_status]
+    if company:
+        jobs = [job for job in jobs if company.lower() in job.company.lower()]
+    if position:
+        jobs = [job for job in jobs if position.lower() in job.position.lower()]
+    if created_from:
+        jobs = [job for job in jobs if job.created_at >= _naive_utc(created_from)]
+    if created_to:
+        jobs = [job for job in jobs if job.created_at < _naive_utc(created_to)]
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        cursor_key = (_naive_utc(cursor_created_at), cursor_id)
+        jobs = [job for job in jobs if (job.created_at, job.id) < cursor_key]
+    return jobs
+
+async def _add_guest_resume(current_user: CurrentUser, job_id: int, resume: UploadFile) -> JobResponse:
+    """Guest sessions are served from the guest store and never touch the database"""
+    content_type = resume_store.guess_content_type(resume)
+    try:
+        content = await read_guest_upload(resume, settings.MAX_RESUME_SIZE_MB * 1024 * 1024)
+        job = guest_store.add_resume(current_user.guest_id, job_id, resume.filename, content, content_type)
+    except GuestQuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+def _guest_resume_response(
+    request: Request, current_user: CurrentUser, job_id: int, version_id: int, disposition: str
+) -> Response:
+    found = guest_store.get_resume(current_user.guest_id, job_id, version_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Resume version not found")
+    version, guest_file = found
+    media_type = guest_file.content_type if disposition == "inline" else "application/octet-stream"
+    return resume_bytes_response(
+        request, version, guest_file.content, guest_file.sha256, media_type=media_type, disposition=disposition
+    )
+
+def _reject_guest_resume_text(current_user: CurrentUser) -> None:
+    # Guest resumes stay in memory and are never extracted
+    if current_user.is_guest:
+        raise HTTPException(status_code=403, detail="Resume content search is not available for guest sessions")
+
+async def _get_job(db: AsyncSession, job_id: int, user_id: int) -> Optional[Job]:
+    """Load one of the user's jobs together with its resume versions"""
+    result = await db.execute(
+        select(Job)
+        .options(selectinload(Job.resumes))
+        .where(Job.id == job_id, Job.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def _get_resume_version(db: AsyncSession, job_id: int, version_id: int, user_id: int) -> Optional[ResumeVersion]:
+    result = await db.execute(
+        select(ResumeVersion)
+        .join(Job, Job.id == ResumeVersion.job_id)
+        .where(
+            ResumeVersion.id == version_id,
+            ResumeVersion.job_id == job_id,
+            Job.user_id == user_id
+        )
+    )
+    return result.scalars().first()
+
+async def _allocate_resume_version(db: AsyncSession, job_id: int, user_id: int) -> Optional[int]:
+    """
+    Take the next resume version number of one of the user's jobs, or None
+    if there is no such job. The increment is a single UPDATE ... RETURNING,
+    so concurrent uploads to a job always get distinct numbers; numbers of
+    deleted versions are not reused.
+    """
+    return await db.scalar(
+        update(Job)
+        .where(Job.id == job_id, Job.user_id == user_id)
+        .values(last_resume_version=Job.last_resume_version + 1)
+        .returning(Job.last_resume_version)
+        .execution_options(synchronize_session=False)
+    )
+
+async def _update_job(
+    db: AsyncSession, user_id: int, job_id: int, changes: dict, versions: Optional[List[int]]
+) -> Optional[Job]:
+    """
+    Write `changes` to one of the user's jobs with a single UPDATE ... RETURNING
+    of just those columns, bumping the row version. Returns None if there is
+    no such job; raises 412 if its row version is not one of `versions`.
+    """
+    owned = (Job.id == job_id, Job.user_id == user_id)
+    moves_stats = bool(_STAT_FIELDS & changes.keys())
+    for _ in range(_UPDATE_ATTEMPTS):
+        guard = Job.row_version.in_(versions) if versions is not None else true()
+        if moves_stats:
+            # job_stats needs the bucket the job leaves. Pin the update to the
+            # version read, so no other write can land in between.
+            current = (await db.execute(
+                select(Job.row_version, Job.status, Job.applied_date, Job.created_at).where(*owned)
+            )).first()
+            if current is None:
+                return None
+            if versions is not None and current.row_version not in versions:
+                raise _precondition_failed()
+            guard = Job.row_version == current.row_version
+
+        result = await db.execute(
+            update(Job)
+            .where(*owned, guard)
+            .values(**changes, row_version=Job.row_version + 1)
+            .returning(Job)
+            .options(selectinload(Job.resumes))
+        )
+        job = result.scalars().first()
+        if job is not None:
+            if moves_stats:
+                await job_stats.record(
+                    db, user_id, added=[job_stats.stat_key(job)], removed=[job_stats.stat_key(current)]
+                )
+            return job
+        # Only a pinned update without If-Match lost a race worth retrying
+        if versions is not None or not moves_stats:
+            break
+
+    if not await db.scalar(select(Job.id).where(*owned)):
+        return None
+    raise _precondition_failed()
+
+async def _lock_jobs(db: AsyncSession, user_id: int, job_ids: List[int]) -> List[Row]:
+    """
+    The user's jobs among `job_ids`, with the fields job_stats buckets them
+    by. On PostgreSQL the rows stay locked until the transaction ends, so no
+    concurrent write can move them between this read and the caller's write.
+    """
+    result = await db.execute(
+        select(Job.id, Job.status, Job.applied_date, Job.created_at)
+        .where(Job.id.in_(job_ids), Job.user_id == user_id)
+        .order_by(Job.id)
+        .with_for_update()
+    )
+    return list(result.all())
+
+async def _set_jobs_status(db: AsyncSession, user_id: int, job_ids: List[int], status: JobStatus) -> List[int]:
+    """Move the user's jobs among `job_ids` to `status`; returns the ids updated"""
+    jobs = await _lock_jobs(db, user_id, job_ids)
+    if not jobs:
+        return []
+    updated = [job.id for job in jobs]
+    await db.execute(
+        update(Job)
+        .where(Job.id.in_(updated))
+        .values(status=status, row_version=Job.row_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    removed = [job_stats.stat_key(job) for job in jobs]
+    await job_stats.record(
+        db, user_id, added=[(week_start, status) for week_start, _ in removed], removed=removed
+    )
+    return updated
+
+async def _delete_jobs(db: AsyncSession, user_id: int, job_ids: List[int]) -> Tuple[List[int], List[str]]:
+    """
+    Delete the user's jobs among `job_ids` with their resume versions, using
+    the same handful of statements however many jobs there are. Returns the
+    ids deleted and the files queued for removal (see app.services.file_cleanup).
+    """
+    jobs = await _lock_jobs(db, user_id, job_ids)
+    if not jobs:
+        return [], []
+    deleted = [job.id for job in jobs]
+    versions = (await db.execute(
+        select(ResumeVersion.id, ResumeVersion.blob_id, ResumeVersion.file_path)
+        .where(ResumeVersion.job_id.in_(deleted))
+    )).all()
+    released = await resume_store.release_resumes(db, versions)
+    await resume_text.forget(db, [version.id for version in versions])
+    await db.execute(
+        delete(ResumeVersion)
+        .where(ResumeVersion.job_id.in_(deleted))
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(delete(Job).where(Job.id.in_(deleted)).execution_options(synchronize_session=False))
+    await job_stats.record(db, user_id, removed=[job_stats.stat_key(job) for job in jobs])
+    return deleted, released
+
+def _guest_batch(current_user: CurrentUser, batch: JobBatchRequest, job_ids: List[int]) -> List[int]:
+    done = []
+    for job_id in job_ids:
+        if batch.action == "delete":
+            found = guest_store.delete_job(current_user.guest_id, job_id)
+        else:
+            found = guest_store.update_job(current_user.guest_id, job_id, {"status": batch.status})
+        if found:
+            done.append(job_id)
+    return done
+
+def _parse_status(status: str) -> JobStatus:
+    try:
+        return JobStatus(status.lower())
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid status value. Must be one of: {', '.join([s.value for s in JobStatus])}"
+        )
+
 @router.get("/", response_model=List[JobResponse])
-async def get_jobs(db: Session = Depends(get_db)):
+async def get_jobs(
+    request: Request,
+    status: Optional[str] = Query(None),
+    company: Optional[str] = Query(None),
+    position: Optional[str] = Query(None),
+    created_from: Optional[datetime] = Query(None),
+    created_to: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    List jobs newest first, one page at a time.
+
+    Pages are keyset-paginated on (created_at, id), so fetching any page costs
+    the same regardless of how many rows precede it. When more rows exist the
+    cursor for the next page is returned in the X-Next-Cursor header.
+    Pages are served from the response cache until the user's jobs change.
+    """
+    scope = _cache_scope(current_user)
+    if scope:
+        cache_key = await response_cache.list_key(scope, request.query_params.multi_items())
+        entry = await response_cache.get(cache_key)
+        if entry:
+            return cached_response(request, entry)
+
     try:
-        jobs = db.query(Job).all()
-        return jobs
+        if current_user.is_guest:
+            jobs = _filter_guest_jobs(
+                guest_store.list_jobs(current_user.guest_id),
+                status, company, position, created_from, created_to, cursor
+            )[:limit + 1]
+        else:
+            # Load every page's resumes in one batched IN query instead of one per job
+            query = select(Job).options(selectinload(Job.resumes)).where(Job.user_id == current_user.id)
+
+            if status:
+                query = query.where(Job.status == _parse_status(status))
+            if company:
+                query = query.where(Job.company.ilike(f"%{company}%"))
+            if position:
+                query = query.where(Job.position.ilike(f"%{position}%"))
+            if created_from:
+                query = query.where(Job.created_at >= created_from)
+            if created_to:
+                query = query.where(Job.created_at < created_to)
+            if cursor:
+                cursor_key = tuple_(*_decode_cursor(cursor), types=[Job.created_at.type, Job.id.type])
+                query = query.where(tuple_(Job.created_at, Job.id) < cursor_key)
+
+            # Fetch one extra row to learn whether another page exists
+            result = await db.execute(query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1))
+            jobs = list(result.scalars().all())
+        headers = {}
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            headers[NEXT_CURSOR_HEADER] = _encode_cursor(jobs[-1])
+        body = _serialize(_job_list_adapter, jobs)
+        if not scope:
+            return Response(body, media_type="application/json", headers=headers)
+        return cached_response(request, await response_cache.store(cache_key, body, headers))
     except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
         raise HTTPException(
             status_code=500,
             detail=str(e)
         )
 
+@router.get("/stats", response_model=JobStatsResponse)
+async def get_job_stats(
+    weeks: int = Query(12, ge=1, le=104),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Dashboard statistics: job counts by status, applications per week over
+    the last `weeks` weeks, and response, interview and offer rates.
+
+    Read from the job_stat_counts summary table (see app.services.job_stats),
+    so the cost does not grow with the number of jobs.
+    """
+    if current_user.is_guest:
+        return job_stats.guest_stats(guest_store.list_jobs(current_user.guest_id), weeks)
+    try:
+        return await job_stats.get_stats(db, current_user.id, weeks)
+    except Exception as e:
+        logger.exception("Error reading job stats", extra={"user_id": current_user.id})
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to read job stats: {str(e)}"
+        )
+
+@router.get("/search", response_model=List[JobResponse])
+async def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search over company, position and notes, best match first.
+
+    Every word in `q` must match, as a word prefix, in one of the fields.
+    Served from the database's full-text index (see app.db.fulltext).
+    """
+    terms = job_search.parse_terms(q)
+    if not terms:
+        return []
+    if current_user.is_guest:
+        guest_jobs = guest_store.list_jobs(current_user.guest_id)
+        return job_search.match_jobs(guest_jobs, terms)[:limit]
+
+    try:
+        conn = await db.connection()
+        result = await db.execute(job_search.search_query(conn.dialect.name, current_user.id, terms, limit))
+        return result.scalars().all()
+    except Exception as e:
+        logger.exception("Error searching jobs", extra={"user_id": current_user.id})
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search jobs: {str(e)}"
+        )
+
+@router.get("/resumes/search", response_model=List[ResumeSearchResult])
+async def search_resumes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Search the text of the user's resume versions, best match first.
+
+    Matching follows GET /api/jobs/search. Only versions whose text has been
+    extracted are found; see GET /{job_id}/resume/{version_id}/text.
+    """
+    _reject_guest_resume_text(current_user)
+    terms = job_search.parse_terms(q)
+    if not terms:
+        return []
+    try:
+        conn = await db.connection()
+        result = await db.execute(job_search.resume_search_query(conn.dialect.name, current_user.id, terms, limit))
+        return result.all()
+    except Exception as e:
+        logger.exception("Error searching resumes", extra={"user_id": current_user.id})
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search resumes: {str(e)}"
+        )
+
+@router.post("/import", response_model=JobImportResponse)
+async def import_jobs(
+    file: UploadFile = File(...),
+    fmt: Optional[str] = Query(None, alias="format"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk-create jobs from a CSV (with a header row) or NDJSON upload.
+
+    Columns/keys: company, position, status, notes, applied_date; anything
+    else is ignored, so an export can be imported as is. Valid rows are
+    inserted in one transaction and invalid ones are reported by line.
+    """
+    try:
+        fmt = job_transfer.detect_format(file, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    imported = 0
+    errors = []
+    try:
+        async for valid, invalid in job_transfer.iter_import_batches(file, fmt):
+            errors.extend(invalid)
+            if current_user.is_guest:
+                guest_store.create_jobs(current_user.guest_id, valid)
+            else:
+                await job_transfer.insert_jobs(db, current_user.id, valid)
+                await job_stats.record(db, current_user.id, added=[job_stats.stat_key(job) for job in valid])
+            imported += len(valid)
+        await db.commit()
+        if not current_user.is_guest and imported:
+            await response_cache.invalidate_lists(_cache_scope(current_user))
+    except UnicodeDecodeError:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail="Import file must be UTF-8 encoded")
+    except GuestQuotaExceeded as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to import jobs: {str(e)}"
+        )
+    return JobImportResponse(imported=imported, errors=errors)
+
+@router.post("/batch", response_model=JobBatchResponse)
+async def batch_jobs(
+    batch: JobBatchRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Apply one action to up to 500 jobs: "set_status" (with a status) or
+    "delete". The whole batch is one transaction of set-based statements.
+    Ids that are not the user's jobs are reported as not_found instead of
+    failing the batch; files of deleted resumes are removed in the background.
+    """
+    job_ids = list(dict.fromkeys(batch.job_ids))
+    try:
+        if current_user.is_guest:
+            done = _guest_batch(current_user, batch, job_ids)
+        else:
+            released = []
+            if batch.action == "delete":
+                done, released = await _delete_jobs(db, current_user.id, job_ids)
+            else:
+                done = await _set_jobs_status(db, current_user.id, job_ids, batch.status)
+            await db.commit()
+            if done:
+                await response_cache.invalidate_jobs(_cache_scope(current_user), done)
+            if released:
+                file_cleanup.worker.notify()
+    except Exception as e:
+        await db.rollback()
+        if isinstance(e, HTTPException):
+            raise e
+        logger.exception("Error applying job batch", extra={"action": batch.action, "jobs": len(job_ids)})
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to apply batch: {str(e)}"
+        )
+
+    outcome = "deleted" if batch.action == "delete" else "updated"
+    succeeded = set(done)
+    return JobBatchResponse(
+        action=batch.action,
+        succeeded=len(succeeded),
+        not_found=len(job_ids) - len(succeeded),
+        results=[
+            JobBatchResult(id=job_id, result=outcome if job_id in succeeded else "not_found")
+            for job_id in job_ids
+        ],
+    )
+
+@router.get("/export")
+async def export_jobs(
+    fmt: str = Query("csv", alias="format"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Stream all of the user's jobs as CSV or NDJSON, newest first"""
+    fmt = fmt.lower()
+    if fmt not in job_transfer.MEDIA_TYPES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid format. Must be one of: {', '.join(job_transfer.MEDIA_TYPES)}"
+        )
+
+    if current_user.is_guest:
+        guest_jobs = guest_store.list_jobs(current_user.guest_id)
+        content = iter([job_transfer.export_header(fmt), job_transfer.format_rows(guest_jobs, fmt)])
+    else:
+        content = job_transfer.export_jobs(current_user.id, fmt)
+    return StreamingResponse(
+        content,
+        media_type=job_transfer.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="jobs.{fmt}"'}
+    )
+
 @router.post("/", response_model=JobResponse)
 async def create_job(
     company: str = Form(...),
@@ -34,208 +589,252 @@ async def create_job(
     status: Optional[str] = Form(None),
     applied_date: Optional[str] = Form(None),
     resume: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
+    """
+    Create a job, optionally with its first resume version.
+
+    The job, its resume version and the statistics delta are written in one
+    transaction. The resume is streamed to a staging file before the
+    database is touched and promoted into the blob store inside that
+    transaction; if anything fails, the transaction rolls back and the file
+    is discarded, so no half-created job is ever visible. A promoted file
+    whose transaction never commits is removed by the deletion queue (see
+    resume_store.stage_resume).
+    """
     try:
-        # Print received data for debugging
-        print("Received data:", {
-            "company": company,
-            "position": position,
-            "notes": notes,
-            "status": status,
-            "applied_date": applied_date
-        })
-
-        # Create job data
-        job_data = {
-            "company": company,
-            "position": position,
-            "notes": notes or "",
-            "status": JobStatus.PENDING,  # Default status
-            "applied_date": None  # Default applied_date
-        }
-
-        # Handle status if provided
-        if status:
-            try:
-                job_data["status"] = JobStatus(status.lower())
-            except ValueError:
-                raise HTTPException(
-                    status_code=422,
-                    detail=f"Invalid status value. Must be one of: {', '.join([s.value for s in JobStatus])}"
-                )
+        logger.debug("Creating job", extra={"user_id": current_user.id, "has_resume": resume is not None})
 
-        # Handle applied_date if provided
-        if applied_date:
-            try:
-                parsed_date = datetime.fromisoformat(applied_date.replace('Z', '+00:00'))
-                job_data["applied_date"] = parsed_date
-            except ValueError as e:
-                raise HTTPException(
-                    status_code=422,
-                    detail=f"Invalid date format: {str(e)}"
-                )
-        
-        # Create and validate job data
         try:
-            job_create = JobCreate(**job_data)
+            job_create = JobCreate(
+                company=company,
+                position=position,
+                notes=notes or "",
+                status=_parse_status(status) if status else JobStatus.PENDING,
+                applied_date=applied_date or None,
+            )
         except ValidationError as e:
             raise HTTPException(
                 status_code=422,
                 detail=str(e)
             )
-        
-        # Create job in database
-        db_job = Job(**job_data)
-        db.add(db_job)
-        db.commit()
-        db.refresh(db_job)
 
-        # Handle resume upload if provided
+        if current_user.is_guest:
+            try:
+                guest_job = guest_store.create_job(current_user.guest_id, job_create)
+            except GuestQuotaExceeded as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            if resume:
+                try:
+                    guest_job = await _add_guest_resume(current_user, guest_job.id, resume)
+                except HTTPException:
+                    guest_store.delete_job(current_user.guest_id, guest_job.id)
+                    raise
+            return guest_job
+
+        # Stream the resume to disk before touching the database, so no lock
+        # is held while the client uploads
+        staged = None
         if resume:
+            content_type = resume_store.guess_content_type(resume)
             try:
-                # Get next version number
-                next_version = 1
-                latest_version = db.query(ResumeVersion.version).filter(
-                    ResumeVersion.job_id == db_job.id
-                ).order_by(ResumeVersion.version.desc()).scalar()
-                
-                if latest_version:
-                    next_version = latest_version + 1
-                
-                # Save the file
-                job_id = db.query(Job.id).filter(Job.id == db_job.id).scalar()
-                file_path, original_filename = await FileService.save_resume(
-                    resume, 
-                    job_id,
-                    next_version
-                )
-                
-                # Create resume version record
+                staged = await resume_store.stage_resume(db, resume)
+            except ResumeTooLargeError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+
+        stored = None
+        try:
+            db_job = Job(
+                **job_create.model_dump(),
+                user_id=current_user.id,
+                last_resume_version=1 if staged else 0,  # A new job's first resume is version 1
+                resumes=[],
+            )
+            db.add(db_job)
+            await job_stats.record(db, current_user.id, added=[job_stats.stat_key(db_job)])
+
+            if staged:
+                # Share the blob if this content was uploaded before
+                stored = await resume_store.store_staged(db, staged, content_type)
+                staged = None
                 resume_version = ResumeVersion(
-                    job_id=db_job.id,
-                    version=next_version,
-                    filename=original_filename,
-                    file_path=file_path,
+                    version=1,
+                    filename=stored.original_filename,
+                    file_path=stored.file_path,
+                    blob_id=stored.blob_id,
+                    size=stored.size,
+                    content_type=stored.content_type,
+                    content_hash=stored.sha256,
                     upload_date=datetime.utcnow()
                 )
-                db.add(resume_version)
-                db.commit()
-                
-            except Exception as e:
-                print(f"Error uploading resume: {str(e)}")  # Debug print
-                # If file upload fails, delete the job and raise error
-                db.delete(db_job)
-                db.commit()
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to upload resume: {str(e)}"
-                )
+                resume_text.enqueue(resume_version)
+                db_job.resumes.append(resume_version)
 
-        return db_job
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            if staged:
+                await FileService.discard_staged(staged)
+            if stored:
+                await resume_store.discard_stored(db, stored)
+            raise
+
+        if resume:
+            resume_text.extractor.notify()
+        await response_cache.invalidate_lists(_cache_scope(current_user))
+        # Read the row back rather than returning db_job: dates come out the
+        # way the columns store them, so the response matches GET /{job_id}
+        return await _get_job(db, db_job.id, current_user.id)
     except Exception as e:
-        print(f"Error in create_job: {str(e)}")  # Debug print
         if isinstance(e, HTTPException):
             raise e
+        logger.exception("Error creating job", extra={"user_id": current_user.id})
         raise HTTPException(
             status_code=500,
             detail=f"An error occurred while creating the job: {str(e)}"
         )
 
 @router.get("/{job_id}/resume/{version_id}")
-async def view_resume(job_id: int, version_id: int, db: Session = Depends(get_db)):
+async def view_resume(
+    job_id: int,
+    version_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """View resume in browser"""
-    resume_version = db.query(ResumeVersion).filter(
-        ResumeVersion.id == version_id,
-        ResumeVersion.job_id == job_id
-    ).first()
+    if current_user.is_guest:
+        return _guest_resume_response(request, current_user, job_id, version_id, disposition="inline")
+
+    resume_version = await _get_resume_version(db, job_id, version_id, current_user.id)
     
     if not resume_version:
         raise HTTPException(status_code=404, detail="Resume version not found")
     
-    file_path = str(resume_version.file_path)
-    filename = str(resume_version.filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Resume file not found")
-    
-    return FileResponse(
-        file_path,
-        media_type="application/pdf",
-        filename=filename,
-        headers={
-            "Content-Disposition": "inline"
-        }
+    return await resume_file_response(
+        request,
+        resume_version,
+        media_type=resume_version.content_type or "application/pdf",
+        disposition="inline"
     )
 
 @router.get("/{job_id}/resume/{version_id}/download")
-async def download_resume(job_id: int, version_id: int, db: Session = Depends(get_db)):
+async def download_resume(
+    job_id: int,
+    version_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """Download resume"""
-    resume_version = db.query(ResumeVersion).filter(
-        ResumeVersion.id == version_id,
-        ResumeVersion.job_id == job_id
-    ).first()
+    if current_user.is_guest:
+        return _guest_resume_response(request, current_user, job_id, version_id, disposition="attachment")
+
+    resume_version = await _get_resume_version(db, job_id, version_id, current_user.id)
     
     if not resume_version:
         raise HTTPException(status_code=404, detail="Resume version not found")
     
-    file_path = str(resume_version.file_path)
-    filename = str(resume_version.filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Resume file not found")
-    
-    return FileResponse(
-        file_path,
+    return await resume_file_response(
+        request,
+        resume_version,
         media_type="application/octet-stream",
-        filename=filename
+        disposition="attachment"
+    )
+
+@router.get("/{job_id}/resume/{version_id}/text", response_model=ResumeTextResponse)
+async def get_resume_text(
+    job_id: int,
+    version_id: int,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Extraction status of a resume version, with its text once extracted"""
+    _reject_guest_resume_text(current_user)
+    resume_version = await _get_resume_version(db, job_id, version_id, current_user.id)
+    if not resume_version:
+        raise HTTPException(status_code=404, detail="Resume version not found")
+
+    extracted = await db.get(ResumeText, version_id)
+    if not extracted:
+        raise HTTPException(status_code=404, detail="No text extraction for this resume version")
+    return ResumeTextResponse(
+        version_id=version_id,
+        status=extracted.status,
+        error=extracted.error,
+        extracted_at=extracted.extracted_at,
+        content=extracted.content,
     )
 
 @router.delete("/{job_id}/resume/{version_id}")
-async def delete_resume(job_id: int, version_id: int, db: Session = Depends(get_db)):
+async def delete_resume(
+    job_id: int,
+    version_id: int,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """Delete a specific resume version"""
-    print(f"Attempting to delete resume version {version_id} for job {job_id}")  # Debug log
-    
+    if current_user.is_guest:
+        if not guest_store.delete_resume(current_user.guest_id, job_id, version_id):
+            raise HTTPException(status_code=404, detail="Resume version not found")
+        return {"message": "Resume deleted successfully"}
+
     # Get the resume version
-    resume_version = db.query(ResumeVersion).filter(
-        ResumeVersion.id == version_id,
-        ResumeVersion.job_id == job_id
-    ).first()
+    resume_version = await _get_resume_version(db, job_id, version_id, current_user.id)
     
     if not resume_version:
-        print(f"Resume version not found: version_id={version_id}, job_id={job_id}")  # Debug log
         raise HTTPException(status_code=404, detail="Resume version not found")
     
-    file_path = str(resume_version.file_path)
-    print(f"Found resume at path: {file_path}")  # Debug log
-    
     try:
-        # Delete physical file if it exists
-        if os.path.exists(file_path):
-            print(f"Deleting file at: {file_path}")  # Debug log
-            os.remove(file_path)
-        else:
-            print(f"File does not exist at: {file_path}")  # Debug log
+        # Release the blob; its file is queued for removal once no other version uses it
+        orphaned = await resume_store.release_resumes(db, [resume_version])
+        
+        # Delete the database record and its extracted text
+        await resume_text.forget(db, [resume_version.id])
+        await db.delete(resume_version)
+        await db.commit()
+        await response_cache.invalidate_job(_cache_scope(current_user), job_id)
         
-        # Delete the database record
-        print(f"Deleting database record")  # Debug log
-        db.delete(resume_version)
-        db.commit()
+        # The file was queued for removal if nothing references it any more
+        if orphaned:
+            file_cleanup.worker.notify()
         
         return {"message": "Resume deleted successfully"}
     except Exception as e:
-        print(f"Error during deletion: {str(e)}")  # Debug log
+        logger.exception("Error deleting resume", extra={"job_id": job_id, "version_id": version_id})
         raise HTTPException(
             status_code=500,
             detail=f"Failed to delete resume: {str(e)}"
         )
 
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(
+    job_id: int,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """Get a specific job by ID"""
+    scope = _cache_scope(current_user)
+    if scope:
+        cache_key = await response_cache.job_key(scope, job_id)
+        entry = await response_cache.get(cache_key)
+        if entry:
+            return cached_response(request, entry)
+
     try:
-        job = db.query(Job).filter(Job.id == job_id).first()
+        if current_user.is_guest:
+            job = guest_store.get_job(current_user.guest_id, job_id)
+        else:
+            job = await _get_job(db, job_id, current_user.id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
-        return job
+        if not scope:
+            return _job_response(request, job)
+        body = _serialize(_job_adapter, job)
+        entry = await response_cache.store(cache_key, body, etag=_job_etag(job.row_version, body))
+        return cached_response(request, entry)
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
@@ -244,27 +843,76 @@ async def get_job(job_id: int, db: Session = Depends(get_db)):
             detail=str(e)
         )
 
+@router.patch("/{job_id}", response_model=JobResponse)
+async def update_job(
+    job_id: int,
+    changes: JobUpdate,
+    request: Request,
+    if_match: Optional[str] = Header(None),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Change some of a job's fields; fields left out of the body are kept.
+
+    Send the job's ETag (from GET /{job_id} or a previous PATCH) in If-Match
+    to have the update rejected with 412 if the job changed since it was
+    read. The check is on the row version leading the tag, so new resume
+    versions do not invalidate it. Without If-Match the last write wins.
+    """
+    values = changes.model_dump(exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=422, detail="No fields to update")
+    versions = _if_match_versions(if_match)
+
+    try:
+        if current_user.is_guest:
+            try:
+                job = guest_store.update_job(current_user.guest_id, job_id, values, versions)
+            except GuestVersionConflict:
+                raise _precondition_failed()
+            except GuestQuotaExceeded as e:
+                raise HTTPException(status_code=413, detail=str(e))
+        else:
+            job = await _update_job(db, current_user.id, job_id, values, versions)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if not current_user.is_guest:
+            await db.commit()
+            await response_cache.invalidate_job(_cache_scope(current_user), job_id)
+        return _job_response(request, job)
+    except Exception as e:
+        await db.rollback()
+        if isinstance(e, HTTPException):
+            raise e
+        logger.exception("Error updating job", extra={"job_id": job_id})
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update job: {str(e)}"
+        )
+
 @router.delete("/{job_id}")
-async def delete_job(job_id: int, db: Session = Depends(get_db)):
+async def delete_job(
+    job_id: int,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """Delete a specific job and all its associated resume versions"""
     try:
-        # Get the job
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if not job:
+        if current_user.is_guest:
+            if not guest_store.delete_job(current_user.guest_id, job_id):
+                raise HTTPException(status_code=404, detail="Job not found")
+            return {"message": "Job deleted successfully"}
+
+        deleted, released = await _delete_jobs(db, current_user.id, [job_id])
+        if not deleted:
             raise HTTPException(status_code=404, detail="Job not found")
+        await db.commit()
+        await response_cache.invalidate_job(_cache_scope(current_user), job_id)
         
-        # Get all resume versions for this job
-        resume_versions = db.query(ResumeVersion).filter(ResumeVersion.job_id == job_id).all()
-        
-        # Delete physical resume files
-        for version in resume_versions:
-            file_path = str(version.file_path)
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        
-        # Delete the job (this will cascade delete resume versions due to SQLAlchemy relationship)
-        db.delete(job)
-        db.commit()
+        # Files no other job still references were queued for removal
+        if released:
+            file_cleanup.worker.notify()
         
         return {"message": "Job deleted successfully"}
     except Exception as e:
@@ -275,54 +923,71 @@ async def delete_job(job_id: int, db: Session = Depends(get_db)):
             detail=f"Failed to delete job: {str(e)}"
         )
 
-@router.post("/{job_id}/resume")
+@router.post("/{job_id}/resume", response_model=JobResponse)
 async def upload_resume(
     job_id: int,
     resume: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload a new resume version for a job"""
     try:
-        # Check if job exists
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+        if current_user.is_guest:
+            return await _add_guest_resume(current_user, job_id, resume)
 
-        # Get next version number
-        next_version = 1
-        latest_version = db.query(ResumeVersion.version).filter(
-            ResumeVersion.job_id == job_id
-        ).order_by(ResumeVersion.version.desc()).scalar()
-        
-        if latest_version:
-            next_version = latest_version + 1
-        
-        # Save the file
-        file_path, original_filename = await FileService.save_resume(
-            resume, 
-            job_id,
-            next_version
-        )
-        
-        # Create resume version record
-        resume_version = ResumeVersion(
-            job_id=job_id,
-            version=next_version,
-            filename=original_filename,
-            file_path=file_path,
-            upload_date=datetime.utcnow()
-        )
-        db.add(resume_version)
-        db.commit()
-        db.refresh(resume_version)
+        # Stream the file to disk before touching the database, so no lock is
+        # held while the client uploads
+        content_type = resume_store.guess_content_type(resume)
+        staged = await resume_store.stage_resume(db, resume)
+
+        stored = None
+        try:
+            # One statement checks the job is the user's and takes its next
+            # version number; the job row stays locked until commit
+            next_version = await _allocate_resume_version(db, job_id, current_user.id)
+            if next_version is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+
+            # Save the file, sharing the blob if this content was uploaded before
+            stored = await resume_store.store_staged(db, staged, content_type)
+            staged = None
+
+            # Create resume version record
+            resume_version = ResumeVersion(
+                job_id=job_id,
+                version=next_version,
+                filename=stored.original_filename,
+                file_path=stored.file_path,
+                blob_id=stored.blob_id,
+                size=stored.size,
+                content_type=stored.content_type,
+                content_hash=stored.sha256,
+                upload_date=datetime.utcnow()
+            )
+            # Text is extracted in the background after the response is sent
+            resume_text.enqueue(resume_version)
+            db.add(resume_version)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            if staged:
+                await FileService.discard_staged(staged)
+            if stored:
+                await resume_store.discard_stored(db, stored)
+            raise
+
+        resume_text.extractor.notify()
+        await response_cache.invalidate_job(_cache_scope(current_user), job_id)
         
         # Return the updated job
-        return job
+        return await _get_job(db, job_id, current_user.id)
 
     except Exception as e:
-        print(f"Error uploading resume: {str(e)}")  # Debug print
         if isinstance(e, HTTPException):
             raise e
+        if isinstance(e, ResumeTooLargeError):
+            raise HTTPException(status_code=413, detail=str(e))
+        logger.exception("Error uploading resume", extra={"job_id": job_id})
         raise HTTPException(
             status_code=500,
             detail=f"Failed to upload resume: {str(e)}"
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 import os
 from dotenv import load_dotenv
 
@@ -16,6 +17,43 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    MAX_RESUME_SIZE_MB: int = 10
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    GUEST_SESSION_MINUTES: int = 20
+    GUEST_STORE_MAX_MB: int = 64
+    GUEST_WORKSPACE_MAX_MB: int = 5
+    GUEST_STORE_REAP_INTERVAL_SECONDS: int = 60
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    HEALTH_PROBE_INTERVAL_SECONDS: int = 10
+    HEALTH_PROBE_TIMEOUT_SECONDS: int = 2
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_LEVELS: dict[str, str] = {}
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    RESUME_TEXT_WORKERS: int = 1
+    RESUME_TEXT_BATCH_SIZE: int = 8
+    RESUME_TEXT_POLL_SECONDS: int = 30
+    RESUME_TEXT_TIMEOUT_SECONDS: int = 60
+    RESUME_TEXT_MAX_CHARS: int = 200000
+    FILE_DELETION_BATCH_SIZE: int = 100
+    FILE_DELETION_POLL_SECONDS: int = 60
+    # Production server worker processes; unset means app.server decides
+    WEB_CONCURRENCY: Optional[int] = None
+    # This service's share of the Postgres max_connections, split across workers
+    DB_MAX_CONNECTIONS: int = 80
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    # Guest workspaces live in process memory, so they need a single worker
+    GUEST_SESSIONS_ENABLED: bool = True
+    # Where resume files are stored; defaults to uploads/resumes in the project
+    RESUME_UPLOAD_DIR: Optional[str] = None
 
     model_config = {
         "env_file": env_file
@@ -0,0 +1,107 @@
+"""
+Full-text indexes over jobs (company, position, notes) and extracted resume
+text (resume_texts.content).
+
+PostgreSQL gets a stored generated tsvector column with a GIN index;
+SQLite gets an external-content FTS5 table kept in step by triggers. Both
+are maintained by the database itself, so every write path (ORM, bulk
+INSERT, COPY) updates the index without application code. Company and
+position are weighted above notes when ranking jobs.
+
+The DDL runs after each table is created by create_all; migrations
+f3a8c1d5e207 and a6d2e9c4b185 add the same objects to existing databases.
+"""
+from sqlalchemy import DDL, Table, event
+
+FTS_TABLE = "jobs_fts"
+RESUME_FTS_TABLE = "resume_texts_fts"
+SEARCH_VECTOR = "search_vector"
+
+POSTGRESQL_DDL = {
+    "jobs": [
+        f"""
+        ALTER TABLE jobs ADD COLUMN {SEARCH_VECTOR} tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(company, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(position, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(notes, '')), 'B')
+        ) STORED
+        """,
+        f"CREATE INDEX ix_jobs_search_vector ON jobs USING gin ({SEARCH_VECTOR})",
+    ],
+    "resume_texts": [
+        f"""
+        ALTER TABLE resume_texts ADD COLUMN {SEARCH_VECTOR} tsvector GENERATED ALWAYS AS (
+            to_tsvector('english', coalesce(content, ''))
+        ) STORED
+        """,
+        f"CREATE INDEX ix_resume_texts_search_vector ON resume_texts USING gin ({SEARCH_VECTOR})",
+    ],
+}
+
+SQLITE_DDL = {
+    "jobs": [
+        f"""
+        CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+            company, position, notes, content='jobs', content_rowid='id', tokenize='porter unicode61'
+        )
+        """,
+        f"""
+        CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, company, position, notes)
+            VALUES (new.id, new.company, new.position, new.notes);
+        END
+        """,
+        f"""
+        CREATE TRIGGER jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, company, position, notes)
+            VALUES ('delete', old.id, old.company, old.position, old.notes);
+        END
+        """,
+        f"""
+        CREATE TRIGGER jobs_fts_update AFTER UPDATE OF company, position, notes ON jobs BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, company, position, notes)
+            VALUES ('delete', old.id, old.company, old.position, old.notes);
+            INSERT INTO {FTS_TABLE}(rowid, company, position, notes)
+            VALUES (new.id, new.company, new.position, new.notes);
+        END
+        """,
+    ],
+    "resume_texts": [
+        f"""
+        CREATE VIRTUAL TABLE {RESUME_FTS_TABLE} USING fts5(
+            content, content='resume_texts', content_rowid='resume_version_id', tokenize='porter unicode61'
+        )
+        """,
+        f"""
+        CREATE TRIGGER resume_texts_fts_insert AFTER INSERT ON resume_texts BEGIN
+            INSERT INTO {RESUME_FTS_TABLE}(rowid, content) VALUES (new.resume_version_id, new.content);
+        END
+        """,
+        f"""
+        CREATE TRIGGER resume_texts_fts_delete AFTER DELETE ON resume_texts BEGIN
+            INSERT INTO {RESUME_FTS_TABLE}({RESUME_FTS_TABLE}, rowid, content)
+            VALUES ('delete', old.resume_version_id, old.content);
+        END
+        """,
+        f"""
+        CREATE TRIGGER resume_texts_fts_update AFTER UPDATE OF content ON resume_texts BEGIN
+            INSERT INTO {RESUME_FTS_TABLE}({RESUME_FTS_TABLE}, rowid, content)
+            VALUES ('delete', old.resume_version_id, old.content);
+            INSERT INTO {RESUME_FTS_TABLE}(rowid, content) VALUES (new.resume_version_id, new.content);
+        END
+        """,
+    ],
+}
+
+SQLITE_FTS_TABLES = {"jobs": FTS_TABLE, "resume_texts": RESUME_FTS_TABLE}
+
+
+def install(table: Table) -> None:
+    """Create the dialect's search index whenever create_all creates `table`"""
+    for statement in POSTGRESQL_DDL[table.name]:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in SQLITE_DDL[table.name]:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    # The FTS5 table is not in the metadata, so drop_all would leave it behind
+    fts_table = SQLITE_FTS_TABLES[table.name]
+    event.listen(table, "before_drop", DDL(f"DROP TABLE IF EXISTS {fts_table}").execute_if(dialect="sqlite"))
@@ -15,5 +15,11 @@ def init_db():
     from app.db.session import engine
     Base.metadata.create_all(bind=engine)
 
+async def async_init_db():
+    """Initialize the database from inside the running event loop"""
+    from app.db.session import async_engine
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
 if __name__ == "__main__":
     init_db() 
\ No newline at end of file
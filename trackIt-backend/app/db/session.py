@@ -1,9 +1,14 @@
 import os
+import time
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.config import settings
+from app.services import metrics
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,15 +20,93 @@ DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./sql_app.db")
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (asyncpg / aiosqlite)"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+def timed_pool_class(url: str):
+    """The dialect's default pool class, extended to time connection checkouts"""
+    parsed = make_url(url)
+    base = parsed.get_dialect().get_pool_class(parsed)
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return base.connect(self)
+        finally:
+            metrics.observe_pool_wait(time.perf_counter() - started)
+
+    return type(f"Timed{base.__name__}", (base,), {"connect": connect})
+
+def pool_options(url: str) -> dict:
+    """
+    Connection pool limits for the async engine in this process.
+
+    Each server worker is a separate process with its own pool, so the
+    DB_MAX_CONNECTIONS budget (this service's share of the Postgres
+    max_connections) is divided across WEB_CONCURRENCY workers, keeping one
+    connection per worker for the sync engine. Within that share the pool
+    holds DB_POOL_SIZE connections plus up to DB_MAX_OVERFLOW more under
+    load. SQLite runs without a pool.
+    """
+    if not url.startswith("postgresql"):
+        return {}
+    workers = max(settings.WEB_CONCURRENCY or 1, 1)
+    budget = settings.DB_MAX_CONNECTIONS // workers - 1
+    if budget < 1:
+        raise RuntimeError(
+            f"DB_MAX_CONNECTIONS leaves no pool connections for each of {workers} workers"
+        )
+    pool_size = min(settings.DB_POOL_SIZE, budget)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": min(settings.DB_MAX_OVERFLOW, budget - pool_size),
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+def instrument_engine(engine) -> None:
+    """Time every statement, feeding the query metrics and per-request stats"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop(conn, cursor, statement, parameters, context, executemany):
+        metrics.observe_query(time.perf_counter() - conn.info["query_start"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # Keep the start-time stack balanced when a statement fails
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
 logger.info(f"Connecting to database at {DATABASE_URL}")
 
-# Create SQLAlchemy engine
+# Create SQLAlchemy engines. The async engine serves API requests; the sync
+# engine is kept for scripts and migrations that run outside the event loop
+# and on Postgres is capped at the one connection pool_options reserves for it.
 try:
     engine = create_engine(
         DATABASE_URL,
         pool_pre_ping=True,  # Enable connection health checks
         pool_recycle=300,    # Recycle connections every 5 minutes
+        **({"pool_size": 1, "max_overflow": 0} if DATABASE_URL.startswith("postgresql") else {}),
+    )
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=timed_pool_class(ASYNC_DATABASE_URL),
+        pool_pre_ping=True,
+        pool_recycle=300,
+        **pool_options(DATABASE_URL),
     )
+    instrument_engine(async_engine.sync_engine)
     logger.info("Database engine created successfully")
 except Exception as e:
     logger.error(f"Failed to create database engine: {str(e)}")
@@ -32,6 +115,14 @@ except Exception as e:
 # Create SessionLocal class
 try:
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # expire_on_commit=False: attributes stay readable after commit without
+    # an implicit (and, under asyncio, illegal) lazy refresh
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
     logger.info("Database session maker created successfully")
 except Exception as e:
     logger.error(f"Failed to create session maker: {str(e)}")
@@ -41,9 +132,6 @@ except Exception as e:
 Base = declarative_base()
 
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
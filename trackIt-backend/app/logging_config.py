@@ -0,0 +1,170 @@
+"""
+Central logging setup: structured records written by a background thread.
+
+Loggers hand records to a bounded in-memory queue and return; a
+QueueListener thread formats and writes them, so request handlers never
+wait on stdout. When the queue is full new records are dropped and counted
+(log_records_dropped_total on /metrics) instead of stalling the caller.
+
+Configured from settings:
+
+    LOG_LEVEL         root level
+    LOG_FORMAT        "json" (one object per line) or "text"
+    LOG_LEVELS        per-logger levels, e.g. {"uvicorn.access": "WARNING"}
+    LOG_SAMPLE_RATES  fraction of below-WARNING records kept per logger
+                      (and its children), e.g. {"uvicorn.access": 0.1}
+
+Fields passed through `extra=` become keys of the JSON record.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.config import settings
+from app.services import metrics
+
+QUEUE_SIZE = 10000
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Loggers that servers set up with handlers of their own
+SERVER_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access", "gunicorn.error", "gunicorn.access")
+
+# Attributes of every LogRecord; anything else on a record came from `extra`
+# (uvicorn adds an ANSI-coloured copy of its messages, which is dropped too)
+_STANDARD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "color_message"
+}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "pid": record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a configured fraction of below-WARNING records from noisy loggers"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Longest prefix first, so "a.b" overrides "a"
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._by_logger: Dict[str, float] = {}
+
+    def rate(self, name: str) -> float:
+        rate = self._by_logger.get(name)
+        if rate is None:
+            rate = next(
+                (rate for prefix, rate in self.rates if name == prefix or name.startswith(prefix + ".")), 1.0
+            )
+            self._by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class BackgroundHandler(QueueHandler):
+    """QueueHandler that drops records rather than block when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message and traceback in the calling thread: args may be
+        # mutated and exc_info pins frames once the call returns. Unlike the
+        # base class, keep the traceback separate from the message.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_traceback_formatter = logging.Formatter()
+_handler: Optional[BackgroundHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener() -> None:
+    global _listener
+    _listener = QueueListener(_handler.queue, *_output_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+def _output_handlers() -> list:
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+    return [output]
+
+
+def _restart_after_fork() -> None:
+    # The writer thread does not survive a fork, and the old queue's lock may
+    # have been held mid-put; give the child a fresh queue and writer
+    _handler.queue = queue.Queue(QUEUE_SIZE)
+    _start_listener()
+
+
+def _flush() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging() -> None:
+    """Route all logging through the background writer; safe to call again"""
+    global _handler
+    if _handler is None:
+        _handler = BackgroundHandler(queue.Queue(QUEUE_SIZE))
+        _handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+        _start_listener()
+        atexit.register(_flush)
+        os.register_at_fork(after_in_child=_restart_after_fork)
+
+    root = logging.getLogger()
+    root.handlers = [_handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+    for name in SERVER_LOGGERS:
+        server_logger = logging.getLogger(name)
+        server_logger.handlers = []
+        server_logger.propagate = True
+
+
+metrics.registry.counter_callback(
+    "log_records_dropped_total", "Log records dropped because the log queue was full",
+    lambda: [((), _handler.dropped if _handler else 0)],
+)
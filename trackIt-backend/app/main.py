@@ -1,17 +1,21 @@
-import os
 import sys
+import asyncio
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import auth, jobs
-from app.db.init_db import init_db
+from app.api import auth, jobs, health
+from app.db.init_db import async_init_db
 from app.config import settings
-from app.db.session import engine
+from app.logging_config import configure_logging
+from app.db.session import engine, async_engine
 from app.db.base import Base
-from sqlalchemy import text
+from app.services import file_cleanup, resume_text
+from app.services.auth_service import password_hash_pool
+from app.services.guest_store import guest_store
+from app.services.health import db_health
+from app.services.metrics import MetricsMiddleware
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI()
@@ -39,20 +43,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[jobs.NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# Per-route latency and database usage, exported on /metrics
+app.add_middleware(MetricsMiddleware)
+
 @app.on_event("startup")
 async def startup_event():
     try:
         # Initialize database
         logger.info("Initializing database...")
-        init_db()
+        await async_init_db()
         logger.info("Database initialized successfully")
         
-        # Test database connection
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-            logger.info("Database connection test successful")
+        # Test database connection, then keep probing it in the background
+        if not await db_health.probe():
+            raise RuntimeError(db_health.error)
+        logger.info("Database connection test successful")
+        app.state.health_probe = asyncio.create_task(db_health.run())
+
+        # Reclaim expired guest workspaces in the background
+        app.state.guest_reaper = asyncio.create_task(
+            guest_store.run_reaper(settings.GUEST_STORE_REAP_INTERVAL_SECONDS)
+        )
+
+        # Resume text is extracted off the request path, in a process pool
+        app.state.resume_text_worker = asyncio.create_task(resume_text.extractor.run())
+
+        # Released resume files are removed from a queue, off the request path
+        app.state.file_deletion_worker = asyncio.create_task(file_cleanup.worker.run())
             
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
@@ -61,26 +81,28 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     try:
+        app.state.guest_reaper.cancel()
+        app.state.health_probe.cancel()
+        app.state.resume_text_worker.cancel()
+        app.state.file_deletion_worker.cancel()
+        resume_text.extractor.shutdown()
         logger.info("Closing database connections...")
+        await async_engine.dispose()
         engine.dispose()
         logger.info("Database connections closed successfully")
+        password_hash_pool.shutdown()
     except Exception as e:
         logger.error(f"Error closing database connections: {str(e)}")
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(health.router, tags=["health"])
 
 @app.get("/")
 async def root():
-    try:
-        # Test database connection
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-            db_status = "healthy"
-    except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
-        db_status = "unhealthy"
+    # Reported from the background probe; see /readyz for details
+    db_status = "healthy" if db_health.ready else "unhealthy"
 
     response = {
         "message": "Welcome to TrackIt API",
@@ -89,6 +111,4 @@ async def root():
         "database_status": db_status,
         "status": "healthy" if db_status == "healthy" else "unhealthy"
     }
-    
-    logger.info(f"Health check response: {response}")
     return response 
\ No newline at end of file
@@ -1,10 +1,21 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, Enum, ForeignKey, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
+from app.db import fulltext
 import enum
 from datetime import datetime
 
+# SQLite stores CURRENT_TIMESTAMP without fractional seconds; bind keyset cursor
+# values in the same format so equality comparisons on created_at line up.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
 class JobStatus(str, enum.Enum):
     APPLIED = "applied"
     INTERVIEWING = "interviewing"
@@ -12,32 +23,111 @@ class JobStatus(str, enum.Enum):
     ACCEPTED = "accepted"
     PENDING = "pending"
 
+class ExtractionStatus(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+    UNSUPPORTED = "unsupported"
+
 class Job(Base):
     __tablename__ = "jobs"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Owning user; nullable only for rows created before jobs had owners
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     company = Column(String(100), nullable=False)
     position = Column(String(100), nullable=False)
     status = Column(Enum(JobStatus), default=JobStatus.PENDING)
     resume_path = Column(String(255), nullable=True)  # Path to the resume in storage
     notes = Column(Text, nullable=True)
     applied_date = Column(DateTime(timezone=True), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by every update of the job's fields; the If-Match precondition of PATCH
+    row_version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Highest resume version number handed out; see _allocate_resume_version in app.api.jobs
+    last_resume_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationship with ResumeVersion
     resumes = relationship("ResumeVersion", back_populates="job", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Owner-scoped keyset pagination: newest first, with id as the tie breaker
+        Index("ix_jobs_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_jobs_user_id_status_created_at_id", "user_id", "status", "created_at", "id"),
+    )
+
+# Full-text index over company, position and notes (see app.db.fulltext)
+fulltext.install(Job.__table__)
+
+class JobStatCount(Base):
+    """How many of a user's jobs are in a status, per week; see app.services.job_stats"""
+    __tablename__ = "job_stat_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    week_start = Column(Date, primary_key=True)  # Monday of the week applied (or created, if not applied)
+    status = Column(Enum(JobStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class ResumeBlob(Base):
+    """A stored resume file, shared by every version with the same content"""
+    __tablename__ = "resume_blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False, unique=True)
+    file_path = Column(String(255), nullable=False)  # Content-addressed path in storage
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Number of ResumeVersion rows using this blob
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class PendingFileDeletion(Base):
+    """A released resume file waiting to be removed; see app.services.file_cleanup"""
+    __tablename__ = "pending_file_deletions"
+
+    id = Column(Integer, primary_key=True)
+    file_path = Column(String(255), nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0)  # Removals tried so far
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class ResumeVersion(Base):
     __tablename__ = "resume_versions"
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
-    file_path = Column(String(255), nullable=False, unique=True)  # Path to the resume in storage
+    file_path = Column(String(255), nullable=False)  # Path to the resume in storage
     job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    blob_id = Column(Integer, ForeignKey("resume_blobs.id"), nullable=True, index=True)  # Null for pre-blob uploads
     version = Column(Integer, nullable=False)
     upload_date = Column(DateTime(timezone=True), default=datetime.utcnow)
     notes = Column(Text, nullable=True)
+    # File metadata captured at upload so downloads can answer validators without a stat
+    size = Column(Integer, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the file, used as the ETag
 
     # Relationship with Job
-    job = relationship("Job", back_populates="resumes") 
\ No newline at end of file
+    job = relationship("Job", back_populates="resumes")
+    # Extracted text; removed explicitly (resume_text.forget) since SQLite
+    # does not enforce the ON DELETE CASCADE
+    text = relationship("ResumeText", uselist=False, passive_deletes=True)
+
+    __table_args__ = (
+        # One row per version number of a job; also serves lookups by job_id
+        Index("ix_resume_versions_job_id_version", "job_id", "version", unique=True),
+    )
+
+class ResumeText(Base):
+    """Text extracted from a resume version in the background, for content search"""
+    __tablename__ = "resume_texts"
+
+    resume_version_id = Column(Integer, ForeignKey("resume_versions.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(ExtractionStatus), nullable=False, default=ExtractionStatus.PENDING, index=True)
+    content = Column(Text, nullable=True)
+    error = Column(String(255), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)  # When an extractor took the row
+    extracted_at = Column(DateTime(timezone=True), nullable=True)
+
+# Full-text index over the extracted content (see app.db.fulltext)
+fulltext.install(ResumeText.__table__) 
\ No newline at end of file
@@ -1,7 +1,7 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
-from datetime import datetime
-from app.models.job import JobStatus
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from typing import Dict, Literal, Optional, List
+from datetime import date, datetime, timezone
+from app.models.job import ExtractionStatus, JobStatus
 
 class ResumeVersionBase(BaseModel):
     filename: str
@@ -16,9 +16,17 @@ class ResumeVersionResponse(ResumeVersionBase):
     file_path: str
     job_id: int
     upload_date: datetime
+    size: Optional[int] = None
+    content_type: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
+def utc_applied_date(value: Optional[datetime]) -> Optional[datetime]:
+    """Store applied dates in UTC: SQLite keeps a timestamp's wall-clock time and drops its offset"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc)
+    return value
+
 class JobBase(BaseModel):
     company: str = Field(..., min_length=1, max_length=100)
     position: str = Field(..., min_length=1, max_length=100)
@@ -26,14 +34,95 @@ class JobBase(BaseModel):
     status: JobStatus = JobStatus.PENDING
     applied_date: Optional[datetime] = None
 
+    _utc_applied_date = field_validator("applied_date")(utc_applied_date)
+
 class JobCreate(JobBase):
     pass
 
+class JobUpdate(BaseModel):
+    """A partial update; fields left out of the body are not changed"""
+    company: Optional[str] = Field(None, min_length=1, max_length=100)
+    position: Optional[str] = Field(None, min_length=1, max_length=100)
+    notes: Optional[str] = None
+    status: Optional[JobStatus] = None
+    applied_date: Optional[datetime] = None
+
+    @field_validator("company", "position", "status")
+    @classmethod
+    def not_null(cls, value):
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+    _utc_applied_date = field_validator("applied_date")(utc_applied_date)
+
 class JobResponse(JobBase):
     id: int
     resume_path: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+    row_version: int = 1
     resumes: List[ResumeVersionResponse] = []
 
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
+
+class JobBatchRequest(BaseModel):
+    """One action applied to several of the user's jobs in a single transaction"""
+    action: Literal["set_status", "delete"]
+    job_ids: List[int] = Field(..., min_length=1, max_length=500)
+    status: Optional[JobStatus] = None  # Required by set_status
+
+    @model_validator(mode="after")
+    def status_for_set_status(self):
+        if self.action == "set_status" and self.status is None:
+            raise ValueError("set_status requires a status")
+        return self
+
+class JobBatchResult(BaseModel):
+    id: int
+    result: Literal["updated", "deleted", "not_found"]
+
+class JobBatchResponse(BaseModel):
+    action: str
+    succeeded: int
+    not_found: int
+    results: List[JobBatchResult]  # One per distinct id, in request order
+
+class JobImportError(BaseModel):
+    line: int
+    error: str
+
+class JobImportResponse(BaseModel):
+    imported: int
+    errors: List[JobImportError] = []
+
+class ResumeTextResponse(BaseModel):
+    version_id: int
+    status: ExtractionStatus
+    error: Optional[str] = None
+    extracted_at: Optional[datetime] = None
+    content: Optional[str] = None  # Set once status is "done"
+
+class ResumeSearchResult(BaseModel):
+    job_id: int
+    company: str
+    position: str
+    version_id: int
+    version: int
+    filename: str
+    snippet: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class WeeklyApplications(BaseModel):
+    week_start: date  # Monday
+    count: int
+
+class JobStatsResponse(BaseModel):
+    total: int
+    by_status: Dict[JobStatus, int]
+    applications_per_week: List[WeeklyApplications]  # Oldest week first, ending with the current one
+    # Shares of the jobs applied to (i.e. not pending)
+    response_rate: float
+    interview_rate: float
+    offer_rate: float
@@ -27,4 +27,12 @@ class Token(BaseModel):
     user: UserResponse
 
 class TokenData(BaseModel):
-    email: Optional[str] = None 
\ No newline at end of file
+    email: Optional[str] = None
+
+class CurrentUser(BaseModel):
+    """The authenticated caller, as resolved from a bearer token"""
+    id: Optional[int] = None  # None for guests, who have no users row
+    email: str
+    username: str
+    is_guest: bool = False
+    guest_id: Optional[str] = None
@@ -0,0 +1,125 @@
+"""
+Production server: gunicorn supervising uvicorn worker processes.
+
+Started by `python run_server.py production`. Tuned through the environment:
+
+    WEB_CONCURRENCY      worker processes (default: one per available CPU,
+                         or one while in-process features are enabled)
+    KEEPALIVE_SECONDS    idle keep-alive timeout, kept above the load
+                         balancer's idle timeout (default: 75)
+    BACKLOG              connections the kernel queues while workers are busy
+                         (default: 2048)
+    MAX_REQUESTS         recycle a worker after this many requests, bounding
+                         slow memory growth (default: 10000)
+    MAX_REQUESTS_JITTER  random extra requests per worker, so workers do not
+                         all recycle at once (default: 1000)
+    GRACEFUL_TIMEOUT     seconds a recycled or stopping worker gets to finish
+                         in-flight requests (default: 30)
+
+Every worker is a separate process with its own database pool, sized from
+WEB_CONCURRENCY by app.db.session.pool_options.
+
+Guest workspaces (GUEST_SESSIONS_ENABLED) and the "memory" response cache
+backend keep their state inside one process, and a request may reach any
+worker. While either is enabled the server runs a single worker, and an
+explicit WEB_CONCURRENCY above 1 is refused at startup. Disable guest
+sessions and set RESPONSE_CACHE_BACKEND=none to scale out.
+
+Auth caches, /metrics, the resume text extractor and the file deletion
+worker are per worker as well; they stay correct with several workers
+(auth caches expire within AUTH_CACHE_TTL_SECONDS, and /metrics reports on
+the worker that answered).
+"""
+import logging
+import os
+import subprocess
+import sys
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProductionWorker(UvicornWorker):
+    # uvloop and httptools in place of the pure-Python asyncio loop and h11
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+def single_process_features() -> list[str]:
+    """Enabled features whose state lives in one process's memory"""
+    features = []
+    if settings.GUEST_SESSIONS_ENABLED:
+        features.append("guest sessions (GUEST_SESSIONS_ENABLED)")
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        features.append("the memory response cache (RESPONSE_CACHE_BACKEND)")
+    return features
+
+
+def worker_count() -> int:
+    """
+    WEB_CONCURRENCY if set, otherwise one async worker per usable CPU; a
+    single worker while single-process features are enabled
+    """
+    features = single_process_features()
+    if settings.WEB_CONCURRENCY is not None:
+        workers = max(settings.WEB_CONCURRENCY, 1)
+        if workers > 1 and features:
+            raise SystemExit(
+                f"WEB_CONCURRENCY={workers} is not supported with {' and '.join(features)}: "
+                "their state is held in one process. Set GUEST_SESSIONS_ENABLED=false and "
+                "RESPONSE_CACHE_BACKEND=none, or run a single worker."
+            )
+        return workers
+    if features:
+        logger.info(f"Running one worker for {' and '.join(features)}")
+        return 1
+    # Honours CPU affinity (e.g. a container cpuset) where the platform has it
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def on_starting(server) -> None:
+    # Create the schema once up front; workers starting together would
+    # otherwise race each other's CREATE TABLE statements. Run in a child
+    # process so the master never opens a database connection to fork.
+    subprocess.run([sys.executable, "-m", "app.db.init_db"], check=True)
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Imported in each worker after the fork, so no engine or event loop
+        # state is ever shared between processes
+        from app.main import app
+        return app
+
+
+def serve(port: int) -> None:
+    workers = worker_count()
+    # Workers are forked from this process, inherit its settings and read
+    # this back to size their database pools
+    settings.WEB_CONCURRENCY = workers
+    options = {
+        "bind": f"0.0.0.0:{port}",
+        "workers": workers,
+        "worker_class": "app.server.ProductionWorker",
+        "keepalive": int(os.getenv("KEEPALIVE_SECONDS", "75")),
+        "backlog": int(os.getenv("BACKLOG", "2048")),
+        "max_requests": int(os.getenv("MAX_REQUESTS", "10000")),
+        "max_requests_jitter": int(os.getenv("MAX_REQUESTS_JITTER", "1000")),
+        "graceful_timeout": int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        "on_starting": on_starting,
+    }
+    logger.info(f"Starting {workers} workers on port {port}")
+    ProductionServer(options).run()
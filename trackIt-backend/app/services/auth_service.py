@@ -1,26 +1,114 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
+from app.config import settings
 from app.models.user import User
-from app.schemas.user import UserCreate, TokenData
+from app.schemas.user import UserCreate, TokenData, CurrentUser
+from app.services.cache import TTLCache
+from app.services import metrics
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configure password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Configure password hashing. Pinning min/max rounds to the configured cost
+# makes hashes created under a different cost report as needing an update.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+class PasswordHashPool:
+    """
+    Bounded worker pool for bcrypt work.
+
+    bcrypt releases the GIL, so a small thread pool runs hashes in parallel
+    without blocking the event loop. At most `max_pending` operations may be
+    running or queued; beyond that callers get a 503 instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    async def run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning("Password hash queue full, rejecting request", extra={"pending": self.pending})
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": min(self.pending, self.workers),
+            "queued": max(self.pending - self.workers, 0),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+metrics.registry.gauge(
+    "password_hash_pool_tasks",
+    "bcrypt operations running or waiting for a worker",
+    lambda: [(("in_flight",), password_hash_pool.stats()["in_flight"]),
+             (("queued",), password_hash_pool.stats()["queued"])],
+    ("state",),
+)
+metrics.registry.counter_callback(
+    "password_hash_pool_operations_total",
+    "bcrypt operations by outcome",
+    lambda: [(("completed",), password_hash_pool.completed), (("rejected",), password_hash_pool.rejected)],
+    ("outcome",),
+)
 
 # JWT Configuration
 SECRET_KEY = "your-secret-key-here"  # Should be in environment variables
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Verified token -> (email, guest user or None), and email -> resolved user.
+# Token entries never outlive the token's own exp claim.
+token_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES)
+user_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES)
+
+CREDENTIALS_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
@@ -29,6 +117,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
     return pwd_context.verify(plain_password, str(hashed_password))
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bounded hashing pool"""
+    return await password_hash_pool.run(get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password on the bounded hashing pool.
+
+    Returns (valid, new_hash); new_hash is set when the stored hash was made
+    with a different cost and should be replaced.
+    """
+    if not plain_password or not hashed_password:
+        return False, None
+    return await password_hash_pool.run(pwd_context.verify_and_update, plain_password, str(hashed_password))
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -39,6 +142,10 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def token_expiry(token: str) -> float:
+    """The exp claim (Unix time) of a token this service issued"""
+    return float(jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])["exp"])
+
 def verify_token(token: str) -> TokenData:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -57,34 +164,97 @@ def verify_token(token: str) -> TokenData:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    logger.info(f"Attempting to authenticate user with email: {email}")
-    user = db.query(User).filter(User.email == email).first()
+def invalidate_cached_user(email: str) -> None:
+    """Forget the cached user for this email; call whenever the user row changes"""
+    user_cache.pop(email)
+
+def _decode_token_claims(token: str) -> tuple[str, Optional[CurrentUser]]:
+    """Verify a token and cache its claims until expiry or the cache TTL"""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise CREDENTIALS_EXCEPTION
+    email: Optional[str] = payload.get("sub")
+    if email is None:
+        raise CREDENTIALS_EXCEPTION
+
+    guest = None
+    if payload.get("is_guest"):
+        guest = CurrentUser(
+            email=email,
+            username=payload.get("username") or "Guest",
+            is_guest=True,
+            guest_id=payload.get("guest_id"),
+        )
+
+    ttl = settings.AUTH_CACHE_TTL_SECONDS
+    if payload.get("exp") is not None:
+        ttl = min(ttl, float(payload["exp"]) - time.time())
+    token_cache.set(token, (email, guest), ttl)
+    return email, guest
+
+async def get_user_for_token(db: AsyncSession, token: str) -> CurrentUser:
+    """
+    Resolve a bearer token to the calling user.
+
+    Both the verified token and the resolved user are cached, so repeated
+    requests with the same token need no JWT decode and no database query.
+    """
+    email, guest = _decode_token_claims(token)
+    if guest is not None:
+        if not settings.GUEST_SESSIONS_ENABLED:
+            raise CREDENTIALS_EXCEPTION
+        return guest
+
+    current_user = user_cache.get(email)
+    if current_user is None:
+        user = await db.scalar(select(User).where(User.email == email))
+        if user is None:
+            raise CREDENTIALS_EXCEPTION
+        current_user = CurrentUser(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            is_guest=bool(user.is_guest),
+        )
+        user_cache.set(email, current_user, settings.AUTH_CACHE_TTL_SECONDS)
+    return current_user
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
-        logger.warning(f"No user found with email: {email}")
+        logger.warning("Login failed: unknown email", extra={"email": email})
         return None
-    if not verify_password(password, str(user.hashed_password)):
-        logger.warning("Invalid password")
+    valid, new_hash = await verify_and_update_password(password, str(user.hashed_password))
+    if not valid:
+        logger.warning("Login failed: invalid password", extra={"email": email})
         return None
-    logger.info(f"Successfully authenticated user with email: {email}")
+    if new_hash:
+        # Stored hash predates the current BCRYPT_ROUNDS; upgrade it transparently
+        user.hashed_password = new_hash
+        await db.commit()
+        invalidate_cached_user(email)
+        logger.info("Rehashed password", extra={"email": email})
+    logger.debug("Authenticated user", extra={"email": email})
     return user
 
-def create_user(db: Session, user_data: UserCreate) -> User:
-    logger.info(f"Attempting to create user with email: {user_data.email} and username: {user_data.username}")
-    
+async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
     # Check if user with this email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_email:
-        logger.warning(f"Email {user_data.email} already registered")
+        logger.debug("Signup email already registered", extra={"email": user_data.email})
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Check if username is taken
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_username = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_username:
-        logger.warning(f"Username {user_data.username} already taken")
+        logger.debug("Signup username already taken", extra={"username": user_data.username})
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
@@ -92,7 +262,6 @@ def create_user(db: Session, user_data: UserCreate) -> User:
     
     # Validate password length
     if len(user_data.password) < 8:
-        logger.warning("Password too short")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password must be at least 8 characters long"
@@ -100,14 +269,12 @@ def create_user(db: Session, user_data: UserCreate) -> User:
     
     # Validate username length
     if len(user_data.username) < 3 or len(user_data.username) > 50:
-        logger.warning("Username length invalid")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username must be between 3 and 50 characters"
         )
 
-    logger.info("All validations passed, creating new user")
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -116,13 +283,14 @@ def create_user(db: Session, user_data: UserCreate) -> User:
     
     try:
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        logger.info(f"Successfully created user with email: {user_data.email}")
+        await db.commit()
+        await db.refresh(db_user)
+        invalidate_cached_user(db_user.email)
+        logger.info("Created user", extra={"email": user_data.email, "user_id": db_user.id})
         return db_user
     except Exception as e:
-        logger.error(f"Error creating user: {str(e)}")
-        db.rollback()
+        logger.exception("Error creating user", extra={"email": user_data.email})
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating user: {str(e)}"
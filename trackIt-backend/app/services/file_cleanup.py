@@ -0,0 +1,222 @@
+"""
+Deferred removal of released resume files, and a reconciler for files no
+row references.
+
+Requests never remove files themselves. When the last reference to a file
+is dropped, resume_store.release_resumes records it in
+pending_file_deletions in the same transaction, so a rolled-back delete
+keeps its file and a committed one cannot lose track of it. Each server
+worker runs a FileDeletionWorker that removes recorded files in batches.
+
+Claims are a single UPDATE ... RETURNING, which row-locks the batch on
+PostgreSQL (SKIP LOCKED lets other workers take the next rows) and takes
+the write lock on SQLite. An upload that re-creates a queued file first
+deletes its row (cancel()), so it waits for a batch holding that row to
+commit before writing the file again.
+
+The reconciler finds what the queue cannot: files left behind by a crash
+between writing a file and committing the row that references it.
+
+    python -m app.services.file_cleanup [--dry-run] [--min-age-minutes N]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.job import PendingFileDeletion, ResumeBlob, ResumeVersion
+from app.services import metrics
+from app.services.file_service import FileService
+
+logger = logging.getLogger(__name__)
+
+# Rows that keep failing stay in the table, for inspection, once they reach this
+MAX_ATTEMPTS = 5
+
+deletions = metrics.registry.counter(
+    "resume_file_deletions_total", "Queued resume file removals by outcome", ["status"]
+)
+
+
+async def schedule(db: AsyncSession, file_paths: Iterable[str]) -> None:
+    """Queue files for removal; takes effect when the caller's transaction commits"""
+    rows = [{"file_path": file_path} for file_path in file_paths]
+    if rows:
+        await db.execute(insert(PendingFileDeletion), rows)
+
+
+async def cancel(db: AsyncSession, file_path: str) -> None:
+    """Keep a queued file that an upload is about to write again"""
+    await db.execute(
+        delete(PendingFileDeletion)
+        .where(PendingFileDeletion.file_path == file_path)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _remove_files(file_paths: List[str]) -> Set[str]:
+    """Remove files (missing ones count as removed); returns those that failed"""
+    failed = set()
+    for file_path in file_paths:
+        try:
+            FileService.delete_resume(file_path)
+        except Exception:
+            failed.add(file_path)
+    return failed
+
+
+class FileDeletionWorker:
+    def __init__(self, batch_size: int, poll_interval: float):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wake: Optional[asyncio.Event] = None
+
+    def notify(self) -> None:
+        """Wake the worker once new deletions are committed"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self) -> None:
+        """Remove batches until cancelled, idling until notify() or the next poll"""
+        self._wake = asyncio.Event()
+        while True:
+            try:
+                claimed = await self.process_pending()
+            except Exception:
+                logger.exception("Resume file deletion batch failed")
+                claimed = 0
+            # A full batch suggests more rows are waiting
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def process_pending(self) -> int:
+        """Remove one batch of queued files; returns how many rows were claimed"""
+        async with AsyncSessionLocal() as db:
+            batch = (
+                select(PendingFileDeletion.id)
+                .where(PendingFileDeletion.attempts < MAX_ATTEMPTS)
+                .order_by(PendingFileDeletion.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                update(PendingFileDeletion)
+                .where(PendingFileDeletion.id.in_(batch.scalar_subquery()))
+                .values(attempts=PendingFileDeletion.attempts + 1)
+                .returning(PendingFileDeletion.id, PendingFileDeletion.file_path, PendingFileDeletion.attempts)
+                .execution_options(synchronize_session=False)
+            )
+            rows = result.all()
+            if not rows:
+                return 0
+
+            file_paths = {row.file_path for row in rows}
+            # A new upload of the same content may have re-created the blob
+            still_used = set((await db.scalars(
+                select(ResumeBlob.file_path).where(ResumeBlob.file_path.in_(file_paths))
+            )).all())
+            failed = await run_in_threadpool(_remove_files, sorted(file_paths - still_used))
+
+            await db.execute(
+                delete(PendingFileDeletion)
+                .where(PendingFileDeletion.id.in_([row.id for row in rows if row.file_path not in failed]))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        for row in rows:
+            if row.file_path in failed and row.attempts >= MAX_ATTEMPTS:
+                logger.warning("Giving up on removing resume file", extra={"path": row.file_path})
+        deletions.inc(len(file_paths - still_used - failed), "removed")
+        deletions.inc(len(file_paths & still_used), "reused")
+        deletions.inc(len(failed), "failed")
+        return len(rows)
+
+
+worker = FileDeletionWorker(
+    batch_size=settings.FILE_DELETION_BATCH_SIZE,
+    poll_interval=settings.FILE_DELETION_POLL_SECONDS,
+)
+
+
+class ReconcileReport(NamedTuple):
+    scanned: int
+    orphans: List[str]
+    removed: int
+
+
+def _find_orphans(upload_dir: str, referenced: Set[str], cutoff: float) -> Tuple[int, List[str]]:
+    """(files scanned, files older than `cutoff` that nothing references)"""
+    scanned = 0
+    orphans = []
+    for root, _, filenames in os.walk(upload_dir):
+        for filename in filenames:
+            file_path = os.path.join(root, filename)
+            scanned += 1
+            if file_path in referenced:
+                continue
+            try:
+                if os.stat(file_path).st_mtime < cutoff:
+                    orphans.append(file_path)
+            except FileNotFoundError:
+                pass
+    return scanned, sorted(orphans)
+
+
+async def reconcile(db: AsyncSession, dry_run: bool = False, min_age: timedelta = timedelta(hours=1)) -> ReconcileReport:
+    """
+    Walk FileService.UPLOAD_DIR for files that no resume version or blob
+    references, removing them unless `dry_run`. Files younger than `min_age`
+    are left alone: they may belong to an upload that has not committed yet.
+    Abandoned staging files (.upload-*.part) are orphans too.
+    """
+    referenced = set()
+    for column in (ResumeVersion.file_path, ResumeBlob.file_path):
+        for file_path in (await db.scalars(select(column).distinct())).all():
+            referenced.add(os.path.abspath(file_path))
+    cutoff = time.time() - min_age.total_seconds()
+    upload_dir = os.path.abspath(FileService.UPLOAD_DIR)
+    scanned, orphans = await run_in_threadpool(_find_orphans, upload_dir, referenced, cutoff)
+
+    removed = 0
+    if orphans and not dry_run:
+        failed = await run_in_threadpool(_remove_files, orphans)
+        removed = len(orphans) - len(failed)
+    return ReconcileReport(scanned, orphans, removed)
+
+
+async def _reconcile(dry_run: bool, min_age_minutes: int) -> None:
+    async with AsyncSessionLocal() as db:
+        report = await reconcile(db, dry_run, timedelta(minutes=min_age_minutes))
+    for file_path in report.orphans:
+        logger.info("Orphaned resume file", extra={"path": file_path, "dry_run": dry_run})
+    logger.info(
+        f"Scanned {report.scanned} files: {len(report.orphans)} orphaned, {report.removed} removed"
+    )
+
+
+if __name__ == "__main__":
+    from app.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Find and remove resume files that nothing references")
+    parser.add_argument("--dry-run", action="store_true", help="only report the orphaned files")
+    parser.add_argument(
+        "--min-age-minutes", type=int, default=60,
+        help="leave younger files alone; they may belong to an upload in progress (default: 60)",
+    )
+    args = parser.parse_args()
+    configure_logging()
+    asyncio.run(_reconcile(args.dry_run, args.min_age_minutes))
@@ -0,0 +1,230 @@
+"""
+Conditional and range-aware responses for stored resume files.
+
+Validators (ETag, Last-Modified) and the Content-Length come from the
+metadata recorded on ResumeVersion at upload time, so revalidation requests
+are answered with 304 without touching the filesystem and Range requests are
+served as 206 partial content.
+
+Resumes are user uploads, so they are only rendered inline for types the
+browser cannot run script from (INLINE_TYPES); anything else, e.g. an
+upload named resume.html or resume.svg, is sent as an octet-stream
+attachment. Every response carries X-Content-Type-Options: nosniff.
+"""
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import BinaryIO, Iterator, Optional
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.models.job import ResumeVersion
+from app.schemas.job import ResumeVersionResponse
+from app.services import metrics
+
+CHUNK_SIZE = 64 * 1024
+# A version's bytes never change, but resumes are private to their owner
+CACHE_CONTROL = "private, max-age=86400"
+INLINE_TYPES = frozenset({"application/pdf", "text/plain", "image/png", "image/jpeg"})
+DOWNLOAD_TYPE = "application/octet-stream"
+
+
+def _served_as(media_type: str, disposition: str) -> tuple[str, str]:
+    """(media type, disposition) to send; inline only for INLINE_TYPES"""
+    if disposition == "inline" and media_type.split(";")[0].strip().lower() in INLINE_TYPES:
+        return media_type, disposition
+    return DOWNLOAD_TYPE, "attachment"
+
+
+def _content_disposition(disposition: str, filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _parse_range(range_header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into inclusive (start, end) offsets.
+
+    Returns None when the header should be ignored (unknown unit, multiple
+    ranges or malformed). Raises 416 when the range cannot be satisfied.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_text), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start > end and start_text and end_text:
+        return None
+    if start >= size or size == 0:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
+def _iter_file(file: BinaryIO, start: int, length: int) -> Iterator[bytes]:
+    # Plain generator: Starlette iterates it in the threadpool
+    try:
+        file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+        metrics.resume_bytes_served.inc(length - remaining, "disk")
+
+
+def _validators(
+    request: Request,
+    filename: str,
+    content_hash: Optional[str],
+    upload_date: Optional[datetime],
+    disposition: str,
+) -> tuple[dict, Optional[str], bool]:
+    """
+    Build the caching headers for a resume version.
+
+    Returns (headers, etag, not_modified); not_modified is True when the
+    client's cached copy is still current and a 304 should be sent.
+    """
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": CACHE_CONTROL,
+        "Content-Disposition": _content_disposition(disposition, filename),
+        "X-Content-Type-Options": "nosniff",
+    }
+    etag = f'"{content_hash}"' if content_hash else None
+    if etag:
+        headers["ETag"] = etag
+    last_modified = upload_date
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    not_modified = False
+    if if_none_match is not None:
+        not_modified = etag is not None and _etag_matches(if_none_match, etag)
+    elif if_modified_since and last_modified is not None:
+        not_modified = _not_modified_since(if_modified_since, last_modified)
+    return headers, etag, not_modified
+
+
+def _requested_range(request: Request, etag: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or (etag is not None and if_range.strip() == etag)):
+        return _parse_range(range_header, size)
+    return None
+
+
+async def resume_file_response(
+    request: Request,
+    resume_version: ResumeVersion,
+    media_type: str,
+    disposition: str,
+) -> Response:
+    """Serve a resume version honouring If-None-Match, If-Modified-Since and Range"""
+    media_type, disposition = _served_as(media_type, disposition)
+    headers, etag, not_modified = _validators(
+        request, str(resume_version.filename), resume_version.content_hash,
+        resume_version.upload_date, disposition,
+    )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        file = await run_in_threadpool(open, str(resume_version.file_path), "rb")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Resume file not found")
+
+    size = resume_version.size
+    if size is None:
+        # Uploaded before metadata was recorded
+        size = (await run_in_threadpool(os.fstat, file.fileno())).st_size
+
+    try:
+        byte_range = _requested_range(request, etag, size)
+    except HTTPException:
+        file.close()
+        raise
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_iter_file(file, 0, size), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    length = end - start + 1
+    headers["Content-Length"] = str(length)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        _iter_file(file, start, length), status_code=206, media_type=media_type, headers=headers
+    )
+
+
+def resume_bytes_response(
+    request: Request,
+    resume_version: ResumeVersionResponse,
+    content: bytes,
+    content_hash: str,
+    media_type: str,
+    disposition: str,
+) -> Response:
+    """Same semantics as resume_file_response for resumes held in memory (guest sessions)"""
+    media_type, disposition = _served_as(media_type, disposition)
+    headers, etag, not_modified = _validators(
+        request, resume_version.filename, content_hash, resume_version.upload_date, disposition
+    )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    byte_range = _requested_range(request, etag, len(content))
+    if byte_range is None:
+        metrics.resume_bytes_served.inc(len(content), "memory")
+        return Response(content, media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+    metrics.resume_bytes_served.inc(end - start + 1, "memory")
+    return Response(content[start:end + 1], status_code=206, media_type=media_type, headers=headers)
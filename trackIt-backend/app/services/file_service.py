@@ -1,54 +1,115 @@
 import os
 import shutil
+import logging
+import hashlib
+import tempfile
+from typing import NamedTuple
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
-from datetime import datetime
+
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+class ResumeTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_RESUME_SIZE_MB"""
+
+class StagedResume(NamedTuple):
+    temp_path: str
+    original_filename: str
+    size: int
+    sha256: str
+
+def _write_chunk(out, digest, chunk: bytes) -> None:
+    digest.update(chunk)
+    out.write(chunk)
+
+def _move_into_place(temp_path: str, file_path: Path) -> None:
+    os.makedirs(file_path.parent, exist_ok=True)
+    os.replace(temp_path, file_path)
 
 class FileService:
     # Get the absolute path to the project root
     PROJECT_ROOT = Path(__file__).parent.parent.parent
-    UPLOAD_DIR = PROJECT_ROOT / "uploads" / "resumes"
+    UPLOAD_DIR = Path(settings.RESUME_UPLOAD_DIR) if settings.RESUME_UPLOAD_DIR else PROJECT_ROOT / "uploads" / "resumes"
+    CHUNK_SIZE = 1024 * 1024
 
     @classmethod
-    async def save_resume(cls, file: UploadFile, job_id: int, version: int) -> tuple[str, str]:
+    async def stage_resume(cls, file: UploadFile) -> StagedResume:
         """
-        Save a resume file to the uploads directory.
+        Stream a resume upload into a temporary file in the uploads directory.
+
+        The upload is copied in CHUNK_SIZE pieces, hashing as it goes, with all
+        disk I/O in the threadpool. The staged file is later either promoted
+        into the blob store or discarded.
         
         Args:
             file (UploadFile): The uploaded file
-            job_id (int): The ID of the job this resume is for
-            version (int): The version number for this resume
             
         Returns:
-            tuple[str, str]: A tuple containing (file_path, original_filename)
+            StagedResume: (temp_path, original_filename, size, sha256)
+
+        Raises:
+            ResumeTooLargeError: If the upload exceeds MAX_RESUME_SIZE_MB
         """
         # Create uploads directory if it doesn't exist
         os.makedirs(cls.UPLOAD_DIR, exist_ok=True)
         
-        # Get original filename and extension
-        original_filename = file.filename or f"resume_{job_id}_v{version}.pdf"
-        file_extension = os.path.splitext(original_filename)[1]
-        
-        # Create versioned filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"resume_{job_id}_v{version}_{timestamp}{file_extension}"
-        file_path = cls.UPLOAD_DIR / filename
+        original_filename = file.filename or "resume.pdf"
+        max_bytes = settings.MAX_RESUME_SIZE_MB * 1024 * 1024
         
+        fd, temp_path = await run_in_threadpool(
+            tempfile.mkstemp, dir=cls.UPLOAD_DIR, prefix=".upload-", suffix=".part"
+        )
         try:
-            # Read the uploaded file
-            contents = await file.read()
+            digest = hashlib.sha256()
+            size = 0
+            with os.fdopen(fd, "wb") as out:
+                while chunk := await file.read(cls.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ResumeTooLargeError(
+                            f"Resume exceeds the {settings.MAX_RESUME_SIZE_MB} MB upload limit"
+                        )
+                    await run_in_threadpool(_write_chunk, out, digest, chunk)
             
-            # Write to new file
-            with open(file_path, "wb") as f:
-                f.write(contents)
-            
-            return str(file_path), original_filename
+            metrics.resume_bytes_uploaded.inc(size, "disk")
+            return StagedResume(temp_path, original_filename, size, digest.hexdigest())
+        except ResumeTooLargeError:
+            await run_in_threadpool(cls._discard, temp_path)
+            raise
         except Exception as e:
-            print(f"Error saving file: {str(e)}")
+            await run_in_threadpool(cls._discard, temp_path)
+            logger.exception("Error saving resume upload")
             raise Exception(f"Could not save file: {str(e)}")
         finally:
             await file.close()
 
+    @classmethod
+    def blob_path(cls, sha256: str) -> Path:
+        """Content-addressed location of a blob, fanned out by hash prefix"""
+        return cls.UPLOAD_DIR / sha256[:2] / sha256
+
+    @classmethod
+    async def promote_resume(cls, staged: StagedResume) -> str:
+        """Atomically move a staged upload to its content-addressed path"""
+        file_path = cls.blob_path(staged.sha256)
+        await run_in_threadpool(_move_into_place, staged.temp_path, file_path)
+        return str(file_path)
+
+    @classmethod
+    async def discard_staged(cls, staged: StagedResume) -> None:
+        await run_in_threadpool(cls._discard, staged.temp_path)
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
     @classmethod
     def delete_resume(cls, file_path: str) -> None:
         """
@@ -58,5 +119,5 @@ class FileService:
             if os.path.exists(file_path):
                 os.remove(file_path)
         except Exception as e:
-            print(f"Error deleting file: {str(e)}")
+            logger.exception("Error deleting resume file", extra={"path": file_path})
             raise Exception(f"Could not delete file: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,319 @@
+"""
+In-memory workspaces for guest sessions.
+
+Guest tokens (see /api/auth/guest-login) carry a guest_id claim. Each guest
+gets a workspace holding their jobs and resume files in process memory, so
+guest traffic never reaches the database or the upload directory. Workspaces
+are created at guest login and expire at the token's exp claim; a background
+reaper reclaims them. When the store reaches its memory budget the least
+recently used workspaces are evicted first. A workspace that has expired or
+been evicted is gone for good (GuestWorkspaceGone): it is never re-created
+under the same guest id, since that would silently swap the guest's data for
+the sample jobs.
+
+The store belongs to one process. Under a multi-worker server (see
+app.server) every worker holds its own workspaces, so a guest session only
+works reliably with a single worker or with sticky routing to one worker.
+"""
+import asyncio
+import hashlib
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from fastapi import UploadFile
+
+from app.config import settings
+from app.services import metrics
+from app.models.job import JobStatus
+from app.schemas.job import JobCreate, JobResponse, ResumeVersionResponse
+
+logger = logging.getLogger(__name__)
+
+# Rough per-job bookkeeping cost on top of the text fields
+JOB_OVERHEAD_BYTES = 512
+
+SAMPLE_JOBS = [
+    ("Google", "Full Stack Developer", JobStatus.APPLIED, 0,
+     "Applied through company website. Following up next week."),
+    ("Microsoft", "Frontend Engineer", JobStatus.INTERVIEWING, 7,
+     "Technical interview scheduled for next week. Preparing LeetCode problems."),
+    ("Amazon", "Software Development Engineer", JobStatus.REJECTED, 14,
+     "Got feedback: 'Good technical skills but looking for more experience'."),
+    ("Apple", "iOS Developer", JobStatus.ACCEPTED, 30,
+     "Offer received! Reviewing compensation package."),
+]
+
+
+class GuestQuotaExceeded(Exception):
+    """Raised when a guest workspace or the whole store is out of memory budget"""
+
+
+class GuestWorkspaceGone(Exception):
+    """Raised for a guest whose workspace expired, was evicted or never existed here"""
+
+
+class GuestVersionConflict(Exception):
+    """Raised when a guest job no longer has the row version an update expected"""
+
+
+class GuestFile(NamedTuple):
+    content: bytes
+    content_type: str
+    sha256: str
+
+
+def _job_footprint(job: JobResponse) -> int:
+    return JOB_OVERHEAD_BYTES + len(job.company) + len(job.position) + len(job.notes or "")
+
+
+class GuestWorkspace:
+    """One guest's jobs and resume files"""
+
+    def __init__(self, guest_id: str, expires_at: float):
+        self.guest_id = guest_id
+        self.expires_at = expires_at  # Unix time, the token's exp claim
+        self.jobs: Dict[int, JobResponse] = {}
+        self.files: Dict[int, GuestFile] = {}
+        self.bytes_used = 0
+        self._ids = itertools.count(1)
+
+    def list_jobs(self) -> List[JobResponse]:
+        """All jobs, newest first, matching the database ordering"""
+        return sorted(self.jobs.values(), key=lambda job: (job.created_at, job.id), reverse=True)
+
+    def get_job(self, job_id: int) -> Optional[JobResponse]:
+        return self.jobs.get(job_id)
+
+    def get_resume(self, job_id: int, version_id: int) -> Optional[tuple[ResumeVersionResponse, GuestFile]]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        for version in job.resumes:
+            if version.id == version_id:
+                return version, self.files[version_id]
+        return None
+
+
+class GuestStore:
+    def __init__(self, max_bytes: int, workspace_max_bytes: int):
+        self.max_bytes = max_bytes
+        self.workspace_max_bytes = workspace_max_bytes
+        self.bytes_used = 0
+        self.evictions = 0
+        self._workspaces: "OrderedDict[str, GuestWorkspace]" = OrderedDict()
+
+    def _live(self, guest_id: str) -> Optional[GuestWorkspace]:
+        """The guest's workspace unless it is missing or expired (expired ones are dropped)"""
+        workspace = self._workspaces.get(guest_id)
+        if workspace is not None and workspace.expires_at <= time.time():
+            self._drop(guest_id)
+            workspace = None
+        return workspace
+
+    def _workspace(self, guest_id: str) -> GuestWorkspace:
+        """Return the guest's workspace, marking it recently used"""
+        workspace = self._live(guest_id)
+        if workspace is None:
+            raise GuestWorkspaceGone("Guest session has expired; start a new one")
+        self._workspaces.move_to_end(guest_id)
+        return workspace
+
+    def _seed(self, workspace: GuestWorkspace) -> None:
+        now = datetime.utcnow()
+        for company, position, status, days_ago, notes in reversed(SAMPLE_JOBS):
+            applied = now - timedelta(days=days_ago)
+            self._insert_job(workspace, JobCreate(
+                company=company, position=position, status=status, notes=notes, applied_date=applied
+            ), created_at=applied)
+
+    def _reserve(self, workspace: GuestWorkspace, nbytes: int) -> None:
+        if workspace.bytes_used + nbytes > self.workspace_max_bytes:
+            raise GuestQuotaExceeded("Guest workspace storage limit reached")
+        # Make room by evicting the least recently used other workspaces
+        while self.bytes_used + nbytes > self.max_bytes:
+            victim = next((guest_id for guest_id in self._workspaces if guest_id != workspace.guest_id), None)
+            if victim is None:
+                raise GuestQuotaExceeded("Guest storage is full, please try again later")
+            self._drop(victim)
+            self.evictions += 1
+        workspace.bytes_used += nbytes
+        self.bytes_used += nbytes
+
+    def _release(self, workspace: GuestWorkspace, nbytes: int) -> None:
+        workspace.bytes_used -= nbytes
+        self.bytes_used -= nbytes
+
+    def _drop(self, guest_id: str) -> None:
+        workspace = self._workspaces.pop(guest_id, None)
+        if workspace is not None:
+            self.bytes_used -= workspace.bytes_used
+
+    def _insert_job(self, workspace: GuestWorkspace, job_create: JobCreate, created_at: datetime) -> JobResponse:
+        job = JobResponse(
+            id=next(workspace._ids),
+            created_at=created_at,
+            resumes=[],
+            **job_create.model_dump(),
+        )
+        self._reserve(workspace, _job_footprint(job))
+        workspace.jobs[job.id] = job
+        return job
+
+    def open(self, guest_id: str, expires_at: float) -> None:
+        """Create a seeded workspace for a new guest token expiring at `expires_at`"""
+        workspace = GuestWorkspace(guest_id, expires_at)
+        self._workspaces[guest_id] = workspace
+        self._seed(workspace)
+
+    def exists(self, guest_id: str) -> bool:
+        return self._live(guest_id) is not None
+
+    def list_jobs(self, guest_id: str) -> List[JobResponse]:
+        return self._workspace(guest_id).list_jobs()
+
+    def get_job(self, guest_id: str, job_id: int) -> Optional[JobResponse]:
+        return self._workspace(guest_id).get_job(job_id)
+
+    def create_job(self, guest_id: str, job_create: JobCreate) -> JobResponse:
+        return self._insert_job(self._workspace(guest_id), job_create, created_at=datetime.utcnow())
+
+    def create_jobs(self, guest_id: str, job_creates: List[JobCreate]) -> int:
+        """Insert a batch of jobs; on a quota error the jobs before it are kept"""
+        workspace = self._workspace(guest_id)
+        for job_create in job_creates:
+            self._insert_job(workspace, job_create, created_at=datetime.utcnow())
+        return len(job_creates)
+
+    def delete_job(self, guest_id: str, job_id: int) -> bool:
+        workspace = self._workspace(guest_id)
+        job = workspace.jobs.pop(job_id, None)
+        if job is None:
+            return False
+        for version in job.resumes:
+            self._release(workspace, len(workspace.files.pop(version.id).content))
+        self._release(workspace, _job_footprint(job))
+        return True
+
+    def update_job(
+        self, guest_id: str, job_id: int, changes: dict, versions: Optional[List[int]] = None
+    ) -> Optional[JobResponse]:
+        """
+        Change some of a job's fields, returning the updated job (None if there
+        is no such job). With `versions`, the job's row version must be one of them.
+        """
+        workspace = self._workspace(guest_id)
+        job = workspace.jobs.get(job_id)
+        if job is None:
+            return None
+        if versions is not None and job.row_version not in versions:
+            raise GuestVersionConflict("Job was modified by another request")
+        updated = job.model_copy(
+            update={**changes, "row_version": job.row_version + 1, "updated_at": datetime.utcnow()}
+        )
+        growth = _job_footprint(updated) - _job_footprint(job)
+        if growth > 0:
+            self._reserve(workspace, growth)
+        else:
+            self._release(workspace, -growth)
+        workspace.jobs[job_id] = updated
+        return updated
+
+    def add_resume(
+        self, guest_id: str, job_id: int, filename: str, content: bytes, content_type: str
+    ) -> Optional[JobResponse]:
+        """Attach a new resume version, returning the updated job (None if there is no such job)"""
+        workspace = self._workspace(guest_id)
+        job = workspace.jobs.get(job_id)
+        if job is None:
+            return None
+        self._reserve(workspace, len(content))
+        version_id = next(workspace._ids)
+        version = ResumeVersionResponse(
+            id=version_id,
+            job_id=job.id,
+            version=max((v.version for v in job.resumes), default=0) + 1,
+            filename=filename,
+            file_path=f"memory://{guest_id}/{version_id}",
+            upload_date=datetime.utcnow(),
+            size=len(content),
+            content_type=content_type,
+        )
+        workspace.files[version_id] = GuestFile(content, content_type, hashlib.sha256(content).hexdigest())
+        job.resumes.append(version)
+        return job
+
+    def get_resume(
+        self, guest_id: str, job_id: int, version_id: int
+    ) -> Optional[tuple[ResumeVersionResponse, GuestFile]]:
+        return self._workspace(guest_id).get_resume(job_id, version_id)
+
+    def delete_resume(self, guest_id: str, job_id: int, version_id: int) -> bool:
+        workspace = self._workspace(guest_id)
+        job = workspace.jobs.get(job_id)
+        if job is None or version_id not in workspace.files:
+            return False
+        job.resumes = [version for version in job.resumes if version.id != version_id]
+        self._release(workspace, len(workspace.files.pop(version_id).content))
+        return True
+
+    def reap_expired(self) -> int:
+        now = time.time()
+        expired = [guest_id for guest_id, ws in self._workspaces.items() if ws.expires_at <= now]
+        for guest_id in expired:
+            self._drop(guest_id)
+        return len(expired)
+
+    async def run_reaper(self, interval: float) -> None:
+        """Reclaim expired workspaces every `interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            reaped = self.reap_expired()
+            if reaped:
+                logger.info(f"Reclaimed {reaped} expired guest workspaces")
+
+    def stats(self) -> dict:
+        return {
+            "workspaces": len(self._workspaces),
+            "bytes_used": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+async def read_guest_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """Read a guest upload into memory, enforcing the size limit while reading"""
+    chunks = []
+    size = 0
+    try:
+        while chunk := await file.read(1024 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                raise GuestQuotaExceeded(f"Resume exceeds the {max_bytes // (1024 * 1024)} MB guest upload limit")
+            chunks.append(chunk)
+    finally:
+        await file.close()
+    metrics.resume_bytes_uploaded.inc(size, "memory")
+    return b"".join(chunks)
+
+
+guest_store = GuestStore(
+    max_bytes=settings.GUEST_STORE_MAX_MB * 1024 * 1024,
+    workspace_max_bytes=settings.GUEST_WORKSPACE_MAX_MB * 1024 * 1024,
+)
+
+metrics.registry.gauge(
+    "guest_store_bytes", "Memory held by guest workspaces",
+    lambda: [((), guest_store.bytes_used)],
+)
+metrics.registry.gauge(
+    "guest_store_workspaces", "Live guest workspaces",
+    lambda: [((), guest_store.stats()["workspaces"])],
+)
+metrics.registry.counter_callback(
+    "guest_store_evictions_total", "Guest workspaces evicted to stay within the memory budget",
+    lambda: [((), guest_store.evictions)],
+)
@@ -0,0 +1,116 @@
+"""
+Database health and connection-pool statistics for the probe endpoints.
+
+A background task runs `SELECT 1` every HEALTH_PROBE_INTERVAL_SECONDS and
+keeps the latest result, so /readyz answers from memory instead of putting
+load on the database each time the load balancer polls it. Query latency
+is sampled by the engine hooks in app.db.session (see app.services.metrics).
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db.session import async_engine
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseHealth:
+    def __init__(self, engine: AsyncEngine, interval: float, timeout: float):
+        self.engine = engine
+        self.interval = interval
+        self.timeout = timeout
+        self.healthy: Optional[bool] = None  # None until the first probe finishes
+        self.checked_at: Optional[datetime] = None
+        self.last_success: Optional[float] = None
+        self.latency: Optional[float] = None
+        self.error: Optional[str] = None
+
+    async def probe(self) -> bool:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._select_one(), self.timeout)
+        except Exception as e:
+            if self.healthy is not False:
+                logger.error(f"Database health check failed: {e!r}")
+            self.healthy = False
+            self.error = repr(e)
+        else:
+            if self.healthy is False:
+                logger.info("Database health check recovered")
+            self.healthy = True
+            self.error = None
+            self.last_success = time.monotonic()
+        self.latency = time.perf_counter() - started
+        self.checked_at = datetime.utcnow()
+        return self.healthy
+
+    async def _select_one(self) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def run(self) -> None:
+        """Probe every `interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.probe()
+
+    @property
+    def ready(self) -> bool:
+        # A probe loop that stopped running must not keep reporting healthy
+        stale_after = 3 * self.interval + self.timeout
+        return (
+            bool(self.healthy)
+            and self.last_success is not None
+            and time.monotonic() - self.last_success <= stale_after
+        )
+
+    def pool_stats(self) -> dict:
+        pool = self.engine.pool
+        stats = {"class": type(pool).__name__}
+        # NullPool (used for SQLite) keeps no connections to report on
+        if hasattr(pool, "checkedout"):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        return stats
+
+    def report(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "database": {
+                "healthy": self.healthy,
+                "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+                "probe_latency_ms": round(self.latency * 1000, 3) if self.latency is not None else None,
+                "error": self.error,
+            },
+            "pool": self.pool_stats(),
+            "queries": metrics.recent_queries.summary(),
+        }
+
+
+db_health = DatabaseHealth(
+    async_engine,
+    interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+)
+
+
+def _pool_samples():
+    stats = db_health.pool_stats()
+    return [((key,), value) for key, value in stats.items() if key != "class"]
+
+
+metrics.registry.gauge(
+    "db_pool_connections", "Async engine connection pool state", _pool_samples, ("state",)
+)
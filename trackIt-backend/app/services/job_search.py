@@ -0,0 +1,120 @@
+"""
+Ranked full-text search over a user's jobs and their resume text.
+
+Queries are split into word terms, each matched as a prefix (so results
+narrow as the user types) and all required to match. Account searches run
+against the database indexes from app.db.fulltext; guest workspaces are
+small enough to match in memory. Resume content search covers the text
+extracted by app.services.resume_text.
+"""
+import re
+from typing import List
+
+from sqlalchemy import Select, column, func, literal_column, select, table, text
+from sqlalchemy.orm import selectinload
+
+from app.db.fulltext import FTS_TABLE, RESUME_FTS_TABLE, SEARCH_VECTOR
+from app.models.job import ExtractionStatus, Job, ResumeText, ResumeVersion
+from app.schemas.job import JobResponse
+
+MAX_TERMS = 8
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def parse_terms(query: str) -> List[str]:
+    """Word terms of a search query; punctuation and operators are dropped"""
+    return _WORD.findall(query.lower())[:MAX_TERMS]
+
+
+def _tsquery(terms: List[str]):
+    return func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+
+
+def _fts_match(fts_table: str, terms: List[str]):
+    # Quoted terms keep FTS5 from reading words such as AND or NEAR as operators
+    match = " ".join(f'"{term}"*' for term in terms)
+    return text(f"{fts_table} MATCH :match").bindparams(match=match)
+
+
+def search_query(dialect: str, user_id: int, terms: List[str], limit: int) -> Select:
+    """Best matches first, then newest; `terms` must not be empty"""
+    query = select(Job).options(selectinload(Job.resumes)).where(Job.user_id == user_id)
+    if dialect == "postgresql":
+        tsquery = _tsquery(terms)
+        vector = literal_column(f"jobs.{SEARCH_VECTOR}")
+        rank = func.ts_rank_cd(vector, tsquery)
+        query = query.where(vector.op("@@")(tsquery)).order_by(rank.desc())
+    else:
+        fts = table(FTS_TABLE, column("rowid"))
+        query = (
+            query.join(fts, fts.c.rowid == Job.id)
+            .where(_fts_match(FTS_TABLE, terms))
+            # bm25 is lower for better matches; company and position outweigh notes
+            .order_by(text(f"bm25({FTS_TABLE}, 10.0, 10.0, 1.0)"))
+        )
+    return query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit)
+
+
+def resume_search_query(dialect: str, user_id: int, terms: List[str], limit: int) -> Select:
+    """
+    Resume versions whose extracted text matches, best first, then newest.
+    Rows carry the job's company and position and a snippet around the
+    matches, with matched words in [brackets].
+    """
+    if dialect == "postgresql":
+        tsquery = _tsquery(terms)
+        vector = literal_column(f"resume_texts.{SEARCH_VECTOR}")
+        snippet = func.ts_headline(
+            "english", ResumeText.content, tsquery, "MaxFragments=2, MaxWords=16, MinWords=6, StartSel=[, StopSel=]"
+        )
+        match = vector.op("@@")(tsquery)
+        rank = func.ts_rank_cd(vector, tsquery).desc()
+    else:
+        snippet = literal_column(f"snippet({RESUME_FTS_TABLE}, 0, '[', ']', '...', 16)")
+        match = _fts_match(RESUME_FTS_TABLE, terms)
+        rank = text(f"bm25({RESUME_FTS_TABLE})")
+
+    query = (
+        select(
+            Job.id.label("job_id"),
+            Job.company,
+            Job.position,
+            ResumeVersion.id.label("version_id"),
+            ResumeVersion.version,
+            ResumeVersion.filename,
+            snippet.label("snippet"),
+        )
+        .select_from(ResumeText)
+        .join(ResumeVersion, ResumeVersion.id == ResumeText.resume_version_id)
+        .join(Job, Job.id == ResumeVersion.job_id)
+    )
+    if dialect != "postgresql":
+        fts = table(RESUME_FTS_TABLE, column("rowid"))
+        query = query.join(fts, fts.c.rowid == ResumeText.resume_version_id)
+    return (
+        query.where(Job.user_id == user_id, ResumeText.status == ExtractionStatus.DONE, match)
+        .order_by(rank, ResumeVersion.upload_date.desc(), ResumeVersion.id.desc())
+        .limit(limit)
+    )
+
+
+def match_jobs(jobs: List[JobResponse], terms: List[str]) -> List[JobResponse]:
+    """In-memory equivalent for guest workspaces: company/position hits rank first"""
+    scored = []
+    for job in jobs:
+        title_words = _WORD.findall(f"{job.company} {job.position}".lower())
+        note_words = _WORD.findall((job.notes or "").lower())
+        score = 0
+        for term in terms:
+            if any(word.startswith(term) for word in title_words):
+                score += 10
+            elif any(word.startswith(term) for word in note_words):
+                score += 1
+            else:
+                break
+        else:
+            scored.append((score, job))
+    # Stable sort keeps the newest-first order among equal scores
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [job for _, job in scored]
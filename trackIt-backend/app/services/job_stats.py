@@ -0,0 +1,163 @@
+"""
+Per-user job statistics for the dashboard, kept in a summary table.
+
+JobStatCount holds, for each user, how many jobs are in each status per
+week, where a job's week is the Monday of its applied_date (or of
+created_at while it has none). Every write path in app.api.jobs applies its
+delta to the table in the same transaction as the write, so reading the
+stats touches a handful of small rows however many jobs a user has.
+
+If the table is ever out of step with jobs, rebuild it with:
+
+    python -m app.services.job_stats
+"""
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.job import Job, JobStatCount, JobStatus
+from app.schemas.job import JobStatsResponse, WeeklyApplications
+
+logger = logging.getLogger(__name__)
+
+# (week_start, status) of one job
+StatKey = Tuple[date, JobStatus]
+
+# Statuses that mean the employer answered an application
+RESPONDED = (JobStatus.INTERVIEWING, JobStatus.REJECTED, JobStatus.ACCEPTED)
+
+
+def week_of(value: Optional[datetime]) -> date:
+    """Monday of the (UTC) week containing `value`; now if it is None"""
+    if value is None:
+        value = datetime.utcnow()
+    elif value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    day = value.date()
+    return day - timedelta(days=day.weekday())
+
+
+def stat_key(job) -> StatKey:
+    """Where a job (ORM row, JobCreate or guest job) is counted"""
+    return week_of(job.applied_date or getattr(job, "created_at", None)), job.status
+
+
+async def record(
+    db: AsyncSession, user_id: int, added: Iterable[StatKey] = (), removed: Iterable[StatKey] = ()
+) -> None:
+    """Apply the jobs added and removed by a write; runs in the caller's transaction"""
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    rows = [
+        {"user_id": user_id, "week_start": week_start, "status": status, "count": count}
+        for (week_start, status), count in deltas.items()
+        if count
+    ]
+    if not rows:
+        return
+
+    conn = await db.connection()
+    upsert = postgresql.insert if conn.dialect.name == "postgresql" else sqlite.insert
+    statement = upsert(JobStatCount).values(rows)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=[JobStatCount.user_id, JobStatCount.week_start, JobStatCount.status],
+        set_={"count": JobStatCount.count + statement.excluded["count"]},
+    ))
+    if any(row["count"] < 0 for row in rows):
+        await db.execute(
+            delete(JobStatCount).where(JobStatCount.user_id == user_id, JobStatCount.count <= 0)
+        )
+
+
+def summarize(counts: Iterable[Tuple[date, JobStatus, int]], weeks: int) -> JobStatsResponse:
+    """
+    Dashboard statistics from (week_start, status, count) rows.
+
+    Pending jobs have not been applied to, so they are left out of the
+    weekly applications and of the rates, which are shares of applied jobs.
+    """
+    by_status = {status: 0 for status in JobStatus}
+    per_week: Counter = Counter()
+    for week_start, status, count in counts:
+        by_status[status] += count
+        if status != JobStatus.PENDING:
+            per_week[week_start] += count
+
+    applied = sum(by_status.values()) - by_status[JobStatus.PENDING]
+
+    def rate(count: int) -> float:
+        return round(count / applied, 4) if applied else 0.0
+
+    this_week = week_of(None)
+    return JobStatsResponse(
+        total=sum(by_status.values()),
+        by_status=by_status,
+        applications_per_week=[
+            WeeklyApplications(week_start=week_start, count=per_week[week_start])
+            for week_start in (this_week - timedelta(weeks=n) for n in reversed(range(weeks)))
+        ],
+        response_rate=rate(sum(by_status[status] for status in RESPONDED)),
+        interview_rate=rate(by_status[JobStatus.INTERVIEWING] + by_status[JobStatus.ACCEPTED]),
+        offer_rate=rate(by_status[JobStatus.ACCEPTED]),
+    )
+
+
+async def get_stats(db: AsyncSession, user_id: int, weeks: int) -> JobStatsResponse:
+    result = await db.execute(
+        select(JobStatCount.week_start, JobStatCount.status, JobStatCount.count)
+        .where(JobStatCount.user_id == user_id)
+    )
+    return summarize(result.all(), weeks)
+
+
+def guest_stats(jobs: List, weeks: int) -> JobStatsResponse:
+    """The same statistics computed directly from a guest's in-memory jobs"""
+    counts = Counter(stat_key(job) for job in jobs)
+    return summarize(((week_start, status, count) for (week_start, status), count in counts.items()), weeks)
+
+
+async def rebuild(db: AsyncSession, batch_size: int = 1000) -> int:
+    """
+    Recompute the whole summary table from jobs; returns the number of rows written.
+
+    Jobs are streamed and bucketed with stat_key(), the same helper every
+    write path records with, so a rebuild matches the accumulated deltas.
+    """
+    counts: Counter = Counter()
+    result = await db.stream(
+        select(Job.user_id, Job.status, Job.applied_date, Job.created_at)
+        .where(Job.user_id.is_not(None))
+        .execution_options(yield_per=batch_size)
+    )
+    async for job in result:
+        counts[(job.user_id, *stat_key(job))] += 1
+
+    await db.execute(delete(JobStatCount))
+    rows = [
+        {"user_id": user_id, "week_start": week_start, "status": status, "count": count}
+        for (user_id, week_start, status), count in counts.items()
+    ]
+    for start in range(0, len(rows), batch_size):
+        await db.execute(insert(JobStatCount), rows[start:start + batch_size])
+    return len(rows)
+
+
+async def _rebuild() -> None:
+    async with AsyncSessionLocal() as db:
+        rows = await rebuild(db)
+        await db.commit()
+    logger.info(f"Rebuilt job statistics: {rows} summary rows")
+
+
+if __name__ == "__main__":
+    from app.logging_config import configure_logging
+
+    configure_logging()
+    asyncio.run(_rebuild())
@@ -0,0 +1,201 @@
+"""
+Bulk import and export of jobs as CSV or NDJSON.
+
+Imports are parsed and validated in batches straight from the spooled
+upload and each batch is written in one round trip: COPY on PostgreSQL, a
+single executemany of the INSERT on SQLite. Exports stream rows from a
+server-side cursor, so neither direction materializes a user's whole job
+list. CSV cells that a spreadsheet would run as a formula are exported with
+a leading apostrophe.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import islice
+from typing import AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import AsyncSessionLocal
+from app.models.job import Job, JobStatus
+from app.schemas.job import JobCreate, JobImportError
+
+BATCH_SIZE = 500
+IMPORT_FIELDS = ["company", "position", "status", "notes", "applied_date"]
+EXPORT_FIELDS = IMPORT_FIELDS + ["created_at"]
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+_SUFFIXES = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+# Columns written by COPY; created_at and id come from the table defaults
+_COPY_COLUMNS = ["user_id"] + IMPORT_FIELDS
+# Leading characters that make spreadsheet applications evaluate a CSV cell
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def detect_format(file: UploadFile, requested: Optional[str] = None) -> str:
+    """Pick the import format from the explicit parameter, file name or content type"""
+    fmt = requested.lower() if requested else None
+    if fmt is None:
+        filename = (file.filename or "").lower()
+        fmt = next((f for suffix, f in _SUFFIXES.items() if filename.endswith(suffix)), None)
+    if fmt is None:
+        content_type = (file.content_type or "").split(";")[0].strip()
+        fmt = next((f for f, media_type in MEDIA_TYPES.items() if media_type == content_type), None)
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Unsupported import format. Must be one of: {', '.join(MEDIA_TYPES)}")
+    return fmt
+
+
+def _iter_records(file: UploadFile, fmt: str) -> Iterator[Tuple[int, object, Optional[str]]]:
+    """Yield (line, record, parse_error) for every row of the upload"""
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            for record in reader:
+                yield reader.line_num, record, None
+        else:
+            for line_no, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line), None
+                except json.JSONDecodeError as e:
+                    yield line_no, None, f"Invalid JSON: {e.msg}"
+    finally:
+        # Leave the upload's file open; FastAPI closes it
+        text.detach()
+
+
+def _parse_record(record: object) -> JobCreate:
+    if not isinstance(record, dict):
+        raise ValueError("Expected an object with job fields")
+    data = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        # Empty CSV cells mean "not provided"
+        if value is None or (isinstance(value, str) and not value.strip()):
+            continue
+        if field == "status" and isinstance(value, str):
+            value = value.strip().lower()
+        data[field] = value
+    return JobCreate(**data)
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+        )
+    return str(error)
+
+
+async def iter_import_batches(
+    file: UploadFile, fmt: str, batch_size: int = BATCH_SIZE
+) -> AsyncIterator[Tuple[List[JobCreate], List[JobImportError]]]:
+    """
+    Parse and validate an upload batch by batch.
+
+    Yields (valid_jobs, row_errors) for each batch. Reading and parsing run in
+    the threadpool because the spooled upload may live on disk. A file that is
+    not UTF-8 raises UnicodeDecodeError.
+    """
+    records = _iter_records(file, fmt)
+    while True:
+        batch = await run_in_threadpool(lambda: list(islice(records, batch_size)))
+        if not batch:
+            return
+        valid: List[JobCreate] = []
+        errors: List[JobImportError] = []
+        for line, record, parse_error in batch:
+            if parse_error:
+                errors.append(JobImportError(line=line, error=parse_error))
+                continue
+            try:
+                valid.append(_parse_record(record))
+            except (ValidationError, ValueError) as e:
+                errors.append(JobImportError(line=line, error=_describe(e)))
+        yield valid, errors
+
+
+async def insert_jobs(db: AsyncSession, user_id: int, jobs: List[JobCreate]) -> None:
+    """Insert a batch of jobs in one round trip; the caller commits"""
+    if not jobs:
+        return
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql":
+        raw = await conn.get_raw_connection()
+        # Enum columns store the member name
+        records = [
+            (user_id, job.company, job.position, job.status.name, job.notes, job.applied_date)
+            for job in jobs
+        ]
+        await raw.driver_connection.copy_records_to_table(
+            Job.__tablename__, records=records, columns=_COPY_COLUMNS
+        )
+    else:
+        # One single-row INSERT run through the driver's executemany
+        await db.execute(insert(Job), [{**job.model_dump(), "user_id": user_id} for job in jobs])
+
+
+def _export_value(value: object) -> object:
+    if isinstance(value, JobStatus):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value: object) -> object:
+    """Neutralize a value a spreadsheet would otherwise evaluate as a formula"""
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def format_rows(rows: Iterable[object], fmt: str) -> str:
+    """Render rows (ORM rows or JobResponse objects) in the export format"""
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                [_csv_cell(_export_value(getattr(row, field))) for field in EXPORT_FIELDS]
+            )
+    else:
+        for row in rows:
+            buffer.write(json.dumps({field: _export_value(getattr(row, field)) for field in EXPORT_FIELDS}))
+            buffer.write("\n")
+    return buffer.getvalue()
+
+
+def export_header(fmt: str) -> str:
+    return ",".join(EXPORT_FIELDS) + "\r\n" if fmt == "csv" else ""
+
+
+async def export_jobs(user_id: int, fmt: str, batch_size: int = BATCH_SIZE) -> AsyncIterator[str]:
+    """
+    Stream a user's jobs, newest first, in the export format.
+
+    Uses its own session so the cursor stays open for as long as the
+    response is being sent.
+    """
+    yield export_header(fmt)
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            select(*(getattr(Job, field) for field in EXPORT_FIELDS))
+            .where(Job.user_id == user_id)
+            .order_by(Job.created_at.desc(), Job.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield format_rows(partition, fmt)
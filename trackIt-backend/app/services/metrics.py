@@ -0,0 +1,271 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Recording is a dict lookup plus a bisect under a per-metric lock, cheap
+enough to leave on in production. Request-scoped figures (queries and
+database time per request) are accumulated through a context variable
+set by MetricsMiddleware; the SQLAlchemy hooks in app.db.session feed
+observe_query and observe_pool_wait.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._values.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from `collect` at scrape time"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.collect():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]],
+        labelnames: Sequence[str] = (),
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, collect, labelnames))
+
+    def counter_callback(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Tuple[Tuple[str, ...], float]]],
+        labelnames: Sequence[str] = (),
+    ) -> CallbackMetric:
+        """A counter maintained elsewhere (e.g. a stats attribute) and read at scrape time"""
+        return self.register(CallbackMetric(name, documentation, collect, labelnames, kind="counter"))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class QueryLatency:
+    """Rolling window of statement execution times"""
+
+    def __init__(self, window: int = 1000):
+        self.samples: "deque[float]" = deque(maxlen=window)
+        self.total = 0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.total += 1
+
+    def summary(self) -> dict:
+        samples = sorted(self.samples)
+        if not samples:
+            return {"total": self.total, "window": 0}
+        return {
+            "total": self.total,
+            "window": len(samples),
+            "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+            "max_ms": round(samples[-1] * 1000, 3),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        }
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+http_request_queries = registry.histogram(
+    "http_request_db_queries", "Database statements executed per HTTP request", ("route",), COUNT_BUCKETS
+)
+http_request_db_time = registry.histogram(
+    "http_request_db_seconds", "Database time spent per HTTP request", ("route",)
+)
+db_query_duration = registry.histogram("db_query_duration_seconds", "Database statement execution time")
+db_pool_wait = registry.histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection")
+resume_bytes_uploaded = registry.counter(
+    "resume_upload_bytes_total", "Resume bytes received by upload endpoints", ("storage",)
+)
+resume_bytes_served = registry.counter(
+    "resume_served_bytes_total", "Resume bytes sent by view and download endpoints", ("storage",)
+)
+
+recent_queries = QueryLatency()
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("metrics_request", default=None)
+
+
+def observe_query(seconds: float) -> None:
+    db_query_duration.observe(seconds)
+    recent_queries.record(seconds)
+    stats = _current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += seconds
+
+
+def observe_pool_wait(seconds: float) -> None:
+    db_pool_wait.observe(seconds)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and database usage per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_request.reset(token)
+            # Label by route template, never the raw path, to bound cardinality
+            route = scope.get("route")
+            route_label = getattr(route, "path", "unmatched")
+            http_request_duration.observe(elapsed, scope["method"], route_label, str(status))
+            http_request_queries.observe(stats.queries, route_label)
+            http_request_db_time.observe(stats.db_time, route_label)
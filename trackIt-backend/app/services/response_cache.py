@@ -0,0 +1,138 @@
+"""
+Response cache for the job read endpoints.
+
+Serialized bodies of GET /api/jobs and GET /api/jobs/{id} are cached per
+user together with a strong ETag, so a repeated read is a cache lookup and
+a matching If-None-Match is answered with 304.
+
+Keys embed generation tokens: one per user for list pages and one per job
+for details. Writes replace the relevant token instead of deleting keys,
+which invalidates every variant of a list (filters, cursors) at once and
+keeps a read that raced with a write from re-populating a stale entry.
+Superseded entries simply age out of the backend.
+"""
+import hashlib
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Mapping, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.config import settings
+from app.services.cache import TTLCache
+
+# Clients may reuse their copy but must revalidate it with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    headers: Mapping[str, str]
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses; async so networked stores can plug in"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU, the default backend"""
+
+    def __init__(self, maxsize: int):
+        self.entries = TTLCache(maxsize=maxsize)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self.entries.set(key, value, ttl)
+
+
+class NullCacheBackend(CacheBackend):
+    """Disables caching"""
+
+    async def get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        return None
+
+
+BACKENDS = {
+    "memory": lambda: MemoryCacheBackend(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES),
+    "none": NullCacheBackend,
+}
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def _generation(self, key: str) -> str:
+        generation = await self.backend.get(key)
+        if generation is None:
+            # A fresh random token, so an evicted generation can never
+            # resurrect entries stored under an older one
+            generation = uuid.uuid4().hex
+            await self.backend.set(key, generation, self.ttl)
+        return generation
+
+    async def list_key(self, scope: str, params: Iterable[tuple[str, str]]) -> str:
+        generation = await self._generation(f"{scope}:jobs-gen")
+        query = urlencode(sorted(params))
+        return f"{scope}:jobs:{generation}:{query}"
+
+    async def job_key(self, scope: str, job_id: int) -> str:
+        generation = await self._generation(f"{scope}:job-gen:{job_id}")
+        return f"{scope}:job:{job_id}:{generation}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return await self.backend.get(key)
+
+    async def store(
+        self, key: str, body: bytes, headers: Optional[Mapping[str, str]] = None, etag: Optional[str] = None
+    ) -> CachedResponse:
+        """Cache a body; its ETag defaults to a digest of the body"""
+        entry = CachedResponse(body, etag or f'"{hashlib.sha256(body).hexdigest()[:32]}"', dict(headers or {}))
+        await self.backend.set(key, entry, self.ttl)
+        return entry
+
+    async def invalidate_lists(self, scope: str) -> None:
+        """Call after any write that adds or removes jobs"""
+        await self.backend.set(f"{scope}:jobs-gen", uuid.uuid4().hex, self.ttl)
+
+    async def invalidate_job(self, scope: str, job_id: int) -> None:
+        """Call after any write to a job; list pages embed jobs, so they go too"""
+        await self.backend.set(f"{scope}:job-gen:{job_id}", uuid.uuid4().hex, self.ttl)
+        await self.invalidate_lists(scope)
+
+    async def invalidate_jobs(self, scope: str, job_ids: Iterable[int]) -> None:
+        """invalidate_job() for several jobs, dropping the list pages once"""
+        for job_id in job_ids:
+            await self.backend.set(f"{scope}:job-gen:{job_id}", uuid.uuid4().hex, self.ttl)
+        await self.invalidate_lists(scope)
+
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Answer from a cache entry, with 304 when the client already has this body"""
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and entry.etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(
+    backend=BACKENDS[settings.RESPONSE_CACHE_BACKEND](),
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
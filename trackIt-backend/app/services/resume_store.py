@@ -0,0 +1,179 @@
+"""
+Content-addressed, reference-counted storage for resume files.
+
+Every distinct file is stored once under its SHA-256 (see
+FileService.blob_path) and tracked by a ResumeBlob row. Each ResumeVersion
+that uses the file holds one reference; the file is deleted only when the
+last reference is released.
+
+A new blob's file is written before the transaction that records it
+commits. So stage_resume() first commits a pending_file_deletions row for
+the blob path, and acquire_blob() deletes that row inside the caller's
+transaction. If that transaction commits, the file is kept. If it rolls
+back, or the process dies before it commits, the row survives and the
+deletion worker removes the file.
+"""
+import mimetypes
+from collections import Counter, defaultdict
+from typing import Iterable, List, NamedTuple, Optional
+
+from fastapi import UploadFile
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import ResumeBlob
+from app.services import file_cleanup
+from app.services.file_service import FileService, StagedResume
+
+
+class StoredResume(NamedTuple):
+    blob_id: int
+    file_path: str
+    original_filename: str
+    size: int
+    sha256: str
+    content_type: str
+
+
+def guess_content_type(file: UploadFile) -> str:
+    """Prefer the type implied by the extension over the client-declared one"""
+    guessed, _ = mimetypes.guess_type(file.filename or "")
+    return guessed or file.content_type or "application/octet-stream"
+
+
+async def _add_reference(db: AsyncSession, sha256: str) -> Optional[tuple[int, str]]:
+    """Take a reference on an existing blob, returning (id, file_path) if there is one"""
+    result = await db.execute(
+        update(ResumeBlob)
+        .where(ResumeBlob.sha256 == sha256)
+        .values(ref_count=ResumeBlob.ref_count + 1)
+        .returning(ResumeBlob.id, ResumeBlob.file_path)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.first()
+    return (row.id, row.file_path) if row else None
+
+
+async def stage_resume(db: AsyncSession, file: UploadFile) -> StagedResume:
+    """
+    Stream an upload to a staging file (FileService.stage_resume) and commit
+    the removal of its blob path, which acquire_blob() withdraws when the
+    blob is recorded. Call before the caller's transaction writes anything.
+    """
+    staged = await FileService.stage_resume(file)
+    try:
+        await file_cleanup.schedule(db, [str(FileService.blob_path(staged.sha256))])
+        await db.commit()
+    except Exception:
+        await FileService.discard_staged(staged)
+        raise
+    return staged
+
+
+async def acquire_blob(db: AsyncSession, staged: StagedResume) -> tuple[int, str]:
+    """
+    Reference the blob for a staged upload, creating it if it is new.
+
+    Duplicate content only bumps the existing blob's ref_count and the staged
+    file is discarded; new content is promoted to its content-addressed path.
+    Runs inside the caller's transaction.
+    """
+    existing = await _add_reference(db, staged.sha256)
+    if existing:
+        await FileService.discard_staged(staged)
+        return existing
+
+    # Withdraw the removal stage_resume() queued (and any earlier one) in
+    # this transaction, so it only takes effect if the transaction commits.
+    # A deletion batch holding the row must finish before the file is
+    # written again. Should the worker have taken stage_resume()'s row
+    # already, a crash before commit leaves the file to the reconciler.
+    await file_cleanup.cancel(db, str(FileService.blob_path(staged.sha256)))
+    file_path = await FileService.promote_resume(staged)
+    try:
+        async with db.begin_nested():
+            blob = ResumeBlob(sha256=staged.sha256, file_path=file_path, size=staged.size, ref_count=1)
+            db.add(blob)
+        return blob.id, file_path
+    except IntegrityError:
+        # A concurrent upload of the same content created the blob first
+        existing = await _add_reference(db, staged.sha256)
+        if not existing:
+            raise
+        return existing
+
+
+async def store_resume(db: AsyncSession, file: UploadFile) -> StoredResume:
+    """Stream an upload to disk and reference its blob in the current transaction"""
+    content_type = guess_content_type(file)
+    staged = await stage_resume(db, file)
+    return await store_staged(db, staged, content_type)
+
+
+async def store_staged(db: AsyncSession, staged: StagedResume, content_type: str) -> StoredResume:
+    """Reference the blob of an upload staged by stage_resume(); discards it on failure"""
+    try:
+        blob_id, file_path = await acquire_blob(db, staged)
+    except Exception:
+        await FileService.discard_staged(staged)
+        raise
+    return StoredResume(
+        blob_id, file_path, staged.original_filename, staged.size, staged.sha256, content_type
+    )
+
+
+async def discard_stored(db: AsyncSession, stored: StoredResume) -> None:
+    """
+    Undo store_resume()/store_staged() after the caller's transaction rolled
+    back. The blob reference went with the rollback; the promoted file is
+    queued for removal in a new transaction, and the deletion worker leaves
+    it alone if a blob references it by then.
+    """
+    await file_cleanup.schedule(db, [stored.file_path])
+    await db.commit()
+    file_cleanup.worker.notify()
+
+
+async def release_resumes(db: AsyncSession, versions: Iterable) -> List[str]:
+    """
+    Drop the blob references held by the given resume versions.
+
+    Files left without any reference are queued for removal in the caller's
+    transaction (see app.services.file_cleanup) and returned; callers should
+    call file_cleanup.worker.notify() once it commits. Versions uploaded
+    before the blob store own their file outright. Takes
+    ResumeVersion objects or rows with blob_id and file_path, and issues the
+    same few statements however many versions there are.
+    """
+    orphaned = []
+    references: Counter = Counter()
+    for version in versions:
+        if version.blob_id is None:
+            orphaned.append(str(version.file_path))
+        else:
+            references[version.blob_id] += 1
+    if not references:
+        await file_cleanup.schedule(db, orphaned)
+        return orphaned
+
+    # One UPDATE per distinct number of references dropped; usually just one
+    blobs_by_count = defaultdict(list)
+    for blob_id, count in references.items():
+        blobs_by_count[count].append(blob_id)
+    for count, blob_ids in blobs_by_count.items():
+        await db.execute(
+            update(ResumeBlob)
+            .where(ResumeBlob.id.in_(blob_ids))
+            .values(ref_count=ResumeBlob.ref_count - count)
+            .execution_options(synchronize_session=False)
+        )
+    result = await db.execute(
+        delete(ResumeBlob)
+        .where(ResumeBlob.id.in_(list(references)), ResumeBlob.ref_count <= 0)
+        .returning(ResumeBlob.file_path)
+        .execution_options(synchronize_session=False)
+    )
+    orphaned.extend(result.scalars().all())
+    await file_cleanup.schedule(db, orphaned)
+    return orphaned
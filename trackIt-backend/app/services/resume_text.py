@@ -0,0 +1,251 @@
+"""
+Background text extraction for uploaded resumes.
+
+Uploading a resume only adds a pending ResumeText row in the same
+transaction as its ResumeVersion and wakes the extractor, so the request
+never opens the file. Each server worker runs an extractor task that claims
+pending rows, extracts their text in a process pool (PDF parsing is
+CPU-bound and would hold the GIL), and stores it, where the database indexes
+it for content search (see app.db.fulltext and job_search).
+
+Rows are claimed with a conditional UPDATE, so the extractors of several
+server workers never process the same row twice. A claim left behind by a
+worker that died mid-extraction is retried once it is older than twice
+RESUME_TEXT_TIMEOUT_SECONDS, up to MAX_ATTEMPTS times. An extraction that
+runs past the timeout fails and its pool is terminated; other files that
+were running in that pool go back to pending. Identical files (same content
+hash) reuse text that was already extracted.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.job import ExtractionStatus, ResumeText, ResumeVersion
+from app.services import metrics
+from app.services.text_extraction import UnsupportedResumeType, extract_text, init_worker
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+extractions = metrics.registry.counter(
+    "resume_text_extractions_total", "Finished resume text extractions by outcome", ["status"]
+)
+
+
+def enqueue(version: ResumeVersion) -> None:
+    """Queue text extraction for a new version; saved by the caller's commit"""
+    version.text = ResumeText(status=ExtractionStatus.PENDING, attempts=0)
+
+
+async def forget(db: AsyncSession, version_ids: List[int]) -> None:
+    """Drop the extracted text of resume versions that are being deleted"""
+    if version_ids:
+        await db.execute(
+            delete(ResumeText)
+            .where(ResumeText.resume_version_id.in_(version_ids))
+            .execution_options(synchronize_session=False)
+        )
+
+
+class ResumeTextExtractor:
+    def __init__(self, workers: int, batch_size: int, poll_interval: float, timeout: float, max_chars: int):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.max_chars = max_chars
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def notify(self) -> None:
+        """Wake the extractor once new pending rows are committed"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self) -> None:
+        """Extract batches until cancelled, idling until notify() or the next poll"""
+        self._wake = asyncio.Event()
+        while True:
+            try:
+                claimed = await self.process_pending()
+            except Exception:
+                logger.exception("Resume text extraction batch failed")
+                claimed = 0
+            # A full batch suggests more rows are waiting
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+
+    async def process_pending(self) -> int:
+        """Claim and extract one batch of pending rows; returns how many were claimed"""
+        async with AsyncSessionLocal() as db:
+            versions = await self._claim(db)
+        # Bound concurrency by the pool size so the timeout covers running time only
+        running = asyncio.Semaphore(self.workers)
+
+        async def extract(version: Row) -> None:
+            async with running:
+                await self._extract(version)
+
+        await asyncio.gather(*(extract(version) for version in versions))
+        return len(versions)
+
+    async def _claim(self, db: AsyncSession) -> List[Row]:
+        now = datetime.utcnow()
+        claimable = or_(
+            ResumeText.status == ExtractionStatus.PENDING,
+            and_(
+                ResumeText.status == ExtractionStatus.PROCESSING,
+                ResumeText.claimed_at < now - timedelta(seconds=2 * self.timeout),
+            ),
+        )
+        # Give up on rows whose extraction keeps dying along with its worker
+        await db.execute(
+            update(ResumeText)
+            .where(claimable, ResumeText.attempts >= MAX_ATTEMPTS)
+            .values(status=ExtractionStatus.FAILED, error="Extraction did not finish", claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        candidates = (await db.scalars(
+            select(ResumeText.resume_version_id)
+            .where(claimable)
+            .order_by(ResumeText.resume_version_id)
+            .limit(self.batch_size)
+        )).all()
+
+        claimed = []
+        for version_id in candidates:
+            # Another extractor may have taken the row since it was selected
+            result = await db.execute(
+                update(ResumeText)
+                .where(ResumeText.resume_version_id == version_id, claimable)
+                .values(status=ExtractionStatus.PROCESSING, claimed_at=now, attempts=ResumeText.attempts + 1)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                claimed.append(version_id)
+        await db.commit()
+        if not claimed:
+            return []
+
+        result = await db.execute(
+            select(
+                ResumeVersion.id,
+                ResumeVersion.file_path,
+                ResumeVersion.filename,
+                ResumeVersion.content_type,
+                ResumeVersion.content_hash,
+            ).where(ResumeVersion.id.in_(claimed))
+        )
+        return list(result.all())
+
+    async def _reuse(self, content_hash: Optional[str]) -> Optional[str]:
+        """Text already extracted from an identical file, if any"""
+        if not content_hash:
+            return None
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(
+                select(ResumeText.content)
+                .join(ResumeVersion, ResumeVersion.id == ResumeText.resume_version_id)
+                .where(ResumeVersion.content_hash == content_hash, ResumeText.status == ExtractionStatus.DONE)
+                .limit(1)
+            )
+
+    async def _extract(self, version: Row) -> None:
+        content = None
+        error = None
+        pool = None
+        try:
+            content = await self._reuse(version.content_hash)
+            if content is None:
+                pool = self._pool()
+                content = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(
+                        pool, extract_text,
+                        version.file_path, version.content_type, version.filename, self.max_chars,
+                    ),
+                    self.timeout,
+                )
+            status = ExtractionStatus.DONE
+        except UnsupportedResumeType as e:
+            status, error = ExtractionStatus.UNSUPPORTED, str(e)
+        except (asyncio.TimeoutError, BrokenProcessPool) as e:
+            if pool is not self._executor:
+                # The pool was terminated over another file; extract this one again
+                status = ExtractionStatus.PENDING
+            else:
+                # Terminate the pool: a stuck process would keep its CPU and
+                # memory, and later files would queue behind it
+                self._reset_pool(terminate=True)
+                status = ExtractionStatus.FAILED
+                error = "Extraction timed out" if isinstance(e, asyncio.TimeoutError) else "Extraction process crashed"
+        except Exception as e:
+            status, error = ExtractionStatus.FAILED, f"{type(e).__name__}: {e}"
+        if status == ExtractionStatus.FAILED:
+            logger.warning("Resume text extraction failed", extra={"version_id": version.id, "error": error})
+        if status != ExtractionStatus.PENDING:
+            extractions.inc(1, status.value)
+
+        async with AsyncSessionLocal() as db:
+            # No-op if the version was deleted while its text was extracted
+            await db.execute(
+                update(ResumeText)
+                .where(ResumeText.resume_version_id == version.id, ResumeText.status == ExtractionStatus.PROCESSING)
+                .values(
+                    status=status,
+                    content=content,
+                    error=error[:255] if error else None,
+                    claimed_at=None,
+                    extracted_at=None if status == ExtractionStatus.PENDING else datetime.utcnow(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if status == ExtractionStatus.PENDING:
+            self.notify()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned rather than forked: the server process runs threads
+            # (logging, threadpool) that a fork would copy mid-operation
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            )
+        return self._executor
+
+    def _reset_pool(self, terminate: bool = False) -> None:
+        if self._executor is not None:
+            # The executor cannot cancel a running task, so stop its processes
+            processes = list(self._executor._processes.values()) if terminate else []
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                process.terminate()
+            self._executor = None
+
+    def shutdown(self) -> None:
+        self._reset_pool()
+
+
+extractor = ResumeTextExtractor(
+    workers=settings.RESUME_TEXT_WORKERS,
+    batch_size=settings.RESUME_TEXT_BATCH_SIZE,
+    poll_interval=settings.RESUME_TEXT_POLL_SECONDS,
+    timeout=settings.RESUME_TEXT_TIMEOUT_SECONDS,
+    max_chars=settings.RESUME_TEXT_MAX_CHARS,
+)
@@ -0,0 +1,94 @@
+"""
+Plain-text extraction from resume files.
+
+These functions run inside the extraction process pool (see
+app.services.resume_text), so this module deliberately imports nothing from
+the app: a freshly spawned pool process loads only the standard library and
+pypdf. PDF support needs the optional pypdf package; DOCX files are read
+directly from their XML.
+"""
+import logging
+import re
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PDFs are then reported as unsupported
+    PdfReader = None
+
+PDF_TYPES = {"application/pdf"}
+DOCX_TYPES = {"application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+TEXT_TYPES = {"text/plain", "text/markdown"}
+
+# Largest uncompressed word/document.xml read, so a small, highly compressed
+# upload cannot expand to gigabytes in the pool process
+MAX_DOCX_XML_BYTES = 64 * 1024 * 1024
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+class UnsupportedResumeType(Exception):
+    """The file is of a type text cannot be extracted from"""
+
+
+def init_worker() -> None:
+    """Pool process setup; pypdf warns about every malformed PDF it recovers from"""
+    logging.getLogger("pypdf").setLevel(logging.ERROR)
+
+
+def _kind(content_type: str, filename: str) -> str:
+    suffix = Path(filename).suffix.lower()
+    if content_type in PDF_TYPES or suffix == ".pdf":
+        return "pdf"
+    if content_type in DOCX_TYPES or suffix == ".docx":
+        return "docx"
+    if content_type in TEXT_TYPES or suffix in (".txt", ".md"):
+        return "text"
+    raise UnsupportedResumeType(f"Cannot extract text from {content_type or suffix or 'this file'}")
+
+
+def _pdf_text(file_path: str) -> str:
+    if PdfReader is None:
+        raise UnsupportedResumeType("PDF extraction requires the pypdf package")
+    reader = PdfReader(file_path)
+    return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _docx_text(file_path: str) -> str:
+    with zipfile.ZipFile(file_path) as archive:
+        # The zip reader stops at the declared size, so checking it bounds the read
+        info = archive.getinfo("word/document.xml")
+        if info.file_size > MAX_DOCX_XML_BYTES:
+            raise ValueError(f"DOCX document expands to {info.file_size} bytes, over the {MAX_DOCX_XML_BYTES} byte limit")
+        root = ElementTree.fromstring(archive.read(info))
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NS}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{_WORD_NS}t")))
+    return "\n".join(paragraphs)
+
+
+def _plain_text(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return f.read().decode("utf-8", errors="replace")
+
+
+def extract_text(file_path: str, content_type: str, filename: str, max_chars: int) -> str:
+    """
+    Text content of a resume file, at most `max_chars` characters.
+
+    Raises:
+        UnsupportedResumeType: If the file is not a PDF, DOCX or text file
+    """
+    kind = _kind(content_type or "", filename or "")
+    if kind == "pdf":
+        text = _pdf_text(file_path)
+    elif kind == "docx":
+        text = _docx_text(file_path)
+    else:
+        text = _plain_text(file_path)
+    # Null bytes are not valid in PostgreSQL text columns
+    text = _BLANK_LINES.sub("\n\n", text.replace("\x00", "")).strip()
+    return text[:max_chars]
@@ -0,0 +1,110 @@
+"""
+Measure how much concurrent load a single uvicorn worker can absorb.
+
+Boots ``app.main:app`` in one worker against a throwaway SQLite database,
+seeds it through the public API and then drives ``GET /api/jobs/`` at
+increasing concurrency levels, reporting throughput and latency for each.
+
+Pass ``--ref`` to run the identical benchmark against another git revision
+(checked out into a temporary worktree) and print both results side by side,
+e.g. ``python benchmarks/concurrency.py --ref HEAD~1``.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+
+from harness import BACKEND_DIR, checkout, percentile, serve, wait_until_up
+
+
+async def _seed(client: httpx.AsyncClient, jobs: int) -> dict:
+    credentials = {"email": "bench@example.com", "username": "bench", "password": "benchmark-pw"}
+    await client.post("/api/auth/signup", json=credentials)
+    login = await client.post("/api/auth/login", json={
+        "email": credentials["email"], "password": credentials["password"]
+    })
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    for i in range(jobs):
+        response = await client.post(
+            "/api/jobs/",
+            data={"company": f"Company {i}", "position": "Engineer", "status": "applied"},
+            headers=headers,
+        )
+        response.raise_for_status()
+    return headers
+
+
+async def _run_level(client: httpx.AsyncClient, headers: dict, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    stop_at = time.monotonic() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                response = await client.get("/api/jobs/", headers=headers)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+    }
+
+
+async def _benchmark(base_url: str, levels: list[int], duration: float, jobs: int) -> list[dict]:
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await wait_until_up(client)
+        headers = await _seed(client, jobs)
+        return [await _run_level(client, headers, level, duration) for level in levels]
+
+
+def run(app_dir: Path, levels: list[int], duration: float, jobs: int) -> list[dict]:
+    with serve(app_dir) as base_url:
+        return asyncio.run(_benchmark(base_url, levels, duration, jobs))
+
+
+def _print_results(label: str, results: list[dict]) -> None:
+    print(f"\n{label}")
+    print(f"{'conc':>6} {'reqs':>7} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for row in results:
+        print(
+            f"{row['concurrency']:>6} {row['requests']:>7} {row['errors']:>7} "
+            f"{row['rps']:>9.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", default="1,8,32,128", help="Comma separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to run each level")
+    parser.add_argument("--jobs", type=int, default=200, help="Jobs to seed before measuring")
+    parser.add_argument("--ref", help="Also benchmark this git revision for comparison")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+
+    if args.ref:
+        with checkout(args.ref) as ref_dir:
+            _print_results(f"before ({args.ref})", run(ref_dir, levels, args.duration, args.jobs))
+
+    _print_results("after (working tree)", run(BACKEND_DIR, levels, args.duration, args.jobs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Shared plumbing for the benchmark scripts: booting the app on a free port
+against a throwaway database and upload directory, and latency statistics.
+"""
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def wait_until_up(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.get("/docs")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+
+@contextmanager
+def serve(app_dir: Path = BACKEND_DIR, database_url: Optional[str] = None) -> Iterator[str]:
+    """
+    Run app.main:app in one uvicorn worker and yield its base URL.
+
+    Uses a temporary SQLite database unless `database_url` is given (e.g. a
+    disposable Postgres), and always a temporary resume upload directory.
+    """
+    port = free_port()
+    workdir = Path(tempfile.mkdtemp(prefix="trackit-bench-"))
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url or f"sqlite:///{workdir / 'bench.db'}",
+        RESUME_UPLOAD_DIR=str(workdir / "resumes"),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=app_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def git_toplevel() -> Path:
+    output = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return Path(output.stdout.strip())
+
+
+@contextmanager
+def checkout(ref: str) -> Iterator[Path]:
+    """Check `ref` out into a temporary worktree and yield its backend directory"""
+    worktree = Path(tempfile.mkdtemp(prefix="trackit-ref-"))
+    subprocess.run(["git", "worktree", "add", "--detach", str(worktree), ref], check=True, cwd=BACKEND_DIR)
+    try:
+        yield worktree / BACKEND_DIR.relative_to(git_toplevel())
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=BACKEND_DIR)
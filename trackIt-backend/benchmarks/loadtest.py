@@ -0,0 +1,258 @@
+"""
+Mixed-workload HTTP benchmark with per-endpoint latency and a regression gate.
+
+Boots ``app.main:app`` in one uvicorn worker against a throwaway SQLite
+database (or the database given by ``--database-url``, e.g. a disposable
+Postgres), seeds it through the public API and drives a weighted mix of
+list, detail, create-with-resume, upload, download and login requests from
+concurrent virtual users. Throughput and p50/p95/p99 latency are reported
+per endpoint. Every virtual user draws from its own seeded RNG, so repeated
+runs issue the same request mix.
+
+``--save-baseline`` stores the results as JSON; ``--check`` compares a run
+against the stored baseline and exits non-zero when any endpoint's p95
+latency or throughput regresses by more than ``--tolerance``, or when any
+request fails. Baselines are machine-specific: record them on the machine
+that runs the check.
+
+    python benchmarks/loadtest.py --save-baseline
+    python benchmarks/loadtest.py --check
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+from harness import BACKEND_DIR, percentile, serve, wait_until_up
+
+DEFAULT_BASELINE = BACKEND_DIR / "benchmarks" / "baseline.json"
+
+# Relative frequency of each operation in the mix
+WEIGHTS = {
+    "list": 40,
+    "detail": 25,
+    "download": 15,
+    "upload": 8,
+    "create_with_resume": 7,
+    "login": 5,
+}
+
+CREDENTIALS = {"email": "loadtest@example.com", "username": "loadtest", "password": "loadtest-pw"}
+
+
+def _resume_bytes(size_kb: int, tag: str) -> bytes:
+    # Unique content per upload, so storage never short-circuits on a duplicate
+    body = random.Random(tag).randbytes(size_kb * 1024)
+    return b"%PDF-1.4\n" + tag.encode() + b"\n" + body
+
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, headers: dict, jobs: list[int], resumes: list[tuple[int, int]],
+                 resume_kb: int):
+        self.client = client
+        self.headers = headers
+        self.jobs = jobs
+        self.resumes = resumes
+        self.resume_kb = resume_kb
+        self._uploads = 0
+
+    def _next_resume(self) -> bytes:
+        self._uploads += 1
+        return _resume_bytes(self.resume_kb, f"upload-{self._uploads}")
+
+    async def list(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get("/api/jobs/", headers=self.headers)
+
+    async def detail(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(f"/api/jobs/{rng.choice(self.jobs)}", headers=self.headers)
+
+    async def download(self, rng: random.Random) -> httpx.Response:
+        job_id, version_id = rng.choice(self.resumes)
+        return await self.client.get(f"/api/jobs/{job_id}/resume/{version_id}/download", headers=self.headers)
+
+    async def upload(self, rng: random.Random) -> httpx.Response:
+        return await self.client.post(
+            f"/api/jobs/{rng.choice(self.jobs)}/resume",
+            files={"resume": ("resume.pdf", self._next_resume(), "application/pdf")},
+            headers=self.headers,
+        )
+
+    async def create_with_resume(self, rng: random.Random) -> httpx.Response:
+        return await self.client.post(
+            "/api/jobs/",
+            data={"company": f"Load {rng.randrange(10**6)}", "position": "Engineer", "status": "applied"},
+            files={"resume": ("resume.pdf", self._next_resume(), "application/pdf")},
+            headers=self.headers,
+        )
+
+    async def login(self, rng: random.Random) -> httpx.Response:
+        return await self.client.post(
+            "/api/auth/login", json={"email": CREDENTIALS["email"], "password": CREDENTIALS["password"]}
+        )
+
+
+async def _seed(client: httpx.AsyncClient, jobs: int, with_resumes: int, resume_kb: int) -> Workload:
+    await client.post("/api/auth/signup", json=CREDENTIALS)
+    login = await client.post("/api/auth/login", json={
+        "email": CREDENTIALS["email"], "password": CREDENTIALS["password"]
+    })
+    login.raise_for_status()
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    rows = ["company,position,status"] + [f"Company {i},Engineer,applied" for i in range(jobs)]
+    imported = await client.post(
+        "/api/jobs/import",
+        files={"file": ("seed.csv", "\n".join(rows).encode(), "text/csv")},
+        headers=headers,
+    )
+    imported.raise_for_status()
+
+    job_ids: list[int] = []
+    cursor = None
+    while True:
+        page = await client.get("/api/jobs/", params={"limit": 200, "cursor": cursor} if cursor else {"limit": 200},
+                                headers=headers)
+        page.raise_for_status()
+        job_ids.extend(job["id"] for job in page.json())
+        cursor = page.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    job_ids.sort()
+
+    resumes = []
+    for job_id in job_ids[:with_resumes]:
+        response = await client.post(
+            f"/api/jobs/{job_id}/resume",
+            files={"resume": ("seed.pdf", _resume_bytes(resume_kb, f"seed-{job_id}"), "application/pdf")},
+            headers=headers,
+        )
+        response.raise_for_status()
+        resumes.append((job_id, response.json()["resumes"][-1]["id"]))
+    return Workload(client, headers, job_ids, resumes, resume_kb)
+
+
+async def _drive(workload: Workload, users: int, duration: float, warmup: float, seed: int) -> dict:
+    operations = list(WEIGHTS)
+    weights = [WEIGHTS[name] for name in operations]
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    measure_from = time.monotonic() + warmup
+    stop_at = measure_from + duration
+
+    async def user(index: int):
+        rng = random.Random(seed * 1000 + index)
+        while time.monotonic() < stop_at:
+            name = rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await getattr(workload, name)(rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            if time.monotonic() < measure_from:
+                continue
+            latencies[name].append(time.perf_counter() - started)
+            if failed:
+                errors[name] += 1
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+    results = {}
+    for name in operations:
+        samples = latencies[name]
+        if not samples:
+            continue
+        results[name] = {
+            "requests": len(samples),
+            "errors": errors[name],
+            "rps": len(samples) / duration,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        }
+    return results
+
+
+async def _benchmark(base_url: str, args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await wait_until_up(client)
+        workload = await _seed(client, args.jobs, args.resumes, args.resume_kb)
+        return await _drive(workload, args.users, args.duration, args.warmup, args.seed)
+
+
+def _print_results(results: dict) -> None:
+    print(f"\n{'endpoint':<20} {'reqs':>7} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in results.items():
+        print(
+            f"{name:<20} {row['requests']:>7} {row['errors']:>7} {row['rps']:>9.1f} "
+            f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}"
+        )
+
+
+def _regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    problems = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            problems.append(f"{name}: no requests completed")
+            continue
+        if current["errors"]:
+            problems.append(f"{name}: {current['errors']} failed requests")
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            problems.append(f"{name}: p95 {current['p95_ms']:.1f} ms vs baseline {base['p95_ms']:.1f} ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            problems.append(f"{name}: {current['rps']:.1f} req/s vs baseline {base['rps']:.1f} req/s")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to measure")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds to run before measuring")
+    parser.add_argument("--jobs", type=int, default=200, help="Jobs to seed")
+    parser.add_argument("--resumes", type=int, default=20, help="Seeded jobs that get a resume to download")
+    parser.add_argument("--resume-kb", type=int, default=64, help="Size of uploaded resumes")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the request mix")
+    parser.add_argument("--database-url", help="Benchmark against this database instead of a temporary SQLite file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--check", action="store_true", help="Fail if this run regresses past the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression, as a fraction")
+    parser.add_argument("--json", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    with serve(BACKEND_DIR, args.database_url) as base_url:
+        results = asyncio.run(_benchmark(base_url, args))
+    _print_results(results)
+
+    config = {key: getattr(args, key) for key in ("users", "duration", "jobs", "resumes", "resume_kb", "seed")}
+    report = {"config": config, "endpoints": results}
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"\nBaseline saved to {args.baseline}")
+    if args.check:
+        if not args.baseline.exists():
+            sys.exit(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+        stored = json.loads(args.baseline.read_text())
+        if stored["config"] != config:
+            print(f"\nWarning: baseline was recorded with {stored['config']}")
+        problems = _regressions(results, stored["endpoints"], args.tolerance)
+        if problems:
+            print(f"\nRegressed beyond {args.tolerance:.0%} of the baseline:")
+            for problem in problems:
+                print(f"  {problem}")
+            sys.exit(1)
+        print(f"\nWithin {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""add jobs keyset indexes
+
+Revision ID: 5a1c7e2d9f40
+Revises: 3d5f9be0975b
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a1c7e2d9f40'
+down_revision = '3d5f9be0975b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_jobs_status_created_at_id', 'jobs', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_status_created_at_id', table_name='jobs')
+    op.drop_index('ix_jobs_created_at_id', table_name='jobs')
@@ -0,0 +1,55 @@
+"""add content-addressed resume blobs
+
+Revision ID: 8e3b41c6d2a7
+Revises: 5a1c7e2d9f40
+Create Date: 2026-10-18 10:05:17.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e3b41c6d2a7'
+down_revision = '5a1c7e2d9f40'
+branch_labels = None
+depends_on = None
+
+# SQLite reflects the file_path unique constraint without a name
+naming_convention = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def upgrade() -> None:
+    op.create_table('resume_blobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('file_path', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256')
+    )
+    op.create_index(op.f('ix_resume_blobs_id'), 'resume_blobs', ['id'], unique=False)
+
+    # Versions sharing a blob share its file_path, so it can no longer be unique
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('resume_versions', naming_convention=naming_convention) as batch_op:
+            batch_op.drop_constraint('uq_resume_versions_file_path', type_='unique')
+            batch_op.add_column(sa.Column('blob_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_resume_versions_blob_id', 'resume_blobs', ['blob_id'], ['id'])
+    else:
+        op.drop_constraint('resume_versions_file_path_key', 'resume_versions', type_='unique')
+        op.add_column('resume_versions', sa.Column('blob_id', sa.Integer(), nullable=True))
+        op.create_foreign_key('fk_resume_versions_blob_id', 'resume_versions', 'resume_blobs', ['blob_id'], ['id'])
+    op.create_index(op.f('ix_resume_versions_blob_id'), 'resume_versions', ['blob_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_resume_versions_blob_id'), table_name='resume_versions')
+    with op.batch_alter_table('resume_versions') as batch_op:
+        batch_op.drop_constraint('fk_resume_versions_blob_id', type_='foreignkey')
+        batch_op.drop_column('blob_id')
+        batch_op.create_unique_constraint('uq_resume_versions_file_path', ['file_path'])
+    op.drop_index(op.f('ix_resume_blobs_id'), table_name='resume_blobs')
+    op.drop_table('resume_blobs')
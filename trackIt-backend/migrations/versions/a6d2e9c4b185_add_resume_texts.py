@@ -0,0 +1,88 @@
+"""add extracted resume text with a full-text index
+
+Revision ID: a6d2e9c4b185
+Revises: f3a8c1d5e207
+Create Date: 2026-10-18 16:42:08.115902
+
+Existing resume versions are queued as pending, so the background
+extractor works through them after the upgrade.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d2e9c4b185'
+down_revision = 'f3a8c1d5e207'
+branch_labels = None
+depends_on = None
+
+extraction_status = sa.Enum('PENDING', 'PROCESSING', 'DONE', 'FAILED', 'UNSUPPORTED', name='extractionstatus')
+
+
+def upgrade() -> None:
+    op.create_table('resume_texts',
+    sa.Column('resume_version_id', sa.Integer(), nullable=False),
+    sa.Column('status', extraction_status, nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('error', sa.String(length=255), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('extracted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['resume_version_id'], ['resume_versions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('resume_version_id')
+    )
+    op.create_index(op.f('ix_resume_texts_status'), 'resume_texts', ['status'], unique=False)
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE resume_texts ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                to_tsvector('english', coalesce(content, ''))
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_resume_texts_search_vector ON resume_texts USING gin (search_vector)")
+    elif bind.dialect.name == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE resume_texts_fts USING fts5(
+                content, content='resume_texts', content_rowid='resume_version_id', tokenize='porter unicode61'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER resume_texts_fts_insert AFTER INSERT ON resume_texts BEGIN
+                INSERT INTO resume_texts_fts(rowid, content) VALUES (new.resume_version_id, new.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER resume_texts_fts_delete AFTER DELETE ON resume_texts BEGIN
+                INSERT INTO resume_texts_fts(resume_texts_fts, rowid, content)
+                VALUES ('delete', old.resume_version_id, old.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER resume_texts_fts_update AFTER UPDATE OF content ON resume_texts BEGIN
+                INSERT INTO resume_texts_fts(resume_texts_fts, rowid, content)
+                VALUES ('delete', old.resume_version_id, old.content);
+                INSERT INTO resume_texts_fts(rowid, content) VALUES (new.resume_version_id, new.content);
+            END
+        """)
+
+    # Queue every existing resume version for extraction
+    op.execute(
+        "INSERT INTO resume_texts (resume_version_id, status, attempts) "
+        "SELECT id, 'PENDING', 0 FROM resume_versions"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS resume_texts_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS resume_texts_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS resume_texts_fts_insert")
+        op.execute("DROP TABLE IF EXISTS resume_texts_fts")
+    op.drop_index(op.f('ix_resume_texts_status'), table_name='resume_texts')
+    op.drop_table('resume_texts')
+    if bind.dialect.name == 'postgresql':
+        extraction_status.drop(bind, checkfirst=True)
@@ -0,0 +1,32 @@
+"""add pending_file_deletions queue
+
+Revision ID: b5e0c9d2f614
+Revises: d8b3f61a9c27
+Create Date: 2026-10-18 10:31:48.905126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e0c9d2f614'
+down_revision = 'd8b3f61a9c27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('pending_file_deletions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('file_path', sa.String(length=255), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pending_file_deletions_file_path'), 'pending_file_deletions', ['file_path'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pending_file_deletions_file_path'), table_name='pending_file_deletions')
+    op.drop_table('pending_file_deletions')
@@ -0,0 +1,49 @@
+"""add the job_stat_counts summary table
+
+Revision ID: c2f7a4e8d913
+Revises: a6d2e9c4b185
+Create Date: 2026-10-18 18:20:44.902316
+
+Filled from the existing jobs; app.services.job_stats keeps it current.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f7a4e8d913'
+down_revision = 'a6d2e9c4b185'
+branch_labels = None
+depends_on = None
+
+# The jobstatus type already exists on PostgreSQL
+job_status = postgresql.ENUM(
+    'APPLIED', 'INTERVIEWING', 'REJECTED', 'ACCEPTED', 'PENDING', name='jobstatus', create_type=False
+)
+
+
+def upgrade() -> None:
+    op.create_table('job_stat_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('status', job_status, nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'week_start', 'status')
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        week_start = "date_trunc('week', coalesce(applied_date, created_at) AT TIME ZONE 'UTC')::date"
+    else:
+        week_start = "date(coalesce(applied_date, created_at), '-6 days', 'weekday 1')"
+    op.execute(
+        f"INSERT INTO job_stat_counts (user_id, week_start, status, count) "
+        f"SELECT user_id, {week_start}, status, count(*) FROM jobs "
+        f"WHERE user_id IS NOT NULL GROUP BY user_id, {week_start}, status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_stat_counts')
@@ -0,0 +1,39 @@
+"""add resume version file metadata
+
+Revision ID: c47f0a9e13b5
+Revises: 8e3b41c6d2a7
+Create Date: 2026-10-18 10:48:02.915736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47f0a9e13b5'
+down_revision = '8e3b41c6d2a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('resume_versions', sa.Column('size', sa.Integer(), nullable=True))
+    op.add_column('resume_versions', sa.Column('content_type', sa.String(length=100), nullable=True))
+    op.add_column('resume_versions', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Blob-backed versions already have their size and hash on the blob
+    op.execute(
+        """
+        UPDATE resume_versions
+        SET size = (SELECT size FROM resume_blobs WHERE resume_blobs.id = resume_versions.blob_id),
+            content_hash = (SELECT sha256 FROM resume_blobs WHERE resume_blobs.id = resume_versions.blob_id)
+        WHERE blob_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume_versions') as batch_op:
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('content_type')
+        batch_op.drop_column('size')
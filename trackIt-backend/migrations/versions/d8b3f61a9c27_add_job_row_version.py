@@ -0,0 +1,29 @@
+"""add jobs.row_version for optimistic concurrency
+
+Revision ID: d8b3f61a9c27
+Revises: c2f7a4e8d913
+Create Date: 2026-10-18 19:54:31.270518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b3f61a9c27'
+down_revision = 'c2f7a4e8d913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A plain ADD COLUMN, also on SQLite: a batch rebuild of jobs would drop
+    # the full-text triggers attached to it
+    op.add_column('jobs', sa.Column('row_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("ALTER TABLE jobs DROP COLUMN row_version")
+    else:
+        op.drop_column('jobs', 'row_version')
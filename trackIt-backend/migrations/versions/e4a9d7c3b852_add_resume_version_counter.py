@@ -0,0 +1,57 @@
+"""add per-job resume version counter and unique (job_id, version)
+
+Revision ID: e4a9d7c3b852
+Revises: b5e0c9d2f614
+Create Date: 2026-10-18 11:02:36.118470
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9d7c3b852'
+down_revision = 'b5e0c9d2f614'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A plain ADD COLUMN, also on SQLite: a batch rebuild of jobs would drop
+    # the full-text triggers attached to it
+    op.add_column('jobs', sa.Column('last_resume_version', sa.Integer(), server_default='0', nullable=False))
+
+    # Concurrent uploads could give two versions of a job the same number;
+    # move the later ones above the job's highest so the index can be built
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, job_id, version FROM resume_versions ORDER BY job_id, version, id"
+    )).fetchall()
+    highest = {}
+    for row in rows:
+        highest[row.job_id] = max(highest.get(row.job_id, 0), row.version)
+    seen = set()
+    for row in rows:
+        if (row.job_id, row.version) in seen:
+            highest[row.job_id] += 1
+            bind.execute(
+                sa.text("UPDATE resume_versions SET version = :version WHERE id = :id"),
+                {"version": highest[row.job_id], "id": row.id},
+            )
+        else:
+            seen.add((row.job_id, row.version))
+
+    op.execute("""
+        UPDATE jobs SET last_resume_version = coalesce(
+            (SELECT max(version) FROM resume_versions WHERE resume_versions.job_id = jobs.id), 0
+        )
+    """)
+    op.create_index('ix_resume_versions_job_id_version', 'resume_versions', ['job_id', 'version'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resume_versions_job_id_version', table_name='resume_versions')
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("ALTER TABLE jobs DROP COLUMN last_resume_version")
+    else:
+        op.drop_column('jobs', 'last_resume_version')
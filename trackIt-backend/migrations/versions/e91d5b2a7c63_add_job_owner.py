@@ -0,0 +1,76 @@
+"""scope jobs to an owning user
+
+Revision ID: e91d5b2a7c63
+Revises: c47f0a9e13b5
+Create Date: 2026-10-18 11:31:40.227519
+
+Existing jobs are assigned to the user in TRACKIT_BACKFILL_USER_ID, or to the
+oldest user when it is unset. The backfill runs in batches, each committed on
+its own, so no single statement holds a lock over the whole table.
+
+"""
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e91d5b2a7c63'
+down_revision = 'c47f0a9e13b5'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _backfill_owner(bind) -> None:
+    owner_id = os.environ.get("TRACKIT_BACKFILL_USER_ID")
+    if owner_id is None:
+        owner_id = bind.execute(sa.text("SELECT MIN(id) FROM users")).scalar()
+    if owner_id is None:
+        return
+
+    while True:
+        with op.get_context().autocommit_block():
+            result = bind.execute(
+                sa.text(
+                    "UPDATE jobs SET user_id = :owner_id WHERE id IN "
+                    "(SELECT id FROM jobs WHERE user_id IS NULL ORDER BY id LIMIT :batch_size)"
+                ),
+                {"owner_id": int(owner_id), "batch_size": BACKFILL_BATCH_SIZE},
+            )
+        if result.rowcount == 0:
+            break
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        with op.batch_alter_table('jobs') as batch_op:
+            batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_jobs_user_id', 'users', ['user_id'], ['id'])
+    else:
+        op.add_column('jobs', sa.Column('user_id', sa.Integer(), nullable=True))
+        op.create_foreign_key('fk_jobs_user_id', 'jobs', 'users', ['user_id'], ['id'])
+
+    _backfill_owner(bind)
+
+    # Build the owner-scoped indexes after the backfill; concurrently on Postgres
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_jobs_status_created_at_id', table_name='jobs')
+        op.drop_index('ix_jobs_created_at_id', table_name='jobs')
+        op.create_index('ix_jobs_user_id_created_at_id', 'jobs', ['user_id', 'created_at', 'id'],
+                        unique=False, postgresql_concurrently=True)
+        op.create_index('ix_jobs_user_id_status_created_at_id', 'jobs', ['user_id', 'status', 'created_at', 'id'],
+                        unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'], unique=False)
+    op.create_index('ix_jobs_status_created_at_id', 'jobs', ['status', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_jobs_user_id_status_created_at_id', table_name='jobs')
+    op.drop_index('ix_jobs_user_id_created_at_id', table_name='jobs')
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_constraint('fk_jobs_user_id', type_='foreignkey')
+        batch_op.drop_column('user_id')
@@ -0,0 +1,73 @@
+"""full-text index over job company, position and notes
+
+Revision ID: f3a8c1d5e207
+Revises: e91d5b2a7c63
+Create Date: 2026-10-18 14:05:12.418230
+
+PostgreSQL: a stored generated tsvector column plus a GIN index, built
+concurrently. SQLite: an external-content FTS5 table with sync triggers,
+filled from the existing rows.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8c1d5e207'
+down_revision = 'e91d5b2a7c63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("""
+            ALTER TABLE jobs ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(company, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(position, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(notes, '')), 'B')
+            ) STORED
+        """)
+        with op.get_context().autocommit_block():
+            op.execute("CREATE INDEX CONCURRENTLY ix_jobs_search_vector ON jobs USING gin (search_vector)")
+    elif bind.dialect.name == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE jobs_fts USING fts5(
+                company, position, notes, content='jobs', content_rowid='id', tokenize='porter unicode61'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts(rowid, company, position, notes)
+                VALUES (new.id, new.company, new.position, new.notes);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, company, position, notes)
+                VALUES ('delete', old.id, old.company, old.position, old.notes);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER jobs_fts_update AFTER UPDATE OF company, position, notes ON jobs BEGIN
+                INSERT INTO jobs_fts(jobs_fts, rowid, company, position, notes)
+                VALUES ('delete', old.id, old.company, old.position, old.notes);
+                INSERT INTO jobs_fts(rowid, company, position, notes)
+                VALUES (new.id, new.company, new.position, new.notes);
+            END
+        """)
+        # Index the rows that already exist
+        op.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_jobs_search_vector")
+        op.execute("ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS jobs_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS jobs_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS jobs_fts_insert")
+        op.execute("DROP TABLE IF EXISTS jobs_fts")
@@ -3,12 +3,13 @@ import sys
 import uvicorn
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def run_server(env: str = "development"):
     os.environ["ENVIRONMENT"] = env
+    # Imported only now: app.config picks its env file from ENVIRONMENT at import
+    from app.logging_config import configure_logging
+    configure_logging()
     
     # Get PORT from environment with fallback to 8000
     try:
@@ -23,6 +24,12 @@ def run_server(env: str = "development"):
     logger.info(f"Host: 0.0.0.0")
     logger.info(f"Port: {port}")
     
+    if env == "production":
+        # Multi-process serving; gunicorn is only needed (and available) here
+        from app.server import serve
+        serve(port)
+        return
+
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
@@ -0,0 +1,48 @@
+"""
+Shared fixtures: the app against a throwaway SQLite database and upload
+directory. The environment is set before anything from app is imported.
+
+The client is not entered as a context manager, so the startup hooks (and
+their background workers: health probe, text extractor, file deletion) do
+not run and every statement a test sees comes from the requests it makes.
+"""
+import asyncio
+import itertools
+import os
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="trackit-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/test.db"
+os.environ["RESUME_UPLOAD_DIR"] = os.path.join(_workdir, "resumes")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.init_db import async_init_db
+from app.main import app
+
+_users = itertools.count(1)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    asyncio.run(async_init_db())
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Sign up a fresh user and return its Authorization header"""
+    def make() -> dict:
+        n = next(_users)
+        credentials = {"email": f"user{n}@example.com", "password": "password1"}
+        response = client.post("/api/auth/signup", json={**credentials, "username": f"user{n}"})
+        assert response.status_code == 200, response.text
+        response = client.post("/api/auth/login", json=credentials)
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return make
@@ -0,0 +1,91 @@
+"""
+Bearer-token authentication is cached: a token seen before is not decoded
+again and its user is not queried again, cached claims never outlive the
+token's exp, and a changed user row is re-read once invalidated.
+"""
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import async_engine
+from app.services import auth_service
+
+
+@contextmanager
+def count_user_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Count JWT decodes made by the auth service"""
+    calls = []
+    decode = auth_service.jwt.decode
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_service.jwt, "decode", counting)
+    return calls
+
+
+def me(client, headers):
+    return client.get("/api/auth/me", headers=headers)
+
+
+def test_repeated_requests_are_served_from_the_cache(client, auth_headers, decodes):
+    headers = auth_headers()
+    assert me(client, headers).status_code == 200
+
+    with count_user_queries() as queries:
+        for _ in range(3):
+            assert me(client, headers).status_code == 200
+    assert queries == []
+    assert len(decodes) == 1
+
+
+def test_invalidated_user_is_read_again(client, auth_headers):
+    headers = auth_headers()
+    email = me(client, headers).json()["email"]
+
+    auth_service.invalidate_cached_user(email)
+    with count_user_queries() as queries:
+        assert me(client, headers).status_code == 200
+        assert me(client, headers).status_code == 200
+    assert len(queries) == 1
+
+
+def test_cached_claims_expire_with_the_token(client, auth_headers):
+    email = me(client, auth_headers()).json()["email"]
+    token = auth_service.create_access_token({"sub": email}, expires_delta=timedelta(seconds=2))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert me(client, headers).status_code == 200
+    expires_at, _ = auth_service.token_cache._entries[token]
+    assert expires_at <= time.monotonic() + 2
+
+    # exp has one-second resolution and is checked against whole seconds
+    time.sleep(max(auth_service.token_expiry(token) + 1 - time.time(), 0))
+    assert me(client, headers).status_code == 401
+
+
+def test_invalid_tokens_are_not_cached(client, decodes):
+    headers = {"Authorization": "Bearer not-a-token"}
+    assert me(client, headers).status_code == 401
+    assert me(client, headers).status_code == 401
+    assert len(decodes) == 2
+    assert auth_service.token_cache.get("not-a-token") is None
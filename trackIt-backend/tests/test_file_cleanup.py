@@ -0,0 +1,112 @@
+"""
+Resume file cleanup: the deletion worker removes queued files unless a blob
+references them again, and the reconciler finds unreferenced files older
+than its minimum age, removing them only when not a dry run.
+"""
+import asyncio
+import os
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.db.session import AsyncSessionLocal
+from app.models.job import PendingFileDeletion
+from app.services import file_cleanup
+from app.services.file_service import FileService
+
+HOUR = 3600
+
+
+def plant(name: str, age_seconds: float = 0) -> str:
+    """Write a file nothing references into the upload directory"""
+    os.makedirs(FileService.UPLOAD_DIR, exist_ok=True)
+    file_path = os.path.abspath(os.path.join(FileService.UPLOAD_DIR, f"{uuid.uuid4().hex}-{name}"))
+    with open(file_path, "wb") as f:
+        f.write(b"orphan")
+    if age_seconds:
+        mtime = time.time() - age_seconds
+        os.utime(file_path, (mtime, mtime))
+    return file_path
+
+
+def upload_resume(client, auth_headers) -> str:
+    headers = auth_headers()
+    response = client.post(
+        "/api/jobs/",
+        headers=headers,
+        data={"company": "Acme", "position": "Engineer"},
+        files={"resume": ("resume.txt", uuid.uuid4().bytes, "text/plain")},
+    )
+    assert response.status_code == 200, response.text
+    file_path = os.path.abspath(response.json()["resumes"][0]["file_path"])
+    mtime = time.time() - 2 * HOUR
+    os.utime(file_path, (mtime, mtime))
+    return file_path
+
+
+def reconcile(dry_run: bool, min_age: timedelta = timedelta(hours=1)):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return await file_cleanup.reconcile(db, dry_run, min_age)
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def files(client, auth_headers):
+    planted = {
+        "old": plant("old.pdf", 2 * HOUR),
+        "staging": plant(".upload-abandoned.part", 2 * HOUR),
+        "young": plant("young.pdf"),
+    }
+    yield {**planted, "referenced": upload_resume(client, auth_headers)}
+    for file_path in planted.values():
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def test_dry_run_reports_old_orphans_and_removes_nothing(files):
+    report = reconcile(dry_run=True)
+
+    assert {files["old"], files["staging"]} <= set(report.orphans)
+    assert files["young"] not in report.orphans
+    assert files["referenced"] not in report.orphans
+    assert report.removed == 0
+    assert all(os.path.exists(file_path) for file_path in files.values())
+
+
+def test_reconcile_removes_only_old_orphans(files):
+    report = reconcile(dry_run=False)
+
+    assert report.removed == len(report.orphans)
+    assert not os.path.exists(files["old"])
+    assert not os.path.exists(files["staging"])
+    assert os.path.exists(files["young"])
+    assert os.path.exists(files["referenced"])
+
+
+def test_min_age_bounds_the_orphans(files):
+    assert files["young"] in reconcile(dry_run=True, min_age=timedelta(0)).orphans
+    assert files["old"] not in reconcile(dry_run=True, min_age=timedelta(hours=3)).orphans
+
+
+def test_worker_skips_files_a_blob_references_again(client, auth_headers):
+    released = plant("released.pdf")
+    referenced = upload_resume(client, auth_headers)
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            await file_cleanup.schedule(db, [released, referenced])
+            await db.commit()
+        while await file_cleanup.worker.process_pending():
+            pass
+        async with AsyncSessionLocal() as db:
+            return (await db.scalars(select(PendingFileDeletion.file_path))).all()
+
+    queued = asyncio.run(run())
+
+    assert not os.path.exists(released)
+    assert os.path.exists(referenced)
+    assert released not in queued and referenced not in queued
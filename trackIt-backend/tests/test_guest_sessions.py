@@ -0,0 +1,53 @@
+"""
+Guest workspaces live exactly as long as the guest token and are never
+silently re-created: a workspace that is gone answers 410.
+"""
+import time
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+from app.services.auth_service import create_access_token
+from app.services.guest_store import guest_store
+
+
+@pytest.fixture
+def guest(client):
+    """(Authorization header, guest id) for a new guest session"""
+    token = client.post("/api/auth/guest-login").json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}, jwt.get_unverified_claims(token)
+
+
+def test_workspace_expires_with_the_token(guest):
+    _, claims = guest
+    assert guest_store._workspaces[claims["guest_id"]].expires_at == claims["exp"]
+
+
+def test_guest_sees_the_sample_jobs(client, guest):
+    headers, _ = guest
+    response = client.get("/api/jobs/", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 4
+
+
+def test_evicted_workspace_is_gone_not_reseeded(client, guest):
+    headers, claims = guest
+    guest_store._drop(claims["guest_id"])
+    assert client.get("/api/jobs/", headers=headers).status_code == 410
+    assert client.post("/api/jobs/", headers=headers, data={"company": "A", "position": "B"}).status_code == 410
+    assert not guest_store.exists(claims["guest_id"])
+
+
+def test_expired_workspace_is_gone(client, guest):
+    headers, claims = guest
+    guest_store._workspaces[claims["guest_id"]].expires_at = time.time() - 1
+    assert client.get("/api/jobs/", headers=headers).status_code == 410
+    assert claims["guest_id"] not in guest_store._workspaces
+
+
+def test_guest_token_without_guest_id_is_rejected(client):
+    token = create_access_token(
+        {"sub": "guest_x@trackit.temp", "is_guest": True}, expires_delta=timedelta(minutes=5)
+    )
+    assert client.get("/api/jobs/", headers={"Authorization": f"Bearer {token}"}).status_code == 401
@@ -0,0 +1,115 @@
+"""
+Batch job actions: ids that are not the caller's jobs are reported as
+not_found without failing the rest, and a failure while applying the batch
+rolls the whole batch back.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.db.session import AsyncSessionLocal
+from app.models.job import PendingFileDeletion
+from app.services import job_stats
+
+
+@pytest.fixture(params=["user", "guest"])
+def headers(request, client, auth_headers):
+    if request.param == "user":
+        return auth_headers()
+    response = client.post("/api/auth/guest-login")
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_job(client, headers, resume: bytes = None) -> int:
+    files = {"resume": ("resume.txt", resume, "text/plain")} if resume else None
+    response = client.post("/api/jobs/", headers=headers, data={"company": "Acme", "position": "Engineer"}, files=files)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def batch(client, headers, **body):
+    return client.post("/api/jobs/batch", headers=headers, json=body)
+
+
+def status_of(client, headers, job_id: int) -> str:
+    return client.get(f"/api/jobs/{job_id}", headers=headers).json()["status"]
+
+
+def test_unknown_ids_are_reported_not_found(client, headers):
+    mine = [create_job(client, headers) for _ in range(2)]
+    missing = 999999
+
+    response = batch(
+        client, headers, action="set_status", status="interviewing", job_ids=[mine[0], missing, mine[1], mine[0]]
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["succeeded"] == 2 and body["not_found"] == 1
+    assert body["results"] == [
+        {"id": mine[0], "result": "updated"},
+        {"id": missing, "result": "not_found"},
+        {"id": mine[1], "result": "updated"},
+    ]
+    assert [status_of(client, headers, job_id) for job_id in mine] == ["interviewing"] * 2
+
+    response = batch(client, headers, action="delete", job_ids=[missing, mine[1]])
+    assert response.status_code == 200, response.text
+    assert [result["result"] for result in response.json()["results"]] == ["not_found", "deleted"]
+    assert client.get(f"/api/jobs/{mine[1]}", headers=headers).status_code == 404
+
+
+def test_other_users_jobs_are_not_touched(client, auth_headers):
+    headers, other_headers = auth_headers(), auth_headers()
+    mine = create_job(client, headers)
+    other = create_job(client, other_headers)
+
+    for action, outcome in [("set_status", "updated"), ("delete", "deleted")]:
+        response = batch(client, headers, action=action, status="rejected", job_ids=[other, mine])
+        assert response.status_code == 200, response.text
+        assert [result["result"] for result in response.json()["results"]] == ["not_found", outcome]
+
+    assert client.get(f"/api/jobs/{mine}", headers=headers).status_code == 404
+    assert status_of(client, other_headers, other) == "pending"
+
+
+def test_deleted_resumes_are_queued_for_removal(client, auth_headers):
+    headers = auth_headers()
+    content = b"resume of a batch-deleted job"
+    job_id = create_job(client, headers, resume=content)
+    file_path = client.get(f"/api/jobs/{job_id}", headers=headers).json()["resumes"][0]["file_path"]
+
+    assert batch(client, headers, action="delete", job_ids=[job_id]).status_code == 200
+
+    async def queued():
+        async with AsyncSessionLocal() as db:
+            return (await db.scalars(select(PendingFileDeletion.file_path))).all()
+
+    assert file_path in asyncio.run(queued())
+
+
+def test_failed_batch_is_rolled_back(client, auth_headers, monkeypatch):
+    headers = auth_headers()
+    job_ids = [create_job(client, headers) for _ in range(3)]
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("simulated failure after the jobs were updated")
+
+    monkeypatch.setattr(job_stats, "record", fail)
+    response = batch(client, headers, action="set_status", status="rejected", job_ids=job_ids)
+    assert response.status_code == 500
+    monkeypatch.undo()
+
+    assert [status_of(client, headers, job_id) for job_id in job_ids] == ["pending"] * 3
+
+
+@pytest.mark.parametrize("body", [
+    {"action": "set_status", "job_ids": [1]},
+    {"action": "delete", "job_ids": []},
+    {"action": "delete", "job_ids": list(range(1, 502))},
+    {"action": "archive", "job_ids": [1]},
+])
+def test_invalid_batches_are_rejected(client, auth_headers, body):
+    assert batch(client, auth_headers(), **body).status_code == 422
@@ -0,0 +1,29 @@
+"""Every endpoint that returns a job returns it in the same JobResponse shape."""
+
+
+def test_resume_upload_returns_a_job_response(client, auth_headers):
+    headers = auth_headers()
+    job_id = client.post("/api/jobs/", headers=headers, data={"company": "Acme", "position": "Engineer"}).json()["id"]
+
+    uploaded = client.post(
+        f"/api/jobs/{job_id}/resume", headers=headers, files={"resume": ("resume.txt", b"resume", "text/plain")}
+    )
+    fetched = client.get(f"/api/jobs/{job_id}", headers=headers)
+
+    assert uploaded.status_code == fetched.status_code == 200
+    assert uploaded.json() == fetched.json()
+    assert "user_id" not in uploaded.json()
+
+
+def test_created_job_matches_its_get(client, auth_headers):
+    headers = auth_headers()
+    created = client.post(
+        "/api/jobs/",
+        headers=headers,
+        data={"company": "Acme", "position": "Engineer", "status": "applied", "applied_date": "2026-01-05T10:00:00Z"},
+        files={"resume": ("resume.txt", b"created with the job", "text/plain")},
+    )
+    assert created.status_code == 200, created.text
+
+    fetched = client.get(f"/api/jobs/{created.json()['id']}", headers=headers)
+    assert fetched.json() == created.json()
@@ -0,0 +1,75 @@
+"""
+Job statistics: the deltas every write path records add up to what
+rebuild() recomputes from the jobs themselves, including applied dates sent
+with a UTC offset that moves them into another week.
+"""
+import asyncio
+
+from sqlalchemy import select
+
+from app.db.session import AsyncSessionLocal
+from app.models.job import JobStatCount
+from app.services import job_stats
+
+APPLIED_DATES = [
+    None,
+    "2024-01-07T23:30:00-05:00",  # Sunday locally, Monday in UTC
+    "2024-01-08T01:00:00+03:00",  # Monday locally, Sunday in UTC
+    "2024-01-14T12:00:00",
+    "2024-01-15T00:00:00Z",
+]
+
+
+def create_job(client, headers, applied_date) -> int:
+    data = {"company": "Acme", "position": "Engineer", "status": "applied"}
+    if applied_date:
+        data["applied_date"] = applied_date
+    response = client.post("/api/jobs/", headers=headers, data=data)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def stat_rows(user_id: int) -> dict:
+    async def load():
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(
+                select(JobStatCount.week_start, JobStatCount.status, JobStatCount.count)
+                .where(JobStatCount.user_id == user_id)
+            )
+            return {(week_start, status): count for week_start, status, count in rows}
+    return asyncio.run(load())
+
+
+def rebuild():
+    async def run():
+        async with AsyncSessionLocal() as db:
+            await job_stats.rebuild(db)
+            await db.commit()
+    asyncio.run(run())
+
+
+def test_rebuild_matches_recorded_deltas(client, auth_headers):
+    headers = auth_headers()
+    user_id = client.get("/api/auth/me", headers=headers).json()["id"]
+    job_ids = [create_job(client, headers, applied_date) for applied_date in APPLIED_DATES]
+
+    for job_id, changes in [
+        (job_ids[0], {"status": "interviewing"}),
+        (job_ids[1], {"applied_date": "2024-02-04T22:00:00-08:00"}),
+        (job_ids[3], {"status": "rejected", "applied_date": "2024-01-21T23:59:59+00:00"}),
+    ]:
+        response = client.patch(f"/api/jobs/{job_id}", headers=headers, json=changes)
+        assert response.status_code == 200, response.text
+    response = client.post("/api/jobs/batch", headers=headers, json={"action": "delete", "job_ids": [job_ids[4]]})
+    assert response.status_code == 200, response.text
+    response = client.post(
+        "/api/jobs/import",
+        headers=headers,
+        files={"file": ("jobs.csv", "company,position,status,applied_date\nBeta,Engineer,applied,2024-03-03T20:00:00-06:00\n", "text/csv")},
+    )
+    assert response.status_code == 200 and response.json()["imported"] == 1, response.text
+
+    recorded = stat_rows(user_id)
+    assert sum(recorded.values()) == len(APPLIED_DATES)
+    rebuild()
+    assert stat_rows(user_id) == recorded
@@ -0,0 +1,54 @@
+"""
+Job export: CSV cells that spreadsheets would evaluate as formulas are
+written with a leading apostrophe, for stored jobs and guest workspaces
+alike; NDJSON keeps values verbatim.
+"""
+import csv
+import io
+import json
+
+import pytest
+
+FORMULAS = ["=HYPERLINK(\"http://example.com\")", "+1+2", "-2+3", "@SUM(A1:A2)"]
+
+
+@pytest.fixture(params=["user", "guest"])
+def headers(request, client, auth_headers):
+    if request.param == "user":
+        return auth_headers()
+    response = client.post("/api/auth/guest-login")
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_job(client, headers, company: str, notes: str) -> None:
+    response = client.post("/api/jobs/", headers=headers, data={"company": company, "position": "Engineer", "notes": notes})
+    assert response.status_code == 200, response.text
+
+
+def export(client, headers, fmt: str) -> str:
+    response = client.get("/api/jobs/export", headers=headers, params={"format": fmt})
+    assert response.status_code == 200, response.text
+    return response.text
+
+
+def test_csv_export_escapes_formula_cells(client, headers):
+    for formula in FORMULAS:
+        create_job(client, headers, formula, notes=formula)
+    create_job(client, headers, "Acme", notes="a-b = c")
+
+    rows = {row["company"]: row for row in csv.DictReader(io.StringIO(export(client, headers, "csv")))}
+
+    for formula in FORMULAS:
+        assert rows["'" + formula]["notes"] == "'" + formula
+    assert rows["Acme"]["notes"] == "a-b = c"
+
+
+def test_ndjson_export_keeps_values(client, headers):
+    create_job(client, headers, FORMULAS[0], notes=FORMULAS[1])
+
+    jobs = [json.loads(line) for line in export(client, headers, "ndjson").splitlines()]
+
+    assert {"company": FORMULAS[0], "notes": FORMULAS[1]}.items() <= next(
+        job for job in jobs if job["company"] == FORMULAS[0]
+    ).items()
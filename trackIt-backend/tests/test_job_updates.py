@@ -0,0 +1,81 @@
+"""
+Conditional job updates: PATCH with If-Match applies only while the job's
+row version still matches the tag, and is rejected with 412 otherwise.
+"""
+import pytest
+
+
+@pytest.fixture(params=["user", "guest"])
+def headers(request, client, auth_headers):
+    if request.param == "user":
+        return auth_headers()
+    response = client.post("/api/auth/guest-login")
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_job(client, headers) -> int:
+    response = client.post("/api/jobs/", headers=headers, data={"company": "Acme", "position": "Engineer"})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def patch(client, headers, job_id: int, changes: dict, if_match=None):
+    if if_match is not None:
+        headers = {**headers, "If-Match": if_match}
+    return client.patch(f"/api/jobs/{job_id}", headers=headers, json=changes)
+
+
+@pytest.mark.parametrize("changes", [{"notes": "first"}, {"status": "interviewing"}])
+def test_stale_etag_is_rejected(client, headers, changes):
+    job_id = create_job(client, headers)
+    read = client.get(f"/api/jobs/{job_id}", headers=headers).headers["etag"]
+
+    first = patch(client, headers, job_id, changes, read)
+    assert first.status_code == 200, first.text
+    assert first.headers["etag"] != read
+
+    second = patch(client, headers, job_id, {"notes": "second", "status": "rejected"}, read)
+    assert second.status_code == 412
+    job = client.get(f"/api/jobs/{job_id}", headers=headers).json()
+    assert job["notes"] != "second" and job["status"] != "rejected"
+
+    third = patch(client, headers, job_id, {"notes": "third"}, first.headers["etag"])
+    assert third.status_code == 200, third.text
+    assert third.json()["notes"] == "third"
+
+
+def test_weak_and_listed_etags_match(client, headers):
+    job_id = create_job(client, headers)
+    etag = client.get(f"/api/jobs/{job_id}", headers=headers).headers["etag"]
+
+    response = patch(client, headers, job_id, {"notes": "weak"}, f"W/{etag}")
+    assert response.status_code == 200, response.text
+
+    response = patch(client, headers, job_id, {"notes": "listed"}, f'"1-0000", {response.headers["etag"]}')
+    assert response.status_code == 200, response.text
+
+
+def test_updates_without_a_precondition_always_apply(client, headers):
+    job_id = create_job(client, headers)
+    stale = client.get(f"/api/jobs/{job_id}", headers=headers).headers["etag"]
+    assert patch(client, headers, job_id, {"notes": "moved on"}).status_code == 200
+
+    assert patch(client, headers, job_id, {"notes": "any"}, "*").status_code == 200
+    assert patch(client, headers, job_id, {"notes": "last write"}).status_code == 200
+    assert patch(client, headers, job_id, {"notes": "stale"}, stale).status_code == 412
+
+
+def test_new_resume_versions_do_not_invalidate_the_etag(client, headers):
+    job_id = create_job(client, headers)
+    etag = client.get(f"/api/jobs/{job_id}", headers=headers).headers["etag"]
+    response = client.post(
+        f"/api/jobs/{job_id}/resume", headers=headers, files={"resume": ("resume.txt", b"resume", "text/plain")}
+    )
+    assert response.status_code == 200, response.text
+
+    assert patch(client, headers, job_id, {"notes": "after upload"}, etag).status_code == 200
+
+
+def test_missing_job_is_404_not_412(client, headers):
+    assert patch(client, headers, 999999, {"notes": "x"}, '"1-abc"').status_code == 404
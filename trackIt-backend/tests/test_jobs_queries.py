@@ -0,0 +1,80 @@
+"""
+Query-count regression tests: listing jobs and reading one job must cost a
+fixed number of statements however many jobs and resume versions there are
+(resumes are batch-loaded with selectinload, not one query per job).
+"""
+from contextlib import contextmanager
+from typing import Tuple
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import async_engine
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def create_job(client, headers, n: int, resumes: int = 1) -> int:
+    response = client.post(
+        "/api/jobs/",
+        headers=headers,
+        data={"company": f"Company {n}", "position": "Engineer"},
+        files={"resume": (f"resume-{n}.txt", f"resume {n}".encode(), "text/plain")},
+    )
+    assert response.status_code == 200, response.text
+    job_id = response.json()["id"]
+    for version in range(1, resumes):
+        response = client.post(
+            f"/api/jobs/{job_id}/resume",
+            headers=headers,
+            files={"resume": (f"resume-{n}-{version}.txt", f"resume {n}.{version}".encode(), "text/plain")},
+        )
+        assert response.status_code == 200, response.text
+    return job_id
+
+
+def list_statements(client, headers) -> Tuple[int, int]:
+    with count_statements() as statements:
+        response = client.get("/api/jobs/", headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements), len(response.json())
+
+
+def test_list_jobs_query_count_is_constant(client, auth_headers):
+    few, many = auth_headers(), auth_headers()
+    for n in range(2):
+        create_job(client, few, n, resumes=2)
+    for n in range(10):
+        create_job(client, many, n, resumes=2)
+
+    few_statements, few_jobs = list_statements(client, few)
+    many_statements, many_jobs = list_statements(client, many)
+
+    assert (few_jobs, many_jobs) == (2, 10)
+    # One SELECT for the page of jobs, one for all of their resumes
+    assert few_statements == many_statements == 2
+
+
+@pytest.mark.parametrize("resumes", [1, 5])
+def test_get_job_query_count_is_constant(client, auth_headers, resumes):
+    headers = auth_headers()
+    job_id = create_job(client, headers, 0, resumes=resumes)
+
+    with count_statements() as statements:
+        response = client.get(f"/api/jobs/{job_id}", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()["resumes"]) == resumes
+    assert len(statements) == 2
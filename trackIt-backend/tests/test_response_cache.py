@@ -0,0 +1,105 @@
+"""
+Job reads are served from the response cache: a repeated read runs no
+queries, a matching If-None-Match is answered with 304, and every write
+that changes what a read returns gives it a new ETag.
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.db.session import async_engine
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def create_job(client, headers, company: str = "Acme") -> int:
+    response = client.post("/api/jobs/", headers=headers, data={"company": company, "position": "Engineer"})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def etag(client, headers, url: str) -> str:
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.headers["etag"]
+
+
+def test_repeated_reads_are_served_from_the_cache(client, auth_headers):
+    headers = auth_headers()
+    job_id = create_job(client, headers)
+
+    for url in ("/api/jobs/", f"/api/jobs/{job_id}"):
+        first = client.get(url, headers=headers)
+        with count_statements() as statements:
+            again = client.get(url, headers=headers)
+            cached = client.get(url, headers={**headers, "If-None-Match": first.headers["etag"]})
+        assert statements == []
+        assert again.content == first.content
+        assert again.headers["etag"] == first.headers["etag"]
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+
+def test_list_pages_are_cached_per_query(client, auth_headers):
+    headers = auth_headers()
+    create_job(client, headers, "Acme")
+    create_job(client, headers, "Beta")
+
+    everything = client.get("/api/jobs/", headers=headers).json()
+    filtered = client.get("/api/jobs/", headers=headers, params={"company": "Beta"}).json()
+
+    assert len(everything) == 2
+    assert [job["company"] for job in filtered] == ["Beta"]
+
+
+def test_writes_change_the_etags(client, auth_headers):
+    headers = auth_headers()
+    job_id = create_job(client, headers)
+    other_id = create_job(client, headers, "Beta")
+    urls = ["/api/jobs/", f"/api/jobs/{job_id}"]
+
+    def write_changes_etags(write, urls=urls):
+        before = [etag(client, headers, url) for url in urls]
+        response = write()
+        assert response.status_code == 200, response.text
+        after = [etag(client, headers, url) for url in urls]
+        assert all(old != new for old, new in zip(before, after)), write
+
+    write_changes_etags(lambda: client.patch(f"/api/jobs/{job_id}", headers=headers, json={"notes": "called back"}))
+    write_changes_etags(lambda: client.post(
+        f"/api/jobs/{job_id}/resume", headers=headers, files={"resume": ("resume.txt", b"resume", "text/plain")}
+    ))
+    resume_id = client.get(f"/api/jobs/{job_id}", headers=headers).json()["resumes"][0]["id"]
+    write_changes_etags(lambda: client.delete(f"/api/jobs/{job_id}/resume/{resume_id}", headers=headers))
+    write_changes_etags(lambda: client.post(
+        "/api/jobs/batch", headers=headers, json={"action": "set_status", "status": "interviewing", "job_ids": [job_id]}
+    ))
+    write_changes_etags(
+        lambda: client.post("/api/jobs/", headers=headers, data={"company": "Gamma", "position": "Engineer"}),
+        urls[:1],
+    )
+    write_changes_etags(lambda: client.delete(f"/api/jobs/{other_id}", headers=headers), urls[:1])
+
+    assert client.get(f"/api/jobs/{other_id}", headers=headers).status_code == 404
+
+
+def test_cache_is_per_user(client, auth_headers):
+    owner, other = auth_headers(), auth_headers()
+    job_id = create_job(client, owner)
+    assert client.get(f"/api/jobs/{job_id}", headers=owner).status_code == 200
+    assert client.get("/api/jobs/", headers=owner).json()
+
+    assert client.get(f"/api/jobs/{job_id}", headers=other).status_code == 404
+    assert client.get("/api/jobs/", headers=other).json() == []
@@ -0,0 +1,35 @@
+"""
+Resume files are served only to requests that carry the bearer token in the
+Authorization header; a token in the query string is not accepted.
+"""
+import pytest
+
+
+@pytest.fixture
+def resume_urls(client, auth_headers):
+    headers = auth_headers()
+    response = client.post(
+        "/api/jobs/",
+        headers=headers,
+        data={"company": "Acme", "position": "Engineer"},
+        files={"resume": ("resume.txt", b"resume served by header auth", "text/plain")},
+    )
+    assert response.status_code == 200, response.text
+    job = response.json()
+    base = f"/api/jobs/{job['id']}/resume/{job['resumes'][0]['id']}"
+    return headers, [base, f"{base}/download"]
+
+
+def test_resume_files_accept_the_authorization_header(client, resume_urls):
+    headers, urls = resume_urls
+    for url in urls:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        assert response.content == b"resume served by header auth"
+
+
+def test_resume_files_reject_a_query_string_token(client, resume_urls):
+    headers, urls = resume_urls
+    token = headers["Authorization"].removeprefix("Bearer ")
+    for url in urls:
+        assert client.get(url, params={"access_token": token}).status_code == 401
@@ -0,0 +1,113 @@
+"""
+Serving resume files: only safe types render inline, every response is
+nosniff, and downloads honour ETag / If-None-Match and Range.
+"""
+import pytest
+
+
+def upload_resume(client, headers, filename: str, content: bytes, content_type: str) -> str:
+    """Create a job with one resume and return the resume's URL"""
+    response = client.post(
+        "/api/jobs/",
+        headers=headers,
+        data={"company": "Acme", "position": "Engineer"},
+        files={"resume": (filename, content, content_type)},
+    )
+    assert response.status_code == 200, response.text
+    job = response.json()
+    return f"/api/jobs/{job['id']}/resume/{job['resumes'][0]['id']}"
+
+
+@pytest.fixture(params=["user", "guest"])
+def headers(request, client, auth_headers):
+    if request.param == "user":
+        return auth_headers()
+    token = client.post("/api/auth/guest-login").json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize("filename, content_type", [
+    ("resume.html", "text/html"),
+    ("resume.svg", "image/svg+xml"),
+])
+def test_active_content_is_never_served_inline(client, headers, filename, content_type):
+    url = upload_resume(client, headers, filename, b"<script>alert(1)</script>", content_type)
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.headers["content-disposition"].startswith("attachment")
+    assert response.headers["x-content-type-options"] == "nosniff"
+
+
+def test_pdf_is_served_inline(client, headers):
+    url = upload_resume(client, headers, "resume.pdf", b"%PDF-1.4 resume", "application/pdf")
+    response = client.get(url, headers=headers)
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-disposition"].startswith("inline")
+    assert response.headers["x-content-type-options"] == "nosniff"
+
+    download = client.get(f"{url}/download", headers=headers)
+    assert download.headers["content-type"] == "application/octet-stream"
+    assert download.headers["content-disposition"].startswith("attachment")
+    assert download.headers["x-content-type-options"] == "nosniff"
+
+
+def test_matching_etag_is_answered_with_304(client, headers):
+    url = upload_resume(client, headers, "resume.txt", b"resume text", "text/plain")
+    response = client.get(url, headers=headers)
+    etag = response.headers["etag"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        cached = client.get(url, headers={**headers, "If-None-Match": if_none_match})
+        assert cached.status_code == 304, if_none_match
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+    stale = client.get(url, headers={**headers, "If-None-Match": '"other"'})
+    assert stale.status_code == 200
+    assert stale.content == b"resume text"
+
+
+def test_if_modified_since_is_answered_with_304(client, headers):
+    url = upload_resume(client, headers, "resume.txt", b"resume text", "text/plain")
+    last_modified = client.get(url, headers=headers).headers["last-modified"]
+
+    cached = client.get(url, headers={**headers, "If-Modified-Since": last_modified})
+    assert cached.status_code == 304
+
+    old = client.get(url, headers={**headers, "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+    assert old.status_code == 200
+
+
+@pytest.mark.parametrize("range_header, content_range, body", [
+    ("bytes=0-3", "bytes 0-3/10", b"0123"),
+    ("bytes=6-", "bytes 6-9/10", b"6789"),
+    ("bytes=-2", "bytes 8-9/10", b"89"),
+    ("bytes=8-100", "bytes 8-9/10", b"89"),
+])
+def test_range_is_answered_with_partial_content(client, headers, range_header, content_range, body):
+    url = upload_resume(client, headers, "resume.txt", b"0123456789", "text/plain")
+    response = client.get(url, headers={**headers, "Range": range_header})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == content_range
+    assert response.headers["content-length"] == str(len(body))
+    assert response.content == body
+
+
+def test_unsatisfiable_range_is_rejected(client, headers):
+    url = upload_resume(client, headers, "resume.txt", b"0123456789", "text/plain")
+    response = client.get(url, headers={**headers, "Range": "bytes=10-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10"
+
+
+def test_range_is_ignored_when_if_range_does_not_match(client, headers):
+    url = upload_resume(client, headers, "resume.txt", b"0123456789", "text/plain")
+    etag = client.get(url, headers=headers).headers["etag"]
+
+    current = client.get(url, headers={**headers, "Range": "bytes=0-3", "If-Range": etag})
+    assert current.status_code == 206
+
+    changed = client.get(url, headers={**headers, "Range": "bytes=0-3", "If-Range": '"other"'})
+    assert changed.status_code == 200
+    assert changed.content == b"0123456789"
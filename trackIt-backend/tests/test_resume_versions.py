@@ -0,0 +1,153 @@
+"""
+Resume version numbering: the per-job counter hands out distinct,
+contiguous numbers under concurrent uploads and never reuses one, and the
+(job_id, version) unique index backs that up.
+"""
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.job import PendingFileDeletion, ResumeBlob, ResumeVersion
+from app.services import resume_text
+from app.services.file_service import FileService
+
+PARALLEL_UPLOADS = 12
+
+
+def create_job(client, headers) -> int:
+    response = client.post("/api/jobs/", headers=headers, data={"company": "Acme", "position": "Engineer"})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def resume_content(job_id: int, n: int) -> bytes:
+    return f"resume {job_id}.{n}".encode()
+
+
+def upload(client, headers, job_id: int, n: int):
+    return client.post(
+        f"/api/jobs/{job_id}/resume",
+        headers=headers,
+        files={"resume": (f"resume-{n}.txt", resume_content(job_id, n), "text/plain")},
+    )
+
+
+def versions(client, headers, job_id: int) -> list:
+    response = client.get(f"/api/jobs/{job_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return sorted(resume["version"] for resume in response.json()["resumes"])
+
+
+def test_parallel_uploads_get_distinct_contiguous_versions(client, auth_headers):
+    headers = auth_headers()
+    job_id = create_job(client, headers)
+
+    # The client is not entered, so each request runs on its own event loop
+    # and database connection: the uploads really do race each other
+    with ThreadPoolExecutor(PARALLEL_UPLOADS) as pool:
+        responses = list(pool.map(lambda n: upload(client, headers, job_id, n), range(PARALLEL_UPLOADS)))
+
+    assert [response.status_code for response in responses] == [200] * PARALLEL_UPLOADS
+    assert versions(client, headers, job_id) == list(range(1, PARALLEL_UPLOADS + 1))
+
+
+def test_deleted_version_number_is_not_reused(client, auth_headers):
+    headers = auth_headers()
+    job_id = create_job(client, headers)
+    for n in range(3):
+        assert upload(client, headers, job_id, n).status_code == 200
+
+    newest = max(client.get(f"/api/jobs/{job_id}", headers=headers).json()["resumes"], key=lambda r: r["version"])
+    response = client.delete(f"/api/jobs/{job_id}/resume/{newest['id']}", headers=headers)
+    assert response.status_code == 200, response.text
+    assert upload(client, headers, job_id, 3).status_code == 200
+
+    assert versions(client, headers, job_id) == [1, 2, 4]
+
+
+def test_duplicate_version_is_rejected_by_the_database(client, auth_headers):
+    headers = auth_headers()
+    job_id = create_job(client, headers)
+
+    async def insert_twice():
+        async with AsyncSessionLocal() as db:
+            for _ in range(2):
+                db.add(ResumeVersion(
+                    job_id=job_id, version=1, filename="r.txt", file_path="r.txt", upload_date=datetime.utcnow()
+                ))
+            await db.commit()
+
+    with pytest.raises(IntegrityError):
+        asyncio.run(insert_twice())
+
+
+def test_failed_upload_leaves_no_files_behind(client, auth_headers, monkeypatch):
+    headers = auth_headers()
+    job_id = create_job(client, headers)
+
+    def fail(version):
+        raise RuntimeError("simulated failure after the file was promoted")
+
+    monkeypatch.setattr(resume_text, "enqueue", fail)
+    response = upload(client, headers, job_id, 0)
+    assert response.status_code == 500
+
+    upload_dir = FileService.UPLOAD_DIR
+    assert not [name for name in os.listdir(upload_dir) if name.endswith(".part")]
+
+    async def queued():
+        async with AsyncSessionLocal() as db:
+            return (await db.scalars(select(PendingFileDeletion.file_path))).all()
+
+    # The promoted blob file is queued for the deletion worker
+    blob_path = FileService.blob_path(hashlib.sha256(resume_content(job_id, 0)).hexdigest())
+    assert str(blob_path) in asyncio.run(queued())
+    assert versions(client, headers, job_id) == []
+
+
+def test_promoted_blob_is_queued_when_the_commit_fails(client, auth_headers, monkeypatch):
+    headers = auth_headers()
+    job_id = create_job(client, headers)
+    promoted = []
+
+    promote = FileService.promote_resume
+    commit = AsyncSession.commit
+
+    async def promote_and_record(staged):
+        path = await promote(staged)
+        promoted.append(path)
+        return path
+
+    async def fail_after_promotion(self):
+        # Every commit after the file reached the blob store fails, as if
+        # the database went away: nothing in the request's cleanup commits
+        if promoted:
+            raise RuntimeError("simulated commit failure")
+        await commit(self)
+
+    monkeypatch.setattr(FileService, "promote_resume", promote_and_record)
+    monkeypatch.setattr(AsyncSession, "commit", fail_after_promotion)
+    response = upload(client, headers, job_id, 0)
+    assert response.status_code == 500
+    monkeypatch.undo()
+
+    async def state():
+        async with AsyncSessionLocal() as db:
+            queued = (await db.scalars(select(PendingFileDeletion.file_path))).all()
+            blobs = (await db.scalars(select(ResumeBlob.file_path))).all()
+            return queued, blobs
+
+    blob_path = str(FileService.blob_path(hashlib.sha256(resume_content(job_id, 0)).hexdigest()))
+    assert len(promoted) == 1 and os.path.exists(blob_path)
+    queued, blobs = asyncio.run(state())
+    # The removal queued before promotion survives the failed transaction
+    assert blob_path in queued
+    assert blob_path not in blobs
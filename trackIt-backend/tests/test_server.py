@@ -0,0 +1,45 @@
+"""
+Production worker count: state held in one process (guest workspaces, the
+memory response cache) pins the server to a single worker.
+"""
+import pytest
+
+from app import server
+from app.config import settings
+
+
+@pytest.fixture
+def scale_out(monkeypatch):
+    """Settings with no single-process features enabled"""
+    monkeypatch.setattr(settings, "GUEST_SESSIONS_ENABLED", False)
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", "none")
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", None)
+
+
+def test_defaults_to_one_worker_with_guest_sessions(scale_out, monkeypatch):
+    monkeypatch.setattr(settings, "GUEST_SESSIONS_ENABLED", True)
+    assert server.worker_count() == 1
+
+
+def test_defaults_to_one_worker_with_the_memory_cache(scale_out, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", "memory")
+    assert server.worker_count() == 1
+
+
+def test_refuses_several_workers_with_single_process_features(scale_out, monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(settings, "GUEST_SESSIONS_ENABLED", True)
+    with pytest.raises(SystemExit, match="GUEST_SESSIONS_ENABLED"):
+        server.worker_count()
+
+
+def test_scales_out_without_single_process_features(scale_out, monkeypatch):
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    assert server.worker_count() == 4
+
+
+def test_disabled_guest_sessions_reject_login_and_tokens(client, monkeypatch):
+    token = client.post("/api/auth/guest-login").json()["access_token"]
+    monkeypatch.setattr(settings, "GUEST_SESSIONS_ENABLED", False)
+    assert client.post("/api/auth/guest-login").status_code == 403
+    assert client.get("/api/jobs/", headers={"Authorization": f"Bearer {token}"}).status_code == 401
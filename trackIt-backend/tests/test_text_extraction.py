@@ -0,0 +1,62 @@
+"""
+Resume text extraction limits: a DOCX whose document part expands past
+MAX_DOCX_XML_BYTES is refused before it is read, and a timed-out extraction
+terminates the pool process instead of leaving it running.
+"""
+import asyncio
+import time
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import text_extraction
+from app.services.resume_text import ResumeTextExtractor
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DOCUMENT = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:body>{}</w:body></w:document>"
+)
+
+
+def write_docx(path, body: str) -> str:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", DOCUMENT.format(body))
+    return str(path)
+
+
+def test_docx_text_is_extracted(tmp_path):
+    path = write_docx(tmp_path / "resume.docx", "<w:p><w:r><w:t>Jane Doe</w:t></w:r></w:p>")
+
+    assert text_extraction.extract_text(path, DOCX, "resume.docx", 100) == "Jane Doe"
+
+
+def test_oversized_docx_document_is_refused(tmp_path, monkeypatch):
+    path = write_docx(tmp_path / "bomb.docx", "<w:p>" + " " * 10_000 + "</w:p>")
+    monkeypatch.setattr(text_extraction, "MAX_DOCX_XML_BYTES", 1_000)
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda *args: pytest.fail("document was read"))
+
+    with pytest.raises(ValueError, match="over the 1000 byte limit"):
+        text_extraction.extract_text(path, DOCX, "bomb.docx", 100)
+
+
+def test_terminating_the_pool_stops_a_running_extraction():
+    extractor = ResumeTextExtractor(workers=1, batch_size=1, poll_interval=1, timeout=1, max_chars=100)
+
+    async def run():
+        future = asyncio.get_running_loop().run_in_executor(extractor._pool(), time.sleep, 60)
+        await asyncio.sleep(1)
+        processes = list(extractor._executor._processes.values())
+        assert processes
+        extractor._reset_pool(terminate=True)
+        with pytest.raises(BrokenProcessPool):
+            await asyncio.wait_for(future, 10)
+        return processes
+
+    started = time.monotonic()
+    processes = asyncio.run(run())
+    for process in processes:
+        process.join(10)
+        assert not process.is_alive()
+    assert time.monotonic() - started < 30
@@ -784,7 +784,6 @@ export const FilterBar = ({
   const containerRef = useRef<HTMLDivElement>(null);
   const statusDropdownRef = useRef<HTMLDivElement>(null);
   const statusButtonRef = useRef<HTMLButtonElement>(null);
-  const debounceTimeoutRef = useRef<NodeJS.Timeout | null>(null);
 
   const statusOptions = [
     { value: JobStatus.APPLIED, label: "Applied" },
@@ -821,20 +820,12 @@ export const FilterBar = ({
     }
   };
 
-  // Real-time filtering with debouncing - apply filter as user types
+  // Real-time filtering - apply filter as user types; JobContext debounces the fetch
   const handleRealTimeFilter = (
     filterType: "company" | "position" | "status",
     value: string
   ) => {
-    // Clear previous timeout
-    if (debounceTimeoutRef.current) {
-      clearTimeout(debounceTimeoutRef.current);
-    }
-
-    // Set new timeout for debounced filtering
-    debounceTimeoutRef.current = setTimeout(() => {
-      onFilterChange(filterType, value);
-    }, 300); // 300ms delay
+    onFilterChange(filterType, value);
   };
 
   // Handle click outside
@@ -863,15 +854,6 @@ export const FilterBar = ({
     };
   }, [isStatusDropdownOpen]);
 
-  // Cleanup timeout on unmount
-  useEffect(() => {
-    return () => {
-      if (debounceTimeoutRef.current) {
-        clearTimeout(debounceTimeoutRef.current);
-      }
-    };
-  }, []);
-
   // Handle Enter key to close dropdown
   const handleKeyDown = (e: React.KeyboardEvent<HTMLInputElement>) => {
     if (e.key === "Enter") {
@@ -912,16 +894,7 @@ export const FilterBar = ({
     value: string
   ) => {
     setMobileSearchTerms((prev) => ({ ...prev, [type]: value }));
-
-    // Clear previous timeout
-    if (debounceTimeoutRef.current) {
-      clearTimeout(debounceTimeoutRef.current);
-    }
-
-    // Set new timeout for debounced filtering
-    debounceTimeoutRef.current = setTimeout(() => {
-      onFilterChange(type, value);
-    }, 300);
+    onFilterChange(type, value);
   };
 
   const handleMobileStatusSelect = (status: string) => {
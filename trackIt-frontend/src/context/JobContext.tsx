@@ -1,111 +1,166 @@
-import React, { createContext, useContext, useState, useEffect } from "react";
+import React, {
+  createContext,
+  useCallback,
+  useContext,
+  useEffect,
+  useRef,
+  useState,
+} from "react";
 import type { Job } from "../types/types";
-import { JobStatus } from "../types/types";
 import { useAuth } from "./AuthContext";
 import { api } from "../api/config.js";
 
+// Jobs fetched per request to the cursor-paginated list endpoint
+const PAGE_SIZE = 50;
+// Filter edits must settle this long before the list is fetched again
+const FILTER_DEBOUNCE_MS = 300;
+
+export interface JobFilters {
+  company: string;
+  position: string;
+  status: string;
+  // ISO timestamps bounding created_at
+  createdFrom?: string;
+  createdTo?: string;
+}
+
+const NO_FILTERS: JobFilters = { company: "", position: "", status: "" };
+
 interface JobContextType {
   jobs: Job[];
   setJobs: React.Dispatch<React.SetStateAction<Job[]>>;
   loading: boolean;
+  filters: JobFilters;
+  setFilters: (filters: JobFilters) => void;
+  hasMore: boolean;
+  loadingMore: boolean;
+  loadMore: () => Promise<void>;
 }
 
 const JobContext = createContext<JobContextType | undefined>(undefined);
 
-const sampleJobs: Job[] = [
-  {
-    id: 1,
-    company: "Google",
-    position: "Full Stack Developer",
-    status: JobStatus.APPLIED,
-    notes: "Applied through company website. Following up next week.",
-    applied_date: new Date().toISOString(),
-    created_at: new Date().toISOString(),
-    resumes: [],
-  },
-  {
-    id: 2,
-    company: "Microsoft",
-    position: "Frontend Engineer",
-    status: JobStatus.INTERVIEWING,
-    notes:
-      "Technical interview scheduled for next week. Preparing LeetCode problems.",
-    applied_date: new Date(Date.now() - 7 * 24 * 60 * 60 * 1000).toISOString(), // 7 days ago
-    created_at: new Date(Date.now() - 7 * 24 * 60 * 60 * 1000).toISOString(),
-    resumes: [],
-  },
-  {
-    id: 3,
-    company: "Amazon",
-    position: "Software Development Engineer",
-    status: JobStatus.REJECTED,
-    notes:
-      "Got feedback: 'Good technical skills but looking for more experience'.",
-    applied_date: new Date(Date.now() - 14 * 24 * 60 * 60 * 1000).toISOString(), // 14 days ago
-    created_at: new Date(Date.now() - 14 * 24 * 60 * 60 * 1000).toISOString(),
-    resumes: [],
-  },
-  {
-    id: 4,
-    company: "Apple",
-    position: "iOS Developer",
-    status: JobStatus.ACCEPTED,
-    notes: "Offer received! Reviewing compensation package.",
-    applied_date: new Date(Date.now() - 30 * 24 * 60 * 60 * 1000).toISOString(), // 30 days ago
-    created_at: new Date(Date.now() - 30 * 24 * 60 * 60 * 1000).toISOString(),
-    resumes: [],
-  },
-];
+// The list endpoint filters server-side; empty filters are left out
+const listParams = (filters: JobFilters, cursor?: string) => ({
+  company: filters.company || undefined,
+  position: filters.position || undefined,
+  status: filters.status || undefined,
+  created_from: filters.createdFrom || undefined,
+  created_to: filters.createdTo || undefined,
+  cursor,
+  limit: PAGE_SIZE,
+});
+
+const logFetchError = (error: any) => {
+  console.error("Error fetching jobs:", error);
+  if (error.response) {
+    console.error("Response status:", error.response.status);
+    console.error("Response data:", error.response.data);
+  } else if (error.request) {
+    console.error("No response received:", error.request);
+  } else {
+    console.error("Error setting up request:", error.message);
+  }
+};
 
 export const JobProvider: React.FC<{ children: React.ReactNode }> = ({
   children,
 }) => {
   const [jobs, setJobs] = useState<Job[]>([]);
   const [loading, setLoading] = useState(true);
+  // What the filter inputs show; the list follows once edits settle
+  const [filters, setFilters] = useState<JobFilters>(NO_FILTERS);
+  // The filters the listed jobs were fetched with
+  const [activeFilters, setActiveFilters] = useState<JobFilters>(NO_FILTERS);
+  const [nextCursor, setNextCursor] = useState<string | undefined>();
+  const [loadingMore, setLoadingMore] = useState(false);
+  // The in-flight loadMore request, aborted along with its first page
+  const moreRequest = useRef<AbortController | null>(null);
   const { isAuthenticated, isGuest } = useAuth();
 
+  // Each sign-in starts from the first, unfiltered page, without waiting
+  useEffect(() => {
+    setLoading(true);
+    setFilters((prev) => (prev === NO_FILTERS ? prev : NO_FILTERS));
+    setActiveFilters((prev) => (prev === NO_FILTERS ? prev : NO_FILTERS));
+  }, [isAuthenticated, isGuest]);
+
   useEffect(() => {
-    const fetchJobs = async () => {
+    if (filters === activeFilters) return;
+    const timer = setTimeout(() => setActiveFilters(filters), FILTER_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [filters, activeFilters]);
+
+  useEffect(() => {
+    const controller = new AbortController();
+    const fetchFirstPage = async () => {
       if (!isAuthenticated) {
         setJobs([]);
-        setLoading(false);
-        return;
-      }
-
-      if (isGuest) {
-        // For guest users, load sample jobs
-        setJobs(sampleJobs);
+        setNextCursor(undefined);
         setLoading(false);
         return;
       }
 
       try {
         console.log("Fetching jobs from:", api.defaults.baseURL);
-        const response = await api.get("/api/jobs/");
-        console.log("Jobs response:", response.data);
+        const response = await api.get("/api/jobs/", {
+          params: listParams(activeFilters),
+          signal: controller.signal,
+        });
+        if (controller.signal.aborted) return;
         setJobs(response.data);
+        setNextCursor(response.headers["x-next-cursor"]);
       } catch (error: any) {
-        console.error("Error fetching jobs:", error);
-        if (error.response) {
-          console.error("Response status:", error.response.status);
-          console.error("Response data:", error.response.data);
-        } else if (error.request) {
-          console.error("No response received:", error.request);
-        } else {
-          console.error("Error setting up request:", error.message);
-        }
+        if (controller.signal.aborted) return;
+        logFetchError(error);
         // Set empty jobs array on error
         setJobs([]);
+        setNextCursor(undefined);
       } finally {
-        setLoading(false);
+        if (!controller.signal.aborted) setLoading(false);
       }
     };
 
-    fetchJobs();
-  }, [isAuthenticated, isGuest]);
+    fetchFirstPage();
+    // New filters or another user supersede this list, and any page of it
+    return () => {
+      controller.abort();
+      moreRequest.current?.abort();
+    };
+  }, [isAuthenticated, isGuest, activeFilters]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    const controller = new AbortController();
+    moreRequest.current = controller;
+    setLoadingMore(true);
+    try {
+      const response = await api.get("/api/jobs/", {
+        params: listParams(activeFilters, nextCursor),
+        signal: controller.signal,
+      });
+      if (controller.signal.aborted) return;
+      setJobs((prevJobs) => [...prevJobs, ...response.data]);
+      setNextCursor(response.headers["x-next-cursor"]);
+    } catch (error: any) {
+      if (!controller.signal.aborted) logFetchError(error);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [activeFilters, nextCursor, loadingMore]);
 
   return (
-    <JobContext.Provider value={{ jobs, setJobs, loading }}>
+    <JobContext.Provider
+      value={{
+        jobs,
+        setJobs,
+        loading,
+        filters,
+        setFilters,
+        hasMore: nextCursor !== undefined,
+        loadingMore,
+        loadMore,
+      }}
+    >
       {children}
     </JobContext.Provider>
   );
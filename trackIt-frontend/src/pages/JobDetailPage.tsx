@@ -27,7 +27,6 @@ import type { Job } from "../types/types";
 import type { ResumeVersion } from "../types/types";
 import { api } from "../api/config.js";
 import { useJobs } from "../context/JobContext";
-import { useAuth } from "../context/AuthContext";
 
 // Main container with centered layout
 const PageContainer = styled.div`
@@ -705,27 +704,20 @@ const JobDetailPage: React.FC = () => {
   const navigate = useNavigate();
   const { jobs, setJobs } = useJobs();
   const [job, setJob] = useState<Job | null>(null);
+  // ETag of the loaded job, sent as If-Match so stale edits are rejected
+  const [etag, setEtag] = useState<string | undefined>();
   const [isSaved, setIsSaved] = useState(false);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [activeTab, setActiveTab] = useState<"details" | "resume">("details");
-  const { isGuest } = useAuth();
   const fileInputRef = React.useRef<HTMLInputElement>(null);
 
   useEffect(() => {
     const fetchJob = async () => {
       try {
-        if (isGuest) {
-          const foundJob = jobs.find((j) => j.id === Number(id));
-          if (foundJob) {
-            setJob(foundJob);
-          } else {
-            setError("Job not found");
-          }
-        } else {
-          const response = await api.get(`/api/jobs/${id}`);
-          setJob(response.data);
-        }
+        const response = await api.get(`/api/jobs/${id}`);
+        setJob(response.data);
+        setEtag(response.headers["etag"]);
       } catch (error) {
         console.error("Error fetching job:", error);
         setError("Failed to load job details");
@@ -735,28 +727,36 @@ const JobDetailPage: React.FC = () => {
     };
 
     fetchJob();
-  }, [id, isGuest, jobs]);
+  }, [id]);
 
   const handleFieldSave = async (field: keyof Job, value: string) => {
     if (!job) return;
 
     try {
-      const updatedJob = { ...job, [field]: value };
-      const { data } = await api.put(`/api/jobs/${id}`, updatedJob);
+      // Send only the changed field
+      const { data, headers } = await api.patch(
+        `/api/jobs/${id}`,
+        { [field]: value },
+        { headers: etag ? { "If-Match": etag } : {} }
+      );
       setJob(data);
+      setEtag(headers["etag"]);
 
       // Update the job in the jobs context
       setJobs((prevJobs) => prevJobs.map((j) => (j.id === data.id ? data : j)));
-    } catch (error) {
+    } catch (error: any) {
       console.error(`Error updating ${field}:`, error);
+      if (error.response?.status === 412) {
+        // Edited elsewhere since it was loaded: show the latest version
+        const response = await api.get(`/api/jobs/${id}`);
+        setJob(response.data);
+        setEtag(response.headers["etag"]);
+        alert("This job was changed elsewhere. Showing the latest version.");
+      }
     }
   };
 
   const handleFileUpload = () => {
-    if (isGuest) {
-      alert("File upload is not available in guest mode");
-      return;
-    }
     fileInputRef.current?.click();
   };
 
@@ -786,40 +786,55 @@ const JobDetailPage: React.FC = () => {
     }
   };
 
+  // Resume files are fetched through the API client, which sends the
+  // Authorization header, and handed to the browser as an object URL
+  const fetchResume = async (path: string) => {
+    const response = await api.get(path, { responseType: "blob" });
+    const url = URL.createObjectURL(response.data);
+    // Give the new tab or download time to read the blob before releasing it
+    setTimeout(() => URL.revokeObjectURL(url), 60000);
+    return url;
+  };
+
   const handleView = async (versionId: number) => {
-    if (isGuest) {
-      alert("File viewing is not available in guest mode");
-      return;
-    }
     if (!id) return;
-    const baseURL =
-      process.env.NODE_ENV === "production"
-        ? "https://track-it-app-production-bcae.up.railway.app"
-        : "http://localhost:8000";
-    window.open(`${baseURL}/api/jobs/${id}/resume/${versionId}`, "_blank");
+    // Open the tab before awaiting so popup blockers treat it as a click
+    const tab = window.open("", "_blank");
+    try {
+      const url = await fetchResume(`/api/jobs/${id}/resume/${versionId}`);
+      if (tab) {
+        tab.location.href = url;
+      } else {
+        window.open(url, "_blank");
+      }
+    } catch (error) {
+      tab?.close();
+      console.error("Error opening resume:", error);
+      alert("Failed to open resume");
+    }
   };
 
   const handleDownload = async (versionId: number) => {
-    if (isGuest) {
-      alert("File download is not available in guest mode");
-      return;
-    }
     if (!id) return;
-    const baseURL =
-      process.env.NODE_ENV === "production"
-        ? "https://track-it-app-production-bcae.up.railway.app"
-        : "http://localhost:8000";
-    window.open(
-      `${baseURL}/api/jobs/${id}/resume/${versionId}/download`,
-      "_blank"
-    );
+    try {
+      const url = await fetchResume(
+        `/api/jobs/${id}/resume/${versionId}/download`
+      );
+      const link = document.createElement("a");
+      link.href = url;
+      link.download =
+        job?.resumes.find((resume) => resume.id === versionId)?.filename ??
+        "resume";
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+    } catch (error) {
+      console.error("Error downloading resume:", error);
+      alert("Failed to download resume");
+    }
   };
 
   const handleDelete = async (versionId: number) => {
-    if (isGuest) {
-      alert("File deletion is not available in guest mode");
-      return;
-    }
     if (!id) return;
     try {
       await api.delete(`/api/jobs/${id}/resume/${versionId}`);
@@ -833,10 +848,6 @@ const JobDetailPage: React.FC = () => {
   };
 
   const handleDeleteJob = async () => {
-    if (isGuest) {
-      alert("Job deletion is not available in guest mode");
-      return;
-    }
     if (
       !id ||
       !window.confirm(
@@ -4,9 +4,10 @@ import styled from "styled-components";
 import { JobCard } from "../cmps/JobCard";
 import { FilterBar, MobileFilterButton } from "../cmps/FilterBar";
 import { FaFilter } from "react-icons/fa";
-import { type Job, JobStatus } from "../types/types";
+import { type JobStats, JobStatus } from "../types/types";
 import { useNavigate, useLocation } from "react-router-dom";
 import { useJobs } from "../context/JobContext";
+import { api } from "../api/config.js";
 
 const PageContainer = styled.div`
   /* Remove padding since MainLayout already provides it */
@@ -250,14 +251,17 @@ const FilterBarContainer = styled.div`
 `;
 
 export const JobListPage = () => {
-  const { jobs, loading: isLoading } = useJobs();
-  const [filteredJobs, setFilteredJobs] = useState<Job[]>([]);
+  // The context fetches one page at a time, filtered by the server
+  const {
+    jobs,
+    loading: isLoading,
+    filters,
+    setFilters,
+    hasMore,
+    loadingMore,
+    loadMore,
+  } = useJobs();
   const [error, setError] = useState<string | null>(null);
-  const [filters, setFilters] = useState({
-    company: "",
-    position: "",
-    status: "",
-  });
   const [scrollProgress, setScrollProgress] = useState(0);
   const [showScrollArrow, setShowScrollArrow] = useState(true);
   const navigate = useNavigate();
@@ -265,41 +269,26 @@ export const JobListPage = () => {
   const [newJobId, setNewJobId] = useState<number | null>(null);
   const [isMobileFilterOpen, setIsMobileFilterOpen] = useState(false);
 
-  // Calculate KPI summary
-  const kpiStats = {
-    active: jobs.filter(
-      (job) =>
-        job.status === JobStatus.APPLIED || job.status === JobStatus.PENDING
-    ).length,
-    interviewing: jobs.filter((job) => job.status === JobStatus.INTERVIEWING)
-      .length,
-    offers: jobs.filter((job) => job.status === JobStatus.ACCEPTED).length,
-  };
+  const [kpiStats, setKpiStats] = useState({
+    active: 0,
+    interviewing: 0,
+    offers: 0,
+  });
 
-  // Apply filters whenever filters state changes
+  // KPI summary comes pre-aggregated from the server; refetch when jobs change
   useEffect(() => {
-    let result = [...jobs];
-
-    if (filters.company) {
-      result = result.filter((job) =>
-        job.company.toLowerCase().includes(filters.company.toLowerCase())
-      );
-    }
-
-    if (filters.position) {
-      result = result.filter((job) =>
-        job.position.toLowerCase().includes(filters.position.toLowerCase())
-      );
-    }
-
-    if (filters.status) {
-      result = result.filter(
-        (job) => job.status.toLowerCase() === filters.status.toLowerCase()
-      );
-    }
-
-    setFilteredJobs(result);
-  }, [filters, jobs]);
+    api
+      .get<JobStats>("/api/jobs/stats")
+      .then(({ data }) => {
+        const counts = data.by_status;
+        setKpiStats({
+          active: counts[JobStatus.APPLIED] + counts[JobStatus.PENDING],
+          interviewing: counts[JobStatus.INTERVIEWING],
+          offers: counts[JobStatus.ACCEPTED],
+        });
+      })
+      .catch((err) => console.error("Error fetching job stats:", err));
+  }, [jobs]);
 
   useEffect(() => {
     // Check if we have a new job ID in the location state
@@ -340,13 +329,17 @@ export const JobListPage = () => {
   }, [isMobileFilterOpen]);
 
   const handleFilterChange = (filterType: string, value: string) => {
-    setFilters((prev) => ({ ...prev, [filterType]: value }));
+    setFilters({ ...filters, [filterType]: value });
   };
 
   const handleResetFilters = () => {
     setFilters({ company: "", position: "", status: "" });
   };
 
+  const hasFilters = Boolean(
+    filters.company || filters.position || filters.status
+  );
+
   const handleAddJob = () => {
     navigate("/jobs/new");
   };
@@ -430,13 +423,20 @@ export const JobListPage = () => {
         </MobileFilterButton>
       </div>
 
-      {filteredJobs.length > 0 ? (
+      {jobs.length > 0 ? (
         <>
           <JobsGrid>
-            {filteredJobs.map((job) => (
+            {jobs.map((job) => (
               <JobCard key={job.id} job={job} isNew={job.id === newJobId} />
             ))}
           </JobsGrid>
+          {hasMore && (
+            <div style={{ textAlign: "center", marginTop: "2rem" }}>
+              <AddJobButton onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? "Loading..." : "Load more jobs"}
+              </AddJobButton>
+            </div>
+          )}
           <ScrollProgressIndicator $progress={scrollProgress} />
           <ScrollDownArrow
             $isVisible={showScrollArrow}
@@ -451,9 +451,9 @@ export const JobListPage = () => {
           />
           <h3>No Job Applications Found</h3>
           <p>
-            {jobs.length === 0
-              ? "Start by adding your first job application"
-              : "No jobs match your current filters"}
+            {hasFilters
+              ? "No jobs match your current filters"
+              : "Start by adding your first job application"}
           </p>
           <AddJobButton onClick={handleAddJob}>
             <i className="fas fa-plus-circle" />
@@ -462,7 +462,7 @@ export const JobListPage = () => {
         </EmptyState>
       )}
 
-      {filteredJobs.length > 0 && (
+      {jobs.length > 0 && (
         <div style={{ textAlign: "center", marginTop: "3rem" }}>
           <AddJobButton onClick={handleAddJob}>
             <i className="fas fa-plus" />
@@ -8,10 +8,9 @@ import {
   FaTrash,
   FaTimes,
 } from "react-icons/fa";
-import { JobStatus, type Job } from "../types/types";
+import { JobStatus } from "../types/types";
 import { api } from "../api/config.js";
 import { useJobs } from "../context/JobContext";
-import { useAuth } from "../context/AuthContext";
 
 // Overall container with light neutral background
 const PageContainer = styled.div`
@@ -427,7 +426,6 @@ type TabType = "details" | "resume";
 const NewJobPage: React.FC = () => {
   const navigate = useNavigate();
   const { jobs, setJobs } = useJobs();
-  const { isGuest } = useAuth();
   const [activeTab, setActiveTab] = useState<TabType>("details");
   const [formData, setFormData] = useState({
     company: "",
@@ -464,30 +462,7 @@ const NewJobPage: React.FC = () => {
     setError(null);
 
     try {
-      if (isGuest) {
-        // For guest users, create job locally without sending to server
-        const newJob: Job = {
-          id: Date.now(), // Generate a temporary ID
-          company: formData.company,
-          position: formData.position,
-          status: formData.status,
-          notes: formData.notes || "",
-          applied_date: formData.applied_date
-            ? new Date(formData.applied_date).toISOString()
-            : undefined,
-          created_at: new Date().toISOString(),
-          resumes: [], // Guest mode doesn't support resume uploads
-        };
-
-        // Update jobs context with the new job
-        setJobs([...jobs, newJob]);
-
-        // Navigate to jobs list with the new job ID
-        navigate("/jobs", { state: { newJobId: newJob.id } });
-        return;
-      }
-
-      // For authenticated users, send to server
+      // Guest jobs are kept in the server's in-memory guest store
       const formDataToSend = new FormData();
 
       // Convert status to lowercase string if it's not already
@@ -515,8 +490,8 @@ const NewJobPage: React.FC = () => {
         },
       });
 
-      // Update jobs context with the new job
-      setJobs([...jobs, data]);
+      // The list is newest first, so the new job leads the loaded pages
+      setJobs([data, ...jobs]);
 
       // Navigate to jobs list with the new job ID
       navigate("/jobs", { state: { newJobId: data.id } });
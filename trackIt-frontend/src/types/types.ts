@@ -25,9 +25,19 @@ export interface Job {
   applied_date?: string;
   created_at: string;
   updated_at?: string;
+  row_version?: number;
   resumes: ResumeVersion[];
 }
 
+export interface JobStats {
+  total: number;
+  by_status: Record<JobStatus, number>;
+  applications_per_week: { week_start: string; count: number }[];
+  response_rate: number;
+  interview_rate: number;
+  offer_rate: number;
+}
+
 export interface ResumeVersion {
   id: number;
   filename: string;